@@ -0,0 +1,42 @@
+"""Add materialized_analyses table
+
+Revision ID: b7e3c1d9a4f2
+Revises: 72056dd75dde
+Create Date: 2026-10-17 10:12:41.203518
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b7e3c1d9a4f2'
+down_revision: Union[str, None] = '72056dd75dde'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('materialized_analyses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('profile_id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('top_n', sa.Integer(), nullable=False),
+    sa.Column('recommendations', sa.JSON(), nullable=False),
+    sa.Column('gaps', sa.JSON(), nullable=False),
+    sa.Column('profile_fingerprint', sa.String(), nullable=False),
+    sa.Column('roles_fingerprint', sa.String(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['profile_id'], ['user_profiles.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_materialized_analyses_id'), 'materialized_analyses', ['id'], unique=False)
+    op.create_index(op.f('ix_materialized_analyses_profile_id'), 'materialized_analyses', ['profile_id'], unique=True)
+    op.create_index(op.f('ix_materialized_analyses_tenant_id'), 'materialized_analyses', ['tenant_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_materialized_analyses_tenant_id'), table_name='materialized_analyses')
+    op.drop_index(op.f('ix_materialized_analyses_profile_id'), table_name='materialized_analyses')
+    op.drop_index(op.f('ix_materialized_analyses_id'), table_name='materialized_analyses')
+    op.drop_table('materialized_analyses')
@@ -3,18 +3,33 @@ from datetime import datetime, timezone
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import APIKeyHeader
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models.api_key import APIKey
 from app.models.tenant import Tenant
 from app.models.user import User, Role
-from app.auth import get_current_user, get_current_user_optional, has_role
+from app.auth import get_current_user, get_current_user_optional, get_current_user_optional_async, has_role
 
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
+def _check_not_expired(db_api_key: APIKey) -> None:
+    if db_api_key.expires_at is not None:
+        expires = db_api_key.expires_at
+        if expires.tzinfo is None:
+            expires = expires.replace(tzinfo=timezone.utc)
+        if expires < datetime.now(timezone.utc):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="API Key has expired",
+                headers={"WWW-Authenticate": "API-Key"},
+            )
+
+
 def get_api_key(
     api_key: str = Depends(api_key_header),
     db: Session = Depends(get_db),
@@ -33,16 +48,7 @@ def get_api_key(
             detail="Invalid API Key",
             headers={"WWW-Authenticate": "API-Key"},
         )
-    if db_api_key.expires_at is not None:
-        expires = db_api_key.expires_at
-        if expires.tzinfo is None:
-            expires = expires.replace(tzinfo=timezone.utc)
-        if expires < datetime.now(timezone.utc):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="API Key has expired",
-                headers={"WWW-Authenticate": "API-Key"},
-            )
+    _check_not_expired(db_api_key)
     return db_api_key
 
 
@@ -60,16 +66,7 @@ def get_optional_api_key(
             detail="Invalid API Key",
             headers={"WWW-Authenticate": "API-Key"},
         )
-    if db_api_key.expires_at is not None:
-        expires = db_api_key.expires_at
-        if expires.tzinfo is None:
-            expires = expires.replace(tzinfo=timezone.utc)
-        if expires < datetime.now(timezone.utc):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="API Key has expired",
-                headers={"WWW-Authenticate": "API-Key"},
-            )
+    _check_not_expired(db_api_key)
     return db_api_key
 
 
@@ -99,6 +96,52 @@ def get_current_tenant_for_read(
     )
 
 
+async def get_optional_api_key_async(
+    api_key: str = Depends(api_key_header),
+    db: AsyncSession = Depends(get_async_db),
+) -> APIKey | None:
+    """``get_optional_api_key`` on the async session."""
+    if not api_key or not api_key.strip():
+        return None
+    db_api_key = (
+        await db.execute(select(APIKey).where(APIKey.key == api_key, APIKey.is_active == True))
+    ).scalars().first()
+    if not db_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API Key",
+            headers={"WWW-Authenticate": "API-Key"},
+        )
+    _check_not_expired(db_api_key)
+    return db_api_key
+
+
+async def get_current_tenant_for_read_async(
+    api_key: APIKey | None = Depends(get_optional_api_key_async),
+    user: User | None = Depends(get_current_user_optional_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> Tenant:
+    """``get_current_tenant_for_read`` on the async session."""
+    if api_key is not None:
+        tenant = await db.get(Tenant, api_key.tenant_id)
+        if not tenant:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found for API key")
+        return tenant
+    if user is not None:
+        tenant = await db.get(Tenant, user.tenant_id)
+        if not tenant:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tenant not found for user",
+            )
+        return tenant
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Authentication required. Provide X-API-Key header or Bearer token.",
+        headers={"WWW-Authenticate": "Bearer, API-Key"},
+    )
+
+
 def get_current_tenant_by_api_key(api_key: APIKey = Depends(get_api_key), db: Session = Depends(get_db)) -> Tenant:
     tenant = db.query(Tenant).filter(Tenant.id == api_key.tenant_id).first()
     if not tenant:
@@ -8,12 +8,14 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.tenant import Tenant
 from app.models.user import User, Role
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db, get_db
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
@@ -121,11 +123,8 @@ def verify_reset_token(token: str) -> int:
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
 
 
-def get_current_user_optional(
-    token: str | None = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-):
-    """Return user if authenticated, None otherwise."""
+def _access_token_identity(token: str | None) -> tuple[int, int] | None:
+    """``(user_id, tenant_id)`` from a valid, unrevoked access token, else None."""
     if not token:
         return None
     try:
@@ -144,13 +143,32 @@ def get_current_user_optional(
             return None
     except JWTError:
         return None
-    from app.models.user import User
+    return user_id, tenant_id
+
+
+def get_current_user_optional(
+    token: str | None = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+):
+    """Return user if authenticated, None otherwise."""
+    identity = _access_token_identity(token)
+    if identity is None:
+        return None
+    user_id, tenant_id = identity
     user = db.query(User).filter(User.id == user_id, User.tenant_id == tenant_id).first()
     if user is None or not user.is_active:
         return None
     return user
 
 
+def _unauthenticated() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
 def get_current_user(
     token: str | None = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
@@ -158,11 +176,7 @@ def get_current_user(
     """Require authentication."""
     user = get_current_user_optional(token, db)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthenticated()
     return user
 
 
@@ -180,3 +194,48 @@ def has_role(required_roles: list[Role]):
             )
         return user
     return role_checker
+
+
+# ---------- Async dependencies (for ``async def`` routes on get_async_db) ----------
+
+async def get_current_user_optional_async(
+    token: str | None = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Return user if authenticated, None otherwise."""
+    identity = _access_token_identity(token)
+    if identity is None:
+        return None
+    user_id, tenant_id = identity
+    user = (
+        await db.execute(select(User).where(User.id == user_id, User.tenant_id == tenant_id))
+    ).scalars().first()
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
+async def get_current_user_async(user: User | None = Depends(get_current_user_optional_async)):
+    """Require authentication."""
+    if user is None:
+        raise _unauthenticated()
+    return user
+
+
+async def get_current_tenant_async(
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> Tenant:
+    """Get the current tenant from the authenticated user (no lazy load on async sessions)."""
+    return await db.get(Tenant, user.tenant_id)
+
+
+def has_role_async(required_roles: list[Role]):
+    async def role_checker(user: User = Depends(get_current_user_async)):
+        if user.role not in required_roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+        return user
+    return role_checker
@@ -43,6 +43,66 @@ class Settings(BaseSettings):
         return f"postgresql://{user}:{password}@{host}:{port}/{db}"
 
     sentence_transformer_model: str = "all-MiniLM-L6-v2"
+    # Inference runtime: torch | onnx | onnx-int8 (ONNX needs optimum[onnxruntime])
+    encoder_backend: str = "torch"
+    # ONNX file inside the model repo; empty = backend default
+    encoder_onnx_file: str = ""
+    # Intra-op threads for the encoder (0 = runtime default / OMP_NUM_THREADS)
+    encoder_num_threads: int = 0
+    # Coalesce concurrent encode calls into one model batch (app/ml/micro_batcher.py). Off by
+    # default: a single thread then runs every model call, serialising callers that could overlap
+    encoder_batching_enabled: bool = False
+    encoder_batch_max_size: int = 64
+    encoder_batch_max_wait_ms: float = 2.0
+    # Unix socket of the encoder sidecar (python -m app.ml.encoder_server); empty = encode in-process
+    encoder_socket: str = ""
+    encoder_timeout_seconds: float = 10.0
+    # Shared on-disk embedding store (empty = disabled)
+    embedding_store_dir: str = ""
+    # Max number of individual skill strings kept in the in-process embedding cache
+    skill_embedding_cache_size: int = 10000
+    # Vector storage for the taxonomy index and role matrices (per-user indexes stay flat): flat | sq8 | pq
+    embedding_index_mode: str = "flat"
+    embedding_index_pq_m: int = 48  # PQ sub-quantizers; must divide the embedding dim
+    # Max share of normalize/match results allowed to differ from flat (benchmarks/index_recall.py)
+    embedding_index_tolerance: float = 0.01
+    # Snapshots of the taxonomy index and role matrices for warm starts (empty = disabled)
+    index_snapshot_dir: str = ""
+    # difflib ratio for the fuzzy tier of skill normalization
+    skill_fuzzy_cutoff: float = 0.88
+    # Min cosine similarity for the embedding tier (tune with benchmarks/normalization_calibration.py)
+    skill_match_threshold: float = 0.75
+
+    # Recommendation result cache (set URL to redis://... to share across workers)
+    recommendation_cache_url: str = ""
+    recommendation_cache_ttl: int = 300  # seconds
+    recommendation_cache_size: int = 2048
+    # Reference-data snapshots (app/services/reference_data.py) are rebuilt after this age unless
+    # the recommendation cache is shared, whose counters already carry other workers' writes
+    reference_data_max_age_seconds: int = 60
+    # Skill -> role/course/profile index (app/services/skill_index.py); rebuilt after this age
+    # unless the recommendation cache is shared, as for reference-data snapshots
+    skill_index_max_age_seconds: int = 60
+    # Per-request SQL statistics (app/query_stats.py): Server-Timing header, per-route totals
+    sql_instrumentation_enabled: bool = True
+    # Log statements at or above this many ms, parameters redacted to their types (0 = off)
+    sql_slow_query_ms: float = 0
+    # Prometheus text metrics on /metrics (app/metrics.py); disable where the port is public
+    metrics_enabled: bool = True
+    # Per-request memo of repeated service calls (app/services/request_memo.py); the debug
+    # headers report X-Memo-Hits / X-Memo-Misses on every response
+    request_memo_enabled: bool = True
+    request_memo_debug_headers: bool = False
+    # Default upskilling roadmap objective: fee | weeks (optimal course set) or greedy (one course per skill)
+    roadmap_objective: str = "greedy"
+    # Parallel roadmap schedule: assumed study load per course, default learner budget, and a cap
+    roadmap_course_hours_per_week: int = 10
+    roadmap_weekly_hours: int = 20
+    roadmap_max_tracks: int = 3
+
+    # Materialized recommendations / gaps (0 = no in-process scheduler; CLI still works)
+    materialize_interval_minutes: int = 0
+    materialize_top_n: int = 5
     backend_host: str = "0.0.0.0"
     backend_port: int = 8000
 
@@ -1,16 +1,84 @@
-from sqlalchemy import create_engine
+"""Database engines and sessions.
+
+``engine`` / ``SessionLocal`` / ``get_db`` serve the sync routers (run in the
+threadpool). ``async_engine`` / ``AsyncSessionLocal`` / ``get_async_db`` open
+the same database through an async driver (asyncpg for PostgreSQL, aiosqlite
+for SQLite) for ``async def`` routers, which wait on the database without
+holding a threadpool worker.
+
+The process-wide caches they read (``reference_data``, ``skill_index``) have
+async entry points taking the ``AsyncSession``: the version check goes
+through a blocking cache client and runs in a worker thread, and a rebuild
+queries through the async session.
+"""
+
+import time
+
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
+from app import metrics
 from app.config import settings
 
+pool_checkout_seconds = metrics.histogram(
+    "db_pool_checkout_seconds", "Time to check a connection out of the pool, waits and pre-ping included",
+    (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+pool_timeouts_total = metrics.counter("db_pool_checkout_timeouts_total", "Pool checkouts that gave up waiting")
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout took."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            pool_timeouts_total.inc()
+            raise
+        finally:
+            pool_checkout_seconds.observe(time.perf_counter() - started)
+
+
 engine = create_engine(
     settings.database_url,
+    poolclass=InstrumentedQueuePool,
     pool_size=5,
     max_overflow=10,
     pool_pre_ping=True,
 )
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """``url`` with its driver swapped for the async one (asyncpg / aiosqlite)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    async_database_url(settings.database_url),
+    poolclass=AsyncAdaptedQueuePool,  # aiosqlite would otherwise get NullPool, without pool sizing
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# engine.pool is looked up on each read: dispose() swaps in a new pool
+metrics.gauge("db_pool_size", "Connections the pool keeps open", lambda: engine.pool.size())
+metrics.gauge("db_pool_checked_out", "Connections currently checked out", lambda: engine.pool.checkedout())
+metrics.gauge("db_pool_overflow", "Connections open beyond the pool size", lambda: max(engine.pool.overflow(), 0))
+
 
 class Base(DeclarativeBase):
     pass
@@ -22,3 +90,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,48 @@
+"""HTTP request metrics: latency and status per route, plus rate-limit rejections.
+
+Routes are labelled by their template (``/api/upskilling/{profile_id}``), never
+the raw path, so ids don't multiply the series; requests that match no route
+share ``<unmatched>``.
+"""
+
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app import metrics
+
+request_seconds = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    labelnames=("method", "route"),
+)
+requests_total = metrics.counter(
+    "http_requests_total", "HTTP requests by route and status code", labelnames=("method", "route", "status"),
+)
+rate_limited_total = metrics.counter(
+    "rate_limit_rejections_total", "Requests rejected by the rate limiter", labelnames=("method", "route"),
+)
+
+
+def route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    return route.path if route is not None else "<unmatched>"
+
+
+def record_rate_limited(request: Request) -> None:
+    rate_limited_total.labels(method=request.method, route=route_template(request)).inc()
+
+
+class RequestMetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = route_template(request)
+            request_seconds.labels(method=request.method, route=route).observe(time.perf_counter() - started)
+            requests_total.labels(method=request.method, route=route, status=status).inc()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import os
@@ -5,26 +6,34 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi.errors import RateLimitExceeded
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from sqlalchemy import inspect as sa_inspect, text
 
+from app import metrics
 from app.config import settings
-from app.database import engine, SessionLocal, Base
+from app.database import async_engine, engine, SessionLocal, Base
+from app.http_metrics import RequestMetricsMiddleware, record_rate_limited
 from app.limiter import limiter
+from app.query_stats import QueryStatsMiddleware, install as install_query_stats
+from app.services.request_memo import RequestMemoMiddleware
+from app.warmup import run_warmup
 from app.models import JobRole, Skill, SCTPCourse, MarketInsight, Tenant
 from app.routers import (
     auth, profile, recommend, skill_gap, upskilling,
     upload, jd_match, progress, chat, interview,
     market, compare, peer, projects, export, courses, sso, api_keys, audit_logs,
-    resume_rewriter, dashboard,
+    resume_rewriter, dashboard, skills, sql_stats,
 )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+install_query_stats(engine)
+install_query_stats(async_engine.sync_engine)
+
 # Try multiple path candidates: Docker image, backend/seed_data, repo data/seed (local dev)
 _SEED_CANDIDATES = [
     os.path.join(os.path.dirname(__file__), "..", "seed_data"),
@@ -215,53 +224,44 @@ def _seed_database():
         db.close()
 
 
+def _run_materializer():
+    from app.services.materializer import materialize_all
+
+    db = SessionLocal()
+    try:
+        materialize_all(db)
+    finally:
+        db.close()
+
+
+async def _materialize_periodically(interval_minutes: int):
+    """Incrementally refresh materialized analyses on a fixed interval."""
+    while True:
+        await asyncio.sleep(interval_minutes * 60)
+        try:
+            await asyncio.to_thread(_run_materializer)
+        except Exception as e:
+            logger.warning("Scheduled materialization failed: %s", e)
+
+
 @asynccontextmanager
 async def lifespan(app):
     _seed_database()
-    # Pre-load ML model to avoid cold-start timeouts
-    try:
-        logger.info("Pre-loading ML model...")
-        from app.ml.embeddings import warmup_model
-        warmup_model()
-        logger.info("ML model loaded successfully")
-    except Exception as e:
-        logger.warning("ML model warmup failed (will retry on first request): %s", e)
-    # Pre-build taxonomy FAISS index so first request is fast
-    try:
-        logger.info("Pre-building taxonomy FAISS index...")
-        from app.ml.taxonomy import get_taxonomy_index
-        get_taxonomy_index()
-        logger.info("Taxonomy index built successfully")
-    except Exception as e:
-        logger.warning("Taxonomy index warmup failed (will retry on first request): %s", e)
-        
-    # Pre-compute embeddings for all job roles to avoid timeout on first recommendation request
-    try:
-        logger.info("Warming up skill cache for job roles...")
-        from app.services.skill_matcher import warmup_skill_cache
-        db = SessionLocal()
-        try:
-            roles = db.query(JobRole).all()
-            skill_sets = []
-            for r in roles:
-                if r.required_skills:
-                    skill_sets.append(r.required_skills)
-                if r.preferred_skills:
-                    skill_sets.append(r.preferred_skills)
-                # Also warm up the combined skills used in compute_content_similarity
-                if r.required_skills and r.preferred_skills:
-                    skill_sets.append(r.required_skills + r.preferred_skills)
-            
-            count = warmup_skill_cache(skill_sets)
-            logger.info("Skill cache warmed up with %d unique skill sets from %d roles", count, len(roles))
-        finally:
-            db.close()
-    except Exception as e:
-        logger.warning("Skill cache warmup failed: %s", e)
+    # ML warmup runs in the background; /ready reports its progress
+    warmup_task = asyncio.create_task(asyncio.to_thread(run_warmup))
+
+    materialize_task = None
+    if settings.materialize_interval_minutes > 0:
+        materialize_task = asyncio.create_task(_materialize_periodically(settings.materialize_interval_minutes))
 
     logger.info("Application startup complete")
     yield
 
+    warmup_task.cancel()
+    if materialize_task is not None:
+        materialize_task.cancel()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title="SkillBridge AI",
@@ -274,6 +274,7 @@ app.state.limiter = limiter
 
 
 def _rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    record_rate_limited(request)
     return JSONResponse(
         status_code=429,
         content={"detail": "Too many requests. Please try again later."},
@@ -297,6 +298,9 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
 
 app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(RequestMemoMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 
 
 # --- CORS ---
@@ -340,8 +344,27 @@ app.include_router(api_keys.router, prefix="/api")
 app.include_router(audit_logs.router, prefix="/api")
 app.include_router(resume_rewriter.router, prefix="/api")
 app.include_router(dashboard.router, prefix="/api")
+app.include_router(skills.router, prefix="/api")
+app.include_router(sql_stats.router, prefix="/api")
 
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """This worker's metrics in Prometheus text format (scrape each worker, or run one)."""
+    if not settings.metrics_enabled:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/ready")
+def ready():
+    """Readiness: 200 once every ML warmup stage is done, 503 with progress (and failed stages) otherwise."""
+    from app.warmup import warmup_progress
+
+    snapshot = warmup_progress.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
@@ -0,0 +1,234 @@
+"""Minimal in-process metrics: counters, fixed-bucket histograms and gauges.
+
+Metrics are registered once at import time of the module that owns them and
+are process-local (each uvicorn worker has its own). Pass ``labelnames`` to
+split a counter or histogram by label values (``.labels(route=...)`` returns
+the child to update); a gauge reads its value from a callback at collection
+time. ``snapshot()`` returns every registered metric as plain data and
+``render_prometheus()`` as Prometheus text exposition format, served on
+``/metrics``.
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+_registry: dict[str, "Counter | Histogram | Gauge | Family"] = {}
+_registry_lock = threading.Lock()
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> dict:
+        return {"type": "counter", "description": self.description, "value": self._value}
+
+
+class Histogram:
+    """Cumulative-bucket histogram; ``buckets`` are upper bounds, +Inf is implicit."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...]):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+
+    @contextmanager
+    def time(self):
+        """Observe the wall time of the ``with`` block, in seconds, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def cumulative(self) -> tuple[list[tuple[float, int]], float, int]:
+        """``([(upper bound, observations <= bound), ...], sum, count)``, ending with +Inf."""
+        with self._lock:
+            buckets, running = [], 0
+            for bound, n in zip(self.buckets + (math.inf,), self._counts):
+                running += n
+                buckets.append((bound, running))
+            return buckets, self._sum, self._count
+
+    def snapshot(self) -> dict:
+        buckets, total, count = self.cumulative()
+        return {
+            "type": "histogram", "description": self.description, "count": count, "sum": total,
+            "buckets": {"+Inf" if bound == math.inf else str(bound): n for bound, n in buckets},
+        }
+
+
+class Gauge:
+    """Current value read from ``fn`` whenever metrics are collected."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, description: str, fn: Callable[[], float]):
+        self.name = name
+        self.description = description
+        self._fn = fn
+
+    @property
+    def value(self) -> float:
+        try:
+            return float(self._fn())
+        except Exception:
+            # A failing callback must not break collection of every other metric
+            return math.nan
+
+    def snapshot(self) -> dict:
+        return {"type": "gauge", "description": self.description, "value": self.value}
+
+
+class Family:
+    """A counter or histogram split by label values."""
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...], make: Callable[[], Counter | Histogram]):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._make = make
+        self.type = make().type
+        self._children: dict[tuple[str, ...], Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **values) -> Counter | Histogram:
+        if set(values) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name!r} takes labels {self.labelnames}, got {tuple(values)}")
+        key = tuple(str(values[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._make())
+        return child
+
+    def children(self) -> list[tuple[dict[str, str], Counter | Histogram]]:
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.labelnames, key)), child) for key, child in sorted(items)]
+
+    def snapshot(self) -> dict:
+        series = []
+        for labels, child in self.children():
+            data = child.snapshot()
+            del data["type"], data["description"]
+            series.append({"labels": labels, **data})
+        return {"type": self.type, "description": self.description, "labelnames": list(self.labelnames), "series": series}
+
+
+def _register(metric):
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.type != metric.type:
+                raise ValueError(f"Metric {metric.name!r} already registered as {type(existing).__name__}")
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+
+def counter(name: str, description: str, labelnames: tuple[str, ...] = ()) -> Counter | Family:
+    """Return the counter registered under ``name``, creating it if needed."""
+    if labelnames:
+        return _register(Family(name, description, labelnames, lambda: Counter(name, description)))
+    return _register(Counter(name, description))
+
+
+def histogram(
+    name: str, description: str, buckets: tuple[float, ...], labelnames: tuple[str, ...] = ()
+) -> Histogram | Family:
+    """Return the histogram registered under ``name``, creating it if needed."""
+    if labelnames:
+        return _register(Family(name, description, labelnames, lambda: Histogram(name, description, buckets)))
+    return _register(Histogram(name, description, buckets))
+
+
+def gauge(name: str, description: str, fn: Callable[[], float]) -> Gauge:
+    """Return the gauge registered under ``name``, creating it with callback ``fn`` if needed."""
+    return _register(Gauge(name, description, fn))
+
+
+def snapshot() -> dict[str, dict]:
+    with _registry_lock:
+        metrics = list(_registry.values())
+    return {m.name: m.snapshot() for m in metrics}
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + "}"
+
+
+def _render_samples(name: str, metric, labels: dict[str, str]) -> list[str]:
+    if isinstance(metric, Histogram):
+        buckets, total, count = metric.cumulative()
+        lines = [
+            f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {n}" for bound, n in buckets
+        ]
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return lines
+    return [f"{name}{_format_labels(labels)} {_format_value(metric.value)}"]
+
+
+def render_prometheus() -> str:
+    """Every registered metric in Prometheus text exposition format (version 0.0.4)."""
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    lines = []
+    for metric in metrics:
+        help_text = metric.description.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {metric.name} {help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        if isinstance(metric, Family):
+            for labels, child in metric.children():
+                lines.extend(_render_samples(metric.name, child, labels))
+        else:
+            lines.extend(_render_samples(metric.name, metric, {}))
+    return "\n".join(lines) + "\n"
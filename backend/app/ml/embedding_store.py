@@ -0,0 +1,172 @@
+"""Content-addressed on-disk embedding store shared across worker processes.
+
+Vectors are persisted as append-only ``.npy`` shards under
+``<root>/<encoder>/`` (one directory per model and runtime, see
+``embeddings.encoder_identity``) and opened with ``mmap_mode="r"``, so every uvicorn worker
+maps the same pages from the OS page cache instead of holding its own copy.
+Each shard has a sibling ``.json`` manifest listing the keys of its rows; the
+manifest is written last, so a shard only becomes visible once it is complete.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Merge shards into one file once a model directory accumulates this many
+_MAX_SHARDS = 64
+
+_store_registry: dict[tuple[str, str], "EmbeddingStore"] = {}
+_registry_lock = threading.Lock()
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace; the tokenizer ignores it, so the embedding is unchanged."""
+    return " ".join(text.split())
+
+
+def text_key(model_name: str, text: str) -> str:
+    """Content address for a (model, text) pair."""
+    raw = f"{model_name}\x00{normalize_text(text)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """Memory-mapped key -> vector store for a single embedding model."""
+
+    def __init__(self, root: str | os.PathLike, model_name: str):
+        self.model_name = model_name
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory = Path(root) / safe_name
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._shards: dict[str, np.ndarray] = {}
+        self._rows: dict[str, tuple[str, int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._refresh()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _refresh(self) -> None:
+        """Map any shards written (by this or another process) since the last scan."""
+        try:
+            manifests = sorted(p for p in self.directory.glob("*.json"))
+        except FileNotFoundError:
+            return
+        for manifest in manifests:
+            shard_id = manifest.stem
+            if shard_id in self._shards:
+                continue
+            try:
+                with open(manifest) as f:
+                    keys = json.load(f)["keys"]
+                vectors = np.load(self.directory / f"{shard_id}.npy", mmap_mode="r")
+            except (FileNotFoundError, ValueError, KeyError) as e:
+                # Shard removed by a concurrent compaction, or a torn write
+                logger.debug("Skipping embedding shard %s: %s", shard_id, e)
+                continue
+            if len(keys) != vectors.shape[0]:
+                logger.warning("Embedding shard %s is inconsistent, ignoring", shard_id)
+                continue
+            self._shards[shard_id] = vectors
+            for row, key in enumerate(keys):
+                self._rows.setdefault(key, (shard_id, row))
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Return vectors for the keys that are present in the store."""
+        with self._lock:
+            if any(k not in self._rows for k in keys):
+                self._refresh()
+            found = {}
+            for key in keys:
+                loc = self._rows.get(key)
+                if loc is not None:
+                    shard_id, row = loc
+                    found[key] = self._shards[shard_id][row]
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            return found
+
+    def put_many(self, keys: list[str], vectors: np.ndarray) -> None:
+        """Persist a batch of vectors as a new shard. Existing keys are skipped."""
+        with self._lock:
+            fresh = [i for i, k in enumerate(keys) if k not in self._rows]
+            fresh = list({keys[i]: i for i in fresh}.values())
+            if not fresh:
+                return
+            new_keys = [keys[i] for i in fresh]
+            new_vectors = np.ascontiguousarray(vectors[fresh], dtype=np.float32)
+            try:
+                shard_id = self._write_shard(new_keys, new_vectors)
+            except OSError as e:
+                logger.warning("Could not persist %d embeddings: %s", len(new_keys), e)
+                return
+            self._shards[shard_id] = np.load(self.directory / f"{shard_id}.npy", mmap_mode="r")
+            for row, key in enumerate(new_keys):
+                self._rows.setdefault(key, (shard_id, row))
+            if len(self._shards) > _MAX_SHARDS:
+                self._compact()
+
+    def _write_shard(self, keys: list[str], vectors: np.ndarray) -> str:
+        shard_id = f"{os.getpid()}-{uuid.uuid4().hex}"
+        npy_path = self.directory / f"{shard_id}.npy"
+        tmp_npy = self.directory / f".{shard_id}.npy.tmp"
+        with open(tmp_npy, "wb") as f:
+            np.save(f, vectors)
+        os.replace(tmp_npy, npy_path)
+
+        tmp_manifest = self.directory / f".{shard_id}.json.tmp"
+        with open(tmp_manifest, "w") as f:
+            json.dump({"model": self.model_name, "dim": int(vectors.shape[1]), "keys": keys}, f)
+        os.replace(tmp_manifest, self.directory / f"{shard_id}.json")
+        return shard_id
+
+    def _compact(self) -> None:
+        """Merge all mapped shards into one. Caller must hold the lock."""
+        keys = list(self._rows)
+        vectors = np.stack([self._shards[s][r] for s, r in self._rows.values()])
+        old_shards = list(self._shards)
+        try:
+            shard_id = self._write_shard(keys, vectors)
+        except OSError as e:
+            logger.warning("Embedding store compaction failed: %s", e)
+            return
+        for old in old_shards:
+            for suffix in (".json", ".npy"):
+                try:
+                    (self.directory / f"{old}{suffix}").unlink()
+                except FileNotFoundError:
+                    pass
+        # Open mappings stay valid after unlink; remap onto the merged shard.
+        self._shards = {shard_id: np.load(self.directory / f"{shard_id}.npy", mmap_mode="r")}
+        self._rows = {key: (shard_id, row) for row, key in enumerate(keys)}
+        logger.info("Compacted %d embedding shards into %s", len(old_shards), shard_id)
+
+
+def get_store(root: str, model_name: str) -> EmbeddingStore | None:
+    """Return the process-wide store for (root, model), or None if it cannot be opened."""
+    key = (root, model_name)
+    store = _store_registry.get(key)
+    if store is not None:
+        return store
+    with _registry_lock:
+        store = _store_registry.get(key)
+        if store is None:
+            try:
+                store = EmbeddingStore(root, model_name)
+            except OSError as e:
+                logger.warning("Embedding store at %s unavailable: %s", root, e)
+                return None
+            _store_registry[key] = store
+            logger.info("Embedding store opened at %s (%d vectors)", store.directory, len(store))
+    return store
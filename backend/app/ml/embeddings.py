@@ -1,37 +1,248 @@
-"""Sentence Transformer model wrapper for skill embeddings."""
+"""Sentence Transformer model wrapper for skill embeddings.
+
+``ENCODER_BACKEND`` selects the inference runtime:
+
+* ``torch``     — PyTorch (default);
+* ``onnx``      — ONNX Runtime with the model's exported ``onnx/model.onnx``;
+* ``onnx-int8`` — ONNX Runtime with a dynamically int8-quantized export
+  (``ENCODER_ONNX_FILE``, default ``onnx/model_quint8_avx2.onnx``).
+
+The ONNX backends need ``optimum[onnxruntime]``; if it is missing or the model
+files cannot be loaded, the PyTorch model is used instead.
+"""
 
 import logging
+import threading
+from typing import TYPE_CHECKING
+
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
+from app import metrics
 from app.config import settings
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 logger = logging.getLogger(__name__)
 
+ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8")
+_DEFAULT_INT8_FILE = "onnx/model_quint8_avx2.onnx"
+
+encode_batch_size_histogram = metrics.histogram(
+    "encode_texts_batch_size", "Texts per encode_texts call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+encode_seconds_histogram = metrics.histogram(
+    "encode_texts_duration_seconds", "Wall time of encode_texts calls, store lookups included",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
 _model = None
+_model_backend: str | None = None
+
+
+def load_model(backend: str) -> "SentenceTransformer":
+    """Load the configured model on the given backend (no caching, no fallback)."""
+    # Imported here: torch + transformers take seconds to import
+    from sentence_transformers import SentenceTransformer
+
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend {backend!r}; expected one of {ENCODER_BACKENDS}")
+    model_name = settings.sentence_transformer_model
+    threads = settings.encoder_num_threads
+
+    if backend == "torch":
+        if threads:
+            import torch
+
+            torch.set_num_threads(threads)
+        return SentenceTransformer(model_name, device="cpu")
+
+    model_kwargs = {"provider": "CPUExecutionProvider"}
+    file_name = settings.encoder_onnx_file or (_DEFAULT_INT8_FILE if backend == "onnx-int8" else "")
+    if file_name:
+        model_kwargs["file_name"] = file_name
+    if threads:
+        import onnxruntime
 
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        model_kwargs["session_options"] = options
+    return SentenceTransformer(model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs)
 
-def get_model() -> SentenceTransformer:
-    global _model
+
+def get_model() -> "SentenceTransformer":
+    global _model, _model_backend
     if _model is None:
-        model_name = settings.sentence_transformer_model
-        logger.info("Loading Sentence Transformer model: %s", model_name)
-        _model = SentenceTransformer(model_name, device="cpu")
+        backend = settings.encoder_backend
+        logger.info("Loading Sentence Transformer model: %s (%s)", settings.sentence_transformer_model, backend)
+        try:
+            _model = load_model(backend)
+        except Exception as e:
+            if backend == "torch":
+                raise
+            logger.warning("Encoder backend %r unavailable (%s); falling back to torch", backend, e)
+            backend = "torch"
+            _model = load_model(backend)
+        _model_backend = backend
         logger.info("Model loaded successfully")
     return _model
 
 
+def get_encoder_backend() -> str | None:
+    """Backend of the loaded model, or None if it has not been loaded yet."""
+    return _model_backend
+
+
+def encoder_identity() -> str:
+    """Model, runtime and ONNX file that currently produce this process's vectors.
+
+    Runtimes do not produce identical vectors (int8 is ~0.97 cosine to torch),
+    so persisted vectors and indexes are namespaced by this. With
+    ``ENCODER_SOCKET`` set it is the sidecar's identity, as reported in its
+    replies; while the sidecar is down (vectors come from the local fallback)
+    it is ``local_encoder_identity()``.
+    """
+    remote = _get_remote()
+    if remote is not None and remote.available():
+        if remote.identity is None:
+            remote.ping()  # learns the identity, or marks the sidecar down
+        if remote.identity is not None and remote.available():
+            return remote.identity
+    return local_encoder_identity()
+
+
+def local_encoder_identity() -> str:
+    """Identity of this process's own model, e.g. ``all-MiniLM-L6-v2@onnx-int8:onnx/model_quint8_avx2.onnx``.
+
+    It is the loaded model's backend, which differs from ``ENCODER_BACKEND``
+    after a fallback to torch, or the configured one before the model is loaded.
+    """
+    backend = _model_backend or settings.encoder_backend
+    identity = f"{settings.sentence_transformer_model}@{backend}"
+    if backend != "torch":
+        identity += ":" + (settings.encoder_onnx_file or (_DEFAULT_INT8_FILE if backend == "onnx-int8" else ""))
+    return identity
+
+
 def warmup_model():
-    """Pre-load the model and run a dummy encode to warm up."""
+    """Pre-load the model and run a dummy encode to warm up.
+
+    With ``ENCODER_SOCKET`` set and the encoder sidecar reachable, the model
+    is not loaded in this process at all.
+    """
+    remote = _get_remote()
+    if remote is not None and remote.ping():
+        logger.info("Using encoder sidecar at %s; skipping local model load", remote.path)
+        return
     model = get_model()
     model.encode(["warmup"], normalize_embeddings=True)
     logger.info("Model warmup complete")
 
 
-def encode_texts(texts: list[str]) -> np.ndarray:
+_remote = None
+
+
+def _get_remote():
+    """Client for the encoder sidecar, or None when ``ENCODER_SOCKET`` is unset."""
+    global _remote
+    if not settings.encoder_socket:
+        return None
+    if _remote is None or _remote.path != settings.encoder_socket:
+        from app.ml.encoder_server import EncoderClient
+
+        _remote = EncoderClient(settings.encoder_socket, timeout=settings.encoder_timeout_seconds)
+    return _remote
+
+
+def _encode_local(texts: list[str]) -> np.ndarray:
     model = get_model()
     return model.encode(texts, normalize_embeddings=True)
 
 
+def _encode_direct(texts: list[str]) -> np.ndarray:
+    remote = _get_remote()
+    if remote is not None and texts:
+        from app.ml.encoder_server import EncoderUnavailable
+
+        try:
+            return remote.encode(texts)
+        except EncoderUnavailable:
+            pass  # logged by the client; encode in-process instead
+    return _encode_local(texts)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                from app.ml.micro_batcher import MicroBatcher
+
+                _batcher = MicroBatcher(
+                    _encode_direct,
+                    max_batch=settings.encoder_batch_max_size,
+                    max_wait_ms=settings.encoder_batch_max_wait_ms,
+                )
+    return _batcher
+
+
+def _encode_with_model(texts: list[str]) -> np.ndarray:
+    """Run the model, coalescing with concurrent callers when batching is enabled."""
+    if settings.encoder_batching_enabled and texts:
+        return get_batcher().encode(texts)
+    return _encode_direct(texts)
+
+
+def encode_texts(texts: list[str]) -> np.ndarray:
+    """Encode texts to L2-normalised embeddings.
+
+    When ``EMBEDDING_STORE_DIR`` is set, vectors are looked up in the shared
+    on-disk store first and only the misses are sent to the model (in one
+    batch), after which they are persisted for other workers and restarts.
+    The store is namespaced by ``encoder_identity()``, so vectors from
+    different runtimes are never mixed.
+    """
+    encode_batch_size_histogram.observe(len(texts))
+    with encode_seconds_histogram.time():
+        return _encode_texts(texts)
+
+
+def _encode_texts(texts: list[str]) -> np.ndarray:
+    if not settings.embedding_store_dir or not texts:
+        return _encode_with_model(texts)
+
+    from app.ml.embedding_store import get_store, text_key
+
+    identity = encoder_identity()
+    store = get_store(settings.embedding_store_dir, identity)
+    if store is None:
+        return _encode_with_model(texts)
+
+    keys = [text_key(identity, t) for t in texts]
+    found = store.get_many(keys)
+
+    missing: dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        new_vectors = np.asarray(_encode_with_model(list(missing.values())), dtype=np.float32)
+        if encoder_identity() != identity:
+            # Produced by another encoder than looked up (a runtime fallback on load, the
+            # sidecar going down or coming back): redo the lookup under its namespace
+            return _encode_texts(texts)
+        new_keys = list(missing)
+        store.put_many(new_keys, new_vectors)
+        found.update(zip(new_keys, new_vectors))
+
+    return np.stack([found[k] for k in keys]).astype(np.float32)
+
+
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     return float(np.dot(a, b))
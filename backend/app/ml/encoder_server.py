@@ -0,0 +1,192 @@
+"""Encoder sidecar: one process holds the model, web workers call it over a Unix socket.
+
+Run next to the API (see the ``encoder`` service in docker-compose)::
+
+    python -m app.ml.encoder_server --socket /run/skillbridge/encoder.sock
+
+and set ``ENCODER_SOCKET`` to the same path for the web workers. Concurrent
+requests from all workers go through the server's micro-batcher, so they share
+model batches. When the socket is unreachable, ``EncoderClient`` raises
+``EncoderUnavailable`` and callers fall back to in-process encoding.
+
+Every reply names the sidecar's ``encoder_identity()``; web workers namespace
+stored vectors and index snapshots by it rather than by their own settings.
+
+Wire format (all integers big-endian):
+
+* request:  ``u32 length`` + UTF-8 JSON list of texts;
+* response: ``u8 0`` + ``u32 rows`` + ``u32 dim`` + float32 rows +
+  ``u32 length`` + UTF-8 encoder identity, or ``u8 1`` + ``u32 length`` +
+  UTF-8 error message.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_OK, _ERROR = 0, 1
+# Seconds to stop trying the socket after a failure, before retrying
+_RETRY_AFTER = 30.0
+
+
+class EncoderUnavailable(Exception):
+    """The encoder sidecar could not be reached or failed to encode."""
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    chunks, remaining = [], n
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+class EncoderClient:
+    """Thread-safe client; keeps one persistent connection per calling thread."""
+
+    def __init__(self, path: str, timeout: float):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._down_until = 0.0
+        self.identity: str | None = None  # encoder_identity() of the sidecar, from its last reply
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            self._local.sock = sock
+        return sock
+
+    def _reset(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        if time.monotonic() < self._down_until:
+            raise EncoderUnavailable(f"encoder at {self.path} marked down")
+        payload = json.dumps(texts).encode("utf-8")
+        try:
+            sock = self._connection()
+            sock.sendall(struct.pack(">I", len(payload)) + payload)
+            (status,) = struct.unpack(">B", _recv_exact(sock, 1))
+            if status == _ERROR:
+                (length,) = struct.unpack(">I", _recv_exact(sock, 4))
+                raise EncoderUnavailable(_recv_exact(sock, length).decode("utf-8"))
+            rows, dim = struct.unpack(">II", _recv_exact(sock, 8))
+            data = _recv_exact(sock, rows * dim * 4)
+            (length,) = struct.unpack(">I", _recv_exact(sock, 4))
+            self.identity = _recv_exact(sock, length).decode("utf-8")
+        except (OSError, struct.error) as e:
+            self._reset()
+            self._down_until = time.monotonic() + _RETRY_AFTER
+            logger.warning("Encoder at %s unreachable (%s); encoding in-process for %ds", self.path, e, _RETRY_AFTER)
+            raise EncoderUnavailable(f"encoder at {self.path} unreachable: {e}") from e
+        return np.frombuffer(data, dtype=np.float32).reshape(rows, dim)
+
+    def available(self) -> bool:
+        """False while the sidecar is marked down after a failure."""
+        return time.monotonic() >= self._down_until
+
+    def ping(self) -> bool:
+        try:
+            self.encode(["warmup"])
+            return True
+        except EncoderUnavailable:
+            return False
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        while True:
+            try:
+                (length,) = struct.unpack(">I", _recv_exact(self.request, 4))
+                texts = json.loads(_recv_exact(self.request, length))
+            except (ConnectionError, OSError):
+                return
+            try:
+                vectors = np.ascontiguousarray(self.server.encode_fn(texts), dtype=np.float32)
+                if vectors.ndim != 2:
+                    vectors = vectors.reshape(len(texts), -1)
+                identity = self.server.identity.encode("utf-8")
+                reply = (
+                    struct.pack(">BII", _OK, *vectors.shape) + vectors.tobytes()
+                    + struct.pack(">I", len(identity)) + identity
+                )
+            except Exception as e:
+                logger.exception("Encoding %d texts failed", len(texts))
+                message = str(e).encode("utf-8")
+                reply = struct.pack(">BI", _ERROR, len(message)) + message
+            self.request.sendall(reply)
+
+
+class EncoderServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, encode_fn: Callable[[list[str]], np.ndarray], identity: str):
+        self.encode_fn = encode_fn
+        self.identity = identity
+        super().__init__(path, _Handler)
+
+
+def _local_encode_fn() -> Callable[[list[str]], np.ndarray]:
+    """In-process model encoding, micro-batched across connections when enabled."""
+    from app.ml.embeddings import _encode_local
+    from app.ml.micro_batcher import MicroBatcher
+
+    if not settings.encoder_batching_enabled:
+        return _encode_local
+    return MicroBatcher(
+        _encode_local,
+        max_batch=settings.encoder_batch_max_size,
+        max_wait_ms=settings.encoder_batch_max_wait_ms,
+    ).encode
+
+
+def serve(path: str) -> None:
+    from app.ml.embeddings import local_encoder_identity, warmup_model
+
+    # This process is the encoder: never forward to a socket (including our own)
+    settings.encoder_socket = ""
+    if os.path.exists(path):
+        os.unlink(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    warmup_model()
+    # After warmup, so a fallback to torch is reflected
+    identity = local_encoder_identity()
+    with EncoderServer(path, _local_encode_fn(), identity) as server:
+        os.chmod(path, 0o660)
+        logger.info("Encoder listening on %s (%s)", path, identity)
+        server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve sentence-transformer encoding over a Unix socket.")
+    parser.add_argument("--socket", default=settings.encoder_socket or "/run/skillbridge/encoder.sock")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    serve(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Index construction for skill embeddings: exact float32 or quantized.
+
+``EMBEDDING_INDEX_MODE`` selects how vectors are stored:
+
+* ``flat`` — ``IndexFlatIP`` over float32 vectors (exact, 4 bytes/dim);
+* ``sq8``  — 8-bit scalar quantization (1 byte/dim, ~4x smaller);
+* ``pq``   — product quantization with ``EMBEDDING_INDEX_PQ_M`` one-byte
+  codes per vector (e.g. 48 bytes for 384 dims, ~32x smaller).
+
+PQ needs enough vectors to train its codebooks; smaller sets fall back to
+``sq8``. Use ``benchmarks/index_recall.py`` to check a mode against the flat
+index before enabling it.
+"""
+
+import logging
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from app import metrics
+from app.config import settings
+
+if TYPE_CHECKING:
+    import faiss
+
+logger = logging.getLogger(__name__)
+
+INDEX_MODES = ("flat", "sq8", "pq")
+
+# FAISS wants >= 39 training points per centroid (2**8 centroids per sub-quantizer)
+_PQ_MIN_TRAIN = 39 * 256
+
+search_seconds_histogram = metrics.histogram(
+    "faiss_search_seconds", "FAISS index search time by index",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+    labelnames=("index",),
+)
+
+
+def build_index(embeddings: np.ndarray, mode: str | None = None) -> "faiss.Index":
+    """Build an inner-product FAISS index over L2-normalised embeddings."""
+    import faiss
+
+    mode = mode or settings.embedding_index_mode
+    if mode not in INDEX_MODES:
+        raise ValueError(f"Unknown embedding index mode {mode!r}; expected one of {INDEX_MODES}")
+
+    vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+    n, dim = vectors.shape
+
+    if mode == "pq":
+        m = settings.embedding_index_pq_m
+        if n >= _PQ_MIN_TRAIN and dim % m == 0:
+            index = faiss.IndexPQ(dim, m, 8, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+            index.add(vectors)
+            return index
+        logger.debug("PQ needs >= %d vectors and dim %% m == 0; using sq8 for %d x %d", _PQ_MIN_TRAIN, n, dim)
+        mode = "sq8"
+
+    if mode == "sq8":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.add(vectors)
+        return index
+
+    index = faiss.IndexFlatIP(dim)
+    index.add(vectors)
+    return index
+
+
+def search(index: "faiss.Index", queries: np.ndarray, k: int, name: str) -> tuple[np.ndarray, np.ndarray]:
+    """``index.search``, timed under ``faiss_search_seconds{index=name}``."""
+    with search_seconds_histogram.labels(index=name).time():
+        return index.search(queries, k)
+
+
+def index_nbytes(index: "faiss.Index") -> int:
+    """Serialized size of an index, a close proxy for its resident memory."""
+    import faiss
+
+    return int(faiss.serialize_index(index).size)
+
+
+def quantize_rows(embeddings: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization: ``embeddings ~= codes * scales[:, None]``."""
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    max_abs = np.abs(vectors).max(axis=1) if len(vectors) else np.zeros(0, dtype=np.float32)
+    scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales
@@ -0,0 +1,112 @@
+"""Coalesce concurrent encode calls into shared model batches.
+
+Callers block in ``MicroBatcher.encode`` while a single worker thread collects
+queued requests for up to ``max_wait_ms`` (or until ``max_batch`` texts are
+queued), encodes the distinct texts of all of them in one model call and hands
+each caller its rows. A request larger than ``max_batch`` is encoded on its own.
+
+Model calls are serialised on that one thread, so batching pays off when many
+small calls arrive together (the encoder sidecar, bursts of normalisations)
+and can cost throughput when a few large calls would otherwise overlap; it is
+off unless ``ENCODER_BATCHING_ENABLED`` is set.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+from app import metrics
+
+logger = logging.getLogger(__name__)
+
+batch_size_histogram = metrics.histogram(
+    "encoder_batch_size", "Distinct texts per coalesced encoder batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+requests_per_batch_histogram = metrics.histogram(
+    "encoder_batch_requests", "encode_texts calls served per coalesced batch",
+    buckets=(1, 2, 4, 8, 16, 32),
+)
+queue_wait_histogram = metrics.histogram(
+    "encoder_queue_wait_seconds", "Time an encode call waited before its batch started",
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+
+
+@dataclass
+class _Request:
+    texts: list[str]
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    done: threading.Event = field(default_factory=threading.Event)
+    result: np.ndarray | None = None
+    error: BaseException | None = None
+
+
+class MicroBatcher:
+    def __init__(self, encode_fn: Callable[[list[str]], np.ndarray], max_batch: int, max_wait_ms: float):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: deque[_Request] = deque()
+        self._cond = threading.Condition()
+        self._worker: threading.Thread | None = None
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Encode non-empty ``texts``; blocks until the batch containing them is done."""
+        request = _Request(list(texts))
+        with self._cond:
+            self._queue.append(request)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="encoder-batcher", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _take_batch(self) -> list[_Request]:
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+            deadline = self._queue[0].enqueued_at + self.max_wait
+            while sum(len(r.texts) for r in self._queue) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch, size = [], 0
+            while self._queue and (not batch or size + len(self._queue[0].texts) <= self.max_batch):
+                request = self._queue.popleft()
+                batch.append(request)
+                size += len(request.texts)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            started = time.perf_counter()
+            for request in batch:
+                queue_wait_histogram.observe(started - request.enqueued_at)
+
+            unique = list(dict.fromkeys(t for r in batch for t in r.texts))
+            batch_size_histogram.observe(len(unique))
+            requests_per_batch_histogram.observe(len(batch))
+            try:
+                vectors = np.asarray(self.encode_fn(unique), dtype=np.float32)
+                row = {t: i for i, t in enumerate(unique)}
+                for request in batch:
+                    request.result = vectors[[row[t] for t in request.texts]]
+            except Exception as e:
+                logger.exception("Batched encode of %d texts failed", len(unique))
+                for request in batch:
+                    request.error = e
+            finally:
+                for request in batch:
+                    request.done.set()
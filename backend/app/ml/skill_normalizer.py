@@ -0,0 +1,118 @@
+"""Tiered mapping of free-text skills to canonical taxonomy names.
+
+Each input is resolved by the cheapest tier that recognises it:
+
+1. ``exact``  — already a canonical skill;
+2. ``alias``  — equal after folding case, whitespace and punctuation
+   (``react.JS`` -> ``React``), or listed in ``skill_aliases.json``;
+3. ``fuzzy``  — close spelling of a canonical name or alias (difflib ratio
+   >= ``SKILL_FUZZY_CUTOFF``, inputs of at least 4 characters);
+4. ``embedding`` — nearest taxonomy skill in the FAISS index above the
+   similarity threshold. All inputs reaching this tier are encoded in one batch.
+
+Inputs matched by no tier are kept as given (``unmatched``).
+"""
+
+import difflib
+import re
+
+import numpy as np
+
+from app import metrics
+from app.config import settings
+
+TIERS = ("exact", "alias", "fuzzy", "embedding", "unmatched")
+
+_tier_counters = {
+    tier: metrics.counter(f"skill_normalize_{tier}_total", f"Skills resolved by the {tier} normalization tier")
+    for tier in TIERS
+}
+
+_FOLD_DROP = re.compile(r"[\s._\-/]+")
+# Fuzzy matching below this length mostly produces false positives (R vs Go)
+_FUZZY_MIN_LENGTH = 4
+
+
+def fold(text: str) -> str:
+    """Case-, whitespace- and punctuation-insensitive key; keeps ``+`` and ``#`` (C++, C#)."""
+    return _FOLD_DROP.sub("", text.casefold())
+
+
+class SkillNormalizer:
+    def __init__(self, skills: list[str], aliases: dict[str, str] | None = None):
+        self.skills = skills
+        self._canonical = set(skills)
+        self._folded: dict[str, str] = {}
+        for skill in skills:
+            key = fold(skill)
+            self._folded.setdefault(key, skill)
+            # "Vue.js" <-> "Vue", "React" <-> "ReactJS"
+            if key.endswith("js") and len(key) > 2:
+                self._folded.setdefault(key[:-2], skill)
+            else:
+                self._folded.setdefault(key + "js", skill)
+        for alias, canonical in (aliases or {}).items():
+            if canonical in self._canonical:
+                self._folded.setdefault(fold(alias), canonical)
+        self._fuzzy_keys = [k for k in self._folded if len(k) >= _FUZZY_MIN_LENGTH]
+
+    def lookup(self, text: str) -> tuple[str | None, str]:
+        """Resolve one input without the embedding tier: ``(canonical or None, tier)``."""
+        if text in self._canonical:
+            return text, "exact"
+        key = fold(text)
+        canonical = self._folded.get(key)
+        if canonical is not None:
+            return canonical, "alias"
+        if len(key) >= _FUZZY_MIN_LENGTH:
+            close = difflib.get_close_matches(key, self._fuzzy_keys, n=1, cutoff=settings.skill_fuzzy_cutoff)
+            if close:
+                return self._folded[close[0]], "fuzzy"
+        return None, "embedding"
+
+    def resolve(
+        self, texts: list[str], threshold: float, nearest: dict[str, tuple[str, float]] | None = None
+    ) -> list[tuple[str | None, str]]:
+        """Resolve every input, encoding only those no string tier recognised.
+
+        ``nearest`` maps inputs to an already searched ``(skill, score)`` top-1
+        taxonomy match, used instead of encoding them again.
+        """
+        results: list[tuple[str | None, str] | None] = [None] * len(texts)
+        pending: dict[str, list[int]] = {}
+        memo: dict[str, tuple[str | None, str]] = {}
+        for i, text in enumerate(texts):
+            if text not in memo:
+                memo[text] = self.lookup(text)
+            canonical, tier = memo[text]
+            if tier == "embedding":
+                pending.setdefault(text, []).append(i)
+            else:
+                results[i] = (canonical, tier)
+
+        if pending:
+            top = nearest if nearest is not None else self._nearest(list(pending))
+            for text, positions in pending.items():
+                skill, score = top.get(text, (None, float("-inf")))
+                match = (skill, "embedding") if score >= threshold else (None, "unmatched")
+                for i in positions:
+                    results[i] = match
+
+        for _, tier in results:
+            _tier_counters[tier].inc()
+        return results
+
+    @staticmethod
+    def _nearest(queries: list[str]) -> dict[str, tuple[str, float]]:
+        from app.ml.embeddings import encode_texts
+        from app.ml.indexes import search
+        from app.ml.taxonomy import get_taxonomy_index
+
+        index, skills = get_taxonomy_index()
+        scores, indices = search(index, np.asarray(encode_texts(queries), dtype=np.float32), 1, "taxonomy")
+        return {text: (skills[indices[q][0]], float(scores[q][0])) for q, text in enumerate(queries)}
+
+
+def tier_stats() -> dict[str, int]:
+    """Process-wide number of inputs resolved per tier."""
+    return {tier: int(counter.value) for tier, counter in _tier_counters.items()}
@@ -0,0 +1,230 @@
+"""On-disk snapshots of built indexes for near-instant warm starts.
+
+Set ``INDEX_SNAPSHOT_DIR`` to persist:
+
+* the taxonomy FAISS index (``faiss.write_index``), keyed by the hash of
+  ``skills_taxonomy.json``, the encoder (model, runtime and ONNX file, see
+  ``embeddings.encoder_identity``) and the index mode;
+* each tenant's ``RoleSkillMatrix``, keyed additionally by the roles
+  fingerprint, as a memory-mapped ``.npy`` of embeddings plus an ``.npz`` of
+  the small index arrays.
+
+Snapshot files are named by that key, so a changed taxonomy or role table
+simply misses and is rebuilt. Names also carry a scope, the hash of the
+encoder identity and index mode alone: when a new snapshot is written, older
+ones of the same kind and scope are removed, while those of processes with
+another encoder runtime or index mode sharing the directory are left alone. Every snapshot has a ``.json`` manifest listing
+its skill texts. It is written last, so a snapshot only becomes visible once
+it is complete.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    import faiss
+
+    from app.services.skill_matcher import RoleSkillMatrix
+
+logger = logging.getLogger(__name__)
+
+_MATRIX_ARRAYS = ("vocab_ids", "weights", "offsets", "lengths", "required_counts")
+
+
+def _directory() -> Path | None:
+    if not settings.index_snapshot_dir:
+        return None
+    path = Path(settings.index_snapshot_dir)
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.warning("Index snapshot dir %s unavailable: %s", path, e)
+        return None
+    return path
+
+
+def snapshot_key(*parts: object) -> str:
+    """Content key over the encoder, index mode and the given inputs."""
+    from app.ml.embeddings import encoder_identity
+
+    raw = "\x00".join(map(str, (encoder_identity(), settings.embedding_index_mode) + parts))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def snapshot_scope() -> str:
+    """Short hash of the encoder and index mode; snapshots are only pruned within one scope."""
+    from app.ml.embeddings import encoder_identity
+
+    raw = f"{encoder_identity()}\x00{settings.embedding_index_mode}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:8]
+
+
+def _atomic_write(path: Path, write) -> None:
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _write_manifest(path: Path, manifest: dict) -> None:
+    def write(tmp: Path) -> None:
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+
+    _atomic_write(path, write)
+
+
+def _read_manifest(path: Path) -> dict | None:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning("Ignoring unreadable snapshot manifest %s: %s", path, e)
+        return None
+
+
+def _prune(directory: Path, prefix: str, keep: str) -> None:
+    """Remove files of older snapshots of the same kind and scope (``prefix``)."""
+    for path in directory.glob(f"{prefix}-*"):
+        if not path.name.startswith(f"{prefix}-{keep}."):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# --- Taxonomy index ---
+
+def load_taxonomy_index(taxonomy_hash: str) -> tuple["faiss.Index", list[str]] | None:
+    directory = _directory()
+    if directory is None:
+        return None
+    import faiss
+
+    key = snapshot_key("taxonomy", taxonomy_hash)
+    prefix = f"taxonomy-{snapshot_scope()}"
+    manifest = _read_manifest(directory / f"{prefix}-{key}.json")
+    if manifest is None:
+        return None
+    try:
+        index = faiss.read_index(str(directory / f"{prefix}-{key}.faiss"), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError as e:
+        logger.warning("Taxonomy index snapshot unreadable, rebuilding: %s", e)
+        return None
+    if index.ntotal != len(manifest["skills"]):
+        logger.warning("Taxonomy index snapshot is inconsistent, rebuilding")
+        return None
+    logger.info("Loaded taxonomy index snapshot %s (%d skills)", key, index.ntotal)
+    return index, manifest["skills"]
+
+
+def save_taxonomy_index(taxonomy_hash: str, index: "faiss.Index", skills: list[str]) -> None:
+    directory = _directory()
+    if directory is None:
+        return
+    import faiss
+
+    key = snapshot_key("taxonomy", taxonomy_hash)
+    prefix = f"taxonomy-{snapshot_scope()}"
+    try:
+        _atomic_write(directory / f"{prefix}-{key}.faiss", lambda tmp: faiss.write_index(index, str(tmp)))
+        _write_manifest(directory / f"{prefix}-{key}.json", {
+            "model": settings.sentence_transformer_model,
+            "index_mode": settings.embedding_index_mode,
+            "taxonomy_hash": taxonomy_hash,
+            "skills": skills,
+        })
+    except (OSError, RuntimeError) as e:
+        logger.warning("Could not snapshot taxonomy index: %s", e)
+        return
+    _prune(directory, prefix, key)
+
+
+# --- Role skill matrices ---
+
+def _role_key(tenant_id: int, roles_fingerprint: str) -> str:
+    from app.ml.taxonomy import taxonomy_hash
+
+    return snapshot_key("roles", tenant_id, roles_fingerprint, taxonomy_hash())
+
+
+def _role_scope(tenant_id: int) -> str:
+    return f"roles{tenant_id}-{snapshot_scope()}"
+
+
+def load_role_matrix(tenant_id: int, roles_fingerprint: str) -> "RoleSkillMatrix | None":
+    directory = _directory()
+    if directory is None:
+        return None
+    from app.services.skill_matcher import RoleSkillMatrix
+
+    key = _role_key(tenant_id, roles_fingerprint)
+    prefix = f"{_role_scope(tenant_id)}-{key}"
+    manifest = _read_manifest(directory / f"{prefix}.json")
+    if manifest is None:
+        return None
+    try:
+        embeddings = np.load(directory / f"{prefix}.npy", mmap_mode="r")
+        with np.load(directory / f"{prefix}.npz") as arrays:
+            fields = {name: arrays[name] for name in _MATRIX_ARRAYS}
+            scales = arrays["scales"] if "scales" in arrays.files else None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Role matrix snapshot %s unreadable, rebuilding: %s", prefix, e)
+        return None
+
+    skills = manifest["skills"]
+    if embeddings.shape[0] != len(skills):
+        logger.warning("Role matrix snapshot %s is inconsistent, rebuilding", prefix)
+        return None
+    vocab: dict[str, int] = {}
+    for skill in skills:
+        vocab.setdefault(skill.lower(), len(vocab))
+    return RoleSkillMatrix(skills=skills, embeddings=embeddings, vocab=vocab, scales=scales, **fields)
+
+
+def save_role_matrix(tenant_id: int, roles_fingerprint: str, matrix: "RoleSkillMatrix") -> None:
+    directory = _directory()
+    if directory is None or not matrix.skills:
+        return
+
+    key = _role_key(tenant_id, roles_fingerprint)
+    prefix = f"{_role_scope(tenant_id)}-{key}"
+    arrays = {name: getattr(matrix, name) for name in _MATRIX_ARRAYS}
+    if matrix.scales is not None:
+        arrays["scales"] = matrix.scales
+
+    def write_npy(tmp: Path) -> None:
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix.embeddings))
+
+    def write_npz(tmp: Path) -> None:
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+
+    try:
+        _atomic_write(directory / f"{prefix}.npy", write_npy)
+        _atomic_write(directory / f"{prefix}.npz", write_npz)
+        _write_manifest(directory / f"{prefix}.json", {
+            "model": settings.sentence_transformer_model,
+            "index_mode": settings.embedding_index_mode,
+            "tenant_id": tenant_id,
+            "roles_fingerprint": roles_fingerprint,
+            "skills": matrix.skills,
+        })
+    except OSError as e:
+        logger.warning("Could not snapshot role matrix for tenant %s: %s", tenant_id, e)
+        return
+    _prune(directory, _role_scope(tenant_id), key)
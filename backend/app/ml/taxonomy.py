@@ -1,34 +1,42 @@
 """Skill taxonomy normalization — maps free-text skills to canonical names."""
 
+import hashlib
 import json
 import os
 
-import faiss
 import numpy as np
 
+from app.config import settings
 from app.ml.embeddings import encode_texts
+from app.ml.indexes import build_index, search
 
 _taxonomy_index = None
 _taxonomy_skills = None
 _skill_category_map = None
+_taxonomy_hash = None
+_normalizer = None
 
 
-def _load_taxonomy() -> tuple[list[str], dict[str, str]]:
+def _find_seed_file(filename: str) -> str | None:
     # Try multiple paths: local dev, Docker container, absolute fallback
     candidates = [
-        os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "seed", "skills_taxonomy.json"),
-        os.path.join(os.path.dirname(__file__), "..", "..", "seed_data", "skills_taxonomy.json"),
-        "/app/seed_data/skills_taxonomy.json",
+        os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "seed", filename),
+        os.path.join(os.path.dirname(__file__), "..", "..", "seed_data", filename),
+        f"/app/seed_data/{filename}",
     ]
-    seed_path = None
     for p in candidates:
         if os.path.exists(p):
-            seed_path = p
-            break
+            return p
+    return None
+
+
+def _load_taxonomy() -> tuple[list[str], dict[str, str], str]:
+    seed_path = _find_seed_file("skills_taxonomy.json")
     if not seed_path:
-        raise FileNotFoundError(f"skills_taxonomy.json not found in: {candidates}")
-    with open(seed_path) as f:
-        data = json.load(f)
+        raise FileNotFoundError("skills_taxonomy.json not found in data/seed or seed_data")
+    with open(seed_path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
     skills = []
     category_map = {}
     for category in data["categories"]:
@@ -36,13 +44,19 @@ def _load_taxonomy() -> tuple[list[str], dict[str, str]]:
         for skill in category["skills"]:
             skills.append(skill)
             category_map[skill.lower()] = ssg_cat
-    return skills, category_map
+    return skills, category_map, hashlib.sha1(raw).hexdigest()
 
 
 def _ensure_loaded():
-    global _taxonomy_skills, _skill_category_map
+    global _taxonomy_skills, _skill_category_map, _taxonomy_hash
     if _taxonomy_skills is None:
-        _taxonomy_skills, _skill_category_map = _load_taxonomy()
+        _taxonomy_skills, _skill_category_map, _taxonomy_hash = _load_taxonomy()
+
+
+def taxonomy_hash() -> str:
+    """SHA-1 of ``skills_taxonomy.json``; keys index snapshots built from it."""
+    _ensure_loaded()
+    return _taxonomy_hash
 
 
 def get_skill_category(skill: str) -> str:
@@ -55,37 +69,66 @@ def get_taxonomy_index():
     global _taxonomy_index, _taxonomy_skills
     _ensure_loaded()
     if _taxonomy_index is None:
-        embeddings = encode_texts(_taxonomy_skills)
-        dim = embeddings.shape[1]
-        _taxonomy_index = faiss.IndexFlatIP(dim)
-        _taxonomy_index.add(embeddings.astype(np.float32))
+        from app.ml.snapshots import load_taxonomy_index, save_taxonomy_index
+
+        snapshot = load_taxonomy_index(_taxonomy_hash)
+        if snapshot is not None and snapshot[1] == _taxonomy_skills:
+            _taxonomy_index = snapshot[0]
+        else:
+            _taxonomy_index = build_index(encode_texts(_taxonomy_skills))
+            save_taxonomy_index(_taxonomy_hash, _taxonomy_index, _taxonomy_skills)
     return _taxonomy_index, _taxonomy_skills
 
 
-def normalize_skill(skill_text: str, threshold: float = 0.75) -> str | None:
+def _load_aliases() -> dict[str, str]:
+    path = _find_seed_file("skill_aliases.json")
+    if not path:
+        return {}
+    with open(path) as f:
+        return json.load(f)["aliases"]
+
+
+def get_normalizer():
+    """Process-wide SkillNormalizer over the taxonomy and alias table."""
+    global _normalizer
+    if _normalizer is None:
+        from app.ml.skill_normalizer import SkillNormalizer
+
+        _ensure_loaded()
+        _normalizer = SkillNormalizer(_taxonomy_skills, _load_aliases())
+    return _normalizer
+
+
+def suggest_skills(skill_texts: list[str], k: int = 5) -> list[list[tuple[str, float]]]:
+    """Top-k taxonomy candidates with similarity scores per input, from a single index search."""
+    if not skill_texts:
+        return []
+    index, skills = get_taxonomy_index()
+    unique = list(dict.fromkeys(skill_texts))
+    k = min(k, len(skills))
+    scores, indices = search(index, np.asarray(encode_texts(unique), dtype=np.float32), k, "taxonomy")
+    by_text = {
+        text: [(skills[j], float(s)) for s, j in zip(scores[q], indices[q]) if j >= 0]
+        for q, text in enumerate(unique)
+    }
+    return [by_text[t] for t in skill_texts]
+
+
+def normalize_skill(skill_text: str, threshold: float | None = None) -> str | None:
     """Map a free-text skill to the closest canonical taxonomy skill.
 
-    Returns the canonical skill name if similarity >= threshold, else None.
+    Returns the canonical skill name if it matches (see ``skill_normalizer``), else None.
+    ``threshold`` defaults to ``SKILL_MATCH_THRESHOLD``.
     """
-    index, skills = get_taxonomy_index()
-    query = encode_texts([skill_text]).astype(np.float32)
-    scores, indices = index.search(query, 1)
-    if scores[0][0] >= threshold:
-        return skills[indices[0][0]]
-    return None
+    threshold = settings.skill_match_threshold if threshold is None else threshold
+    return get_normalizer().resolve([skill_text], threshold)[0][0]
 
 
-def normalize_skills(skill_texts: list[str], threshold: float = 0.75) -> list[str]:
-    """Normalize a list of skills, dropping any that don't match the taxonomy."""
-    index, skills = get_taxonomy_index()
+def normalize_skills(skill_texts: list[str], threshold: float | None = None) -> list[str]:
+    """Normalize a list of skills, keeping unmatched ones as given and dropping duplicates."""
     if not skill_texts:
         return []
-    queries = encode_texts(skill_texts).astype(np.float32)
-    scores, indices = index.search(queries, 1)
-    result = []
-    for i, text in enumerate(skill_texts):
-        if scores[i][0] >= threshold:
-            result.append(skills[indices[i][0]])
-        else:
-            result.append(text)  # Keep original if no match
+    threshold = settings.skill_match_threshold if threshold is None else threshold
+    resolved = get_normalizer().resolve(skill_texts, threshold)
+    result = [canonical or text for text, (canonical, _) in zip(skill_texts, resolved)]
     return list(dict.fromkeys(result))
@@ -8,8 +8,10 @@ from app.models.market_insight import MarketInsight
 from app.models.tenant import Tenant
 from app.models.api_key import APIKey
 from app.models.audit_log import AuditLog # Added import
+from app.models.materialized_analysis import MaterializedAnalysis
 
 __all__ = [
     "JobRole", "Skill", "SCTPCourse", "UserProfile",
     "User", "SkillProgress", "MarketInsight", "Tenant", "APIKey", "AuditLog",
+    "MaterializedAnalysis",
 ]
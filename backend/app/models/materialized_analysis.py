@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, JSON, DateTime, func, ForeignKey
+from app.database import Base
+
+
+class MaterializedAnalysis(Base):
+    """Precomputed recommendations and skill gaps for one profile."""
+
+    __tablename__ = "materialized_analyses"
+
+    id = Column(Integer, primary_key=True, index=True)
+    profile_id = Column(Integer, ForeignKey("user_profiles.id"), nullable=False, unique=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
+    top_n = Column(Integer, nullable=False)
+    recommendations = Column(JSON, nullable=False, default=list)  # list[RoleRecommendation]
+    gaps = Column(JSON, nullable=False, default=list)  # list[RoleGap]
+    profile_fingerprint = Column(String, nullable=False)
+    roles_fingerprint = Column(String, nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,196 @@
+"""Per-request SQL statistics: statement count, rows and database time.
+
+``install(engine)`` adds cursor-execute hooks to an engine; ``QueryStatsMiddleware``
+opens a ``RequestQueryStats`` for each request in a ``ContextVar`` so the hooks
+attribute every statement to the request that ran it, including from the
+threadpool that runs sync endpoints. For each request the middleware then
+
+* adds a ``Server-Timing`` header (``db`` time with statement and row counts,
+  plus ``app`` for the whole request);
+* logs one ``app.query_stats`` DEBUG record whose ``extra`` fields (route,
+  method, status, db_statements, db_rows, db_ms, total_ms) suit structured
+  log handlers;
+* folds the numbers into per-route aggregates (``route_stats``) and the
+  process metrics in ``app.metrics``.
+
+Rows are ORM instances loaded plus rows reported affected by INSERT / UPDATE /
+DELETE; drivers do not report SELECT sizes up front.
+
+With ``SQL_SLOW_QUERY_MS`` > 0, statements at or above that duration are
+logged with their parameters reduced to type names, so values (emails, password
+hashes, resume text) never reach the log.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app import metrics
+from app.config import settings
+from app.database import Base
+from app.http_metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+statements_total = metrics.counter("db_statements_total", "SQL statements executed")
+db_seconds_total = metrics.counter("db_time_seconds_total", "Time spent executing SQL statements")
+slow_statements_total = metrics.counter("db_slow_statements_total", "SQL statements at or above SQL_SLOW_QUERY_MS")
+statements_per_request = metrics.histogram(
+    "db_statements_per_request", "SQL statements executed per HTTP request", (0, 1, 2, 4, 8, 16, 32, 64, 128)
+)
+db_seconds_per_request = metrics.histogram(
+    "db_time_seconds_per_request", "Database time per HTTP request",
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+@dataclass
+class RequestQueryStats:
+    statements: int = 0
+    rows: int = 0
+    db_seconds: float = 0.0
+
+
+_current: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+def current_stats() -> RequestQueryStats | None:
+    return _current.get()
+
+
+def redact_parameters(parameters) -> str:
+    """Parameter types only, e.g. ``(str, int, NoneType)``; executemany shows the batch size."""
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return f"{len(parameters)} x {redact_parameters(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is dropped with it when the statement raises
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_start", None)
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    statements_total.inc()
+    db_seconds_total.inc(elapsed)
+
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+        if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+            stats.rows += max(cursor.rowcount, 0)
+
+    threshold = settings.sql_slow_query_ms
+    if threshold > 0 and elapsed * 1000 >= threshold:
+        slow_statements_total.inc()
+        logger.warning(
+            "Slow SQL statement (%.1f ms): %s; parameters: %s",
+            elapsed * 1000, " ".join(statement.split()), redact_parameters(parameters),
+            extra={"db_ms": round(elapsed * 1000, 3)},
+        )
+
+
+def _on_load(target, context) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.rows += 1
+
+
+def install(engine: Engine) -> None:
+    """Attribute ``engine``'s statements to the current request (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if not event.contains(Base, "load", _on_load):
+        event.listen(Base, "load", _on_load, propagate=True)
+
+
+class RouteStats:
+    """Totals per route template, e.g. ``GET /api/upskilling/{profile_id}``."""
+
+    def __init__(self):
+        self._routes: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, stats: RequestQueryStats, total_seconds: float) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "requests": 0, "statements": 0, "rows": 0, "db_seconds": 0.0, "total_seconds": 0.0,
+                "max_statements": 0,
+            })
+            entry["requests"] += 1
+            entry["statements"] += stats.statements
+            entry["rows"] += stats.rows
+            entry["db_seconds"] += stats.db_seconds
+            entry["total_seconds"] += total_seconds
+            entry["max_statements"] = max(entry["max_statements"], stats.statements)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            routes = {route: dict(entry) for route, entry in self._routes.items()}
+        for entry in routes.values():
+            n = entry["requests"]
+            entry["avg_statements"] = round(entry["statements"] / n, 2)
+            entry["avg_rows"] = round(entry["rows"] / n, 2)
+            entry["avg_db_ms"] = round(entry["db_seconds"] * 1000 / n, 3)
+            entry["avg_total_ms"] = round(entry["total_seconds"] * 1000 / n, 3)
+        return dict(sorted(routes.items()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+route_stats = RouteStats()
+
+
+def _route_name(request: Request) -> str:
+    return f"{request.method} {route_template(request)}"
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        if not settings.sql_instrumentation_enabled:
+            return await call_next(request)
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        db_ms, total_ms = stats.db_seconds * 1000, total * 1000
+        response.headers["Server-Timing"] = (
+            f'db;dur={db_ms:.2f};desc="{stats.statements} statements, {stats.rows} rows", app;dur={total_ms:.2f}'
+        )
+        route = _route_name(request)
+        route_stats.record(route, stats, total)
+        statements_per_request.observe(stats.statements)
+        db_seconds_per_request.observe(stats.db_seconds)
+        logger.debug(
+            "%s: %d SQL statements, %d rows, %.1f ms db / %.1f ms total",
+            route, stats.statements, stats.rows, db_ms, total_ms,
+            extra={
+                "route": route, "method": request.method, "status": response.status_code,
+                "db_statements": stats.statements, "db_rows": stats.rows,
+                "db_ms": round(db_ms, 3), "total_ms": round(total_ms, 3),
+            },
+        )
+        return response
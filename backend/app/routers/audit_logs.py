@@ -2,13 +2,14 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.audit_log import AuditLog
 from app.models.user import User, Role
-from app.auth import has_role
+from app.auth import has_role_async
 
 
 router = APIRouter(prefix="/audit-logs", tags=["audit-logs"])
@@ -25,11 +26,17 @@ class AuditLogResponse(BaseModel):
 
 
 @router.get("/", response_model=list[AuditLogResponse])
-def get_audit_logs(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(has_role([Role.ADMIN])),
+async def get_audit_logs(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(has_role_async([Role.ADMIN])),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
 ):
-    logs = db.query(AuditLog).filter(AuditLog.tenant_id == current_user.tenant_id).order_by(AuditLog.timestamp.desc()).offset(offset).limit(limit).all()
-    return logs
+    logs = await db.execute(
+        select(AuditLog)
+        .where(AuditLog.tenant_id == current_user.tenant_id)
+        .order_by(AuditLog.timestamp.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    return logs.scalars().all()
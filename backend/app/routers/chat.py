@@ -11,6 +11,7 @@ from app.auth import get_current_user_optional
 from app.config import settings
 from app.database import get_db
 from app.routers.market import DEFAULT_INSIGHTS
+from app.services.gemini import gemini_call
 
 
 router = APIRouter(tags=["chat"])
@@ -144,42 +145,30 @@ def career_chat(payload: ChatRequest, db: Session = Depends(get_db), user=Depend
         ))
 
     profile = None
+    context = None
     recommendations = None
     skill_gaps = None
     roadmap_courses = None
     market_insights = None
     pathways = None
 
-    # Load market insights (global or tenant specific)
-    from app.models.market_insight import MarketInsight
-    market_insights = db.query(MarketInsight).filter(
-        (MarketInsight.tenant_id == tenant_id) | (MarketInsight.tenant_id == None)
-    ).all()
+    # Market insights (global or tenant specific) from the reference-data snapshot
+    from app.services.reference_data import tenant_reference
+    market_insights = tenant_reference(db, tenant_id).insights
 
     if payload.profile_id:
         from app.models.user_profile import UserProfile
         profile = db.query(UserProfile).filter(UserProfile.id == payload.profile_id, UserProfile.tenant_id == tenant_id).first()
         if profile:
-            from app.services.recommender import get_recommendations
-            from app.services.gap_analyzer import analyze_gaps
-            from app.services.roadmap_generator import generate_roadmap
-            from app.services.course_pathways import generate_learning_pathways
+            from app.services.analysis_context import ProfileAnalysisContext
 
             try:
-                recommendations = get_recommendations(profile, db, tenant_id=tenant_id, top_n=3)
-                skill_gaps = analyze_gaps(profile, db, tenant_id=tenant_id)
-                roadmap_courses = generate_roadmap(profile, db, tenant_id=tenant_id)
-                
-                # Extract missing skills for pathways
-                missing_skills = []
-                if skill_gaps:
-                    for role_gap in skill_gaps[:2]:
-                        for g in role_gap.gaps:
-                            if g.gap_severity in ("high", "medium") and g.skill not in missing_skills:
-                                missing_skills.append(g.skill)
-                
-                if missing_skills:
-                    pathways = generate_learning_pathways(missing_skills, db, tenant_id=tenant_id)
+                # One context so recommendations, gaps, roadmap and pathways share their inputs
+                context = ProfileAnalysisContext(profile, db, tenant_id)
+                recommendations = context.recommendations(3)
+                skill_gaps = context.gaps
+                roadmap_courses = context.roadmap().items
+                pathways = context.pathways or None
 
             except Exception as e:
                 logging.getLogger(__name__).exception(
@@ -209,7 +198,8 @@ def career_chat(payload: ChatRequest, db: Session = Depends(get_db), user=Depend
 
         # Start chat with history
         chat = model.start_chat(history=history)
-        response = chat.send_message(payload.messages[-1].content)
+        with gemini_call("chat"):
+            response = chat.send_message(payload.messages[-1].content)
         return ChatResponse(reply=response.text)
 
     except Exception as e:
@@ -227,11 +217,18 @@ def career_chat(payload: ChatRequest, db: Session = Depends(get_db), user=Depend
             payload.messages[-1].content if payload.messages else "",
             profile_id=payload.profile_id,
             db=db,
-            tenant_id=tenant_id
+            tenant_id=tenant_id,
+            context=context,
         ))
 
 
-def _fallback_response(user_msg: str, profile_id: int | None = None, db: Session | None = None, tenant_id: int | None = None) -> str:
+def _fallback_response(
+    user_msg: str,
+    profile_id: int | None = None,
+    db: Session | None = None,
+    tenant_id: int | None = None,
+    context=None,
+) -> str:
     """WorkD AI rule-based fallback when no LLM API key is configured."""
     msg = user_msg.lower()
 
@@ -241,11 +238,16 @@ def _fallback_response(user_msg: str, profile_id: int | None = None, db: Session
     if profile_id and db and tenant_id:
         try:
             from app.models.user_profile import UserProfile
-            from app.services.roadmap_generator import generate_roadmap
+            from app.services.analysis_context import ProfileAnalysisContext
 
-            profile = db.query(UserProfile).filter(UserProfile.id == profile_id, UserProfile.tenant_id == tenant_id).first()
+            if context is not None:
+                profile = context.profile
+            else:
+                profile = db.query(UserProfile).filter(UserProfile.id == profile_id, UserProfile.tenant_id == tenant_id).first()
+                context = ProfileAnalysisContext(profile, db, tenant_id) if profile else None
             if profile:
-                roadmap = generate_roadmap(profile, db, tenant_id=tenant_id)
+                # Reuses the chat request's context (and its roadmap) when Gemini failed after loading it
+                roadmap = context.roadmap().items
                 if roadmap:
                     course_hint = f" Based on your profile, I'd suggest starting with the {roadmap[0].course_title} by {roadmap[0].provider}."
                 is_over_40 = (profile.age and profile.age >= 40) or (profile.years_experience >= 15)
@@ -2,14 +2,15 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.auth import get_current_tenant, get_current_user
-from app.database import get_db
-from app.models.job_role import JobRole
+from app.auth import get_current_tenant, get_current_tenant_async, get_current_user
+from app.database import get_async_db, get_db
 from app.models.user_profile import UserProfile
 from app.models.tenant import Tenant
 from app.models.user import User
+from app.services.reference_data import reference_data, tenant_reference
 from app.services.skill_matcher import match_skills, compute_content_similarity
 
 router = APIRouter(tags=["compare"])
@@ -54,9 +55,10 @@ def compare_roles(payload: CompareRequest, db: Session = Depends(get_db), tenant
     user_skills = profile.skills or []
     roles_data = []
     all_role_skills = {}
+    roles_by_id = tenant_reference(db, tenant.id).roles_by_id
 
     for role_id in payload.role_ids:
-        role = db.query(JobRole).filter(JobRole.id == role_id, JobRole.tenant_id == tenant.id).first()
+        role = roles_by_id.get(role_id)
         if not role:
             raise HTTPException(status_code=404, detail=f"Role {role_id} not found")
 
@@ -81,8 +83,8 @@ def compare_roles(payload: CompareRequest, db: Session = Depends(get_db), tenant
             category=role.category,
             salary_range=role.salary_range,
             match_score=round(content_sim, 3),
-            required_skills=role.required_skills,
-            preferred_skills=role.preferred_skills,
+            required_skills=list(role.required_skills),
+            preferred_skills=list(role.preferred_skills),
             matched_skills=matched,
             missing_skills=missing,
             education_level=role.education_level or "bachelor",
@@ -115,7 +117,7 @@ def compare_roles(payload: CompareRequest, db: Session = Depends(get_db), tenant
 
 
 @router.get("/roles")
-def list_roles(db: Session = Depends(get_db), tenant: Tenant = Depends(get_current_tenant)):
+async def list_roles(db: AsyncSession = Depends(get_async_db), tenant: Tenant = Depends(get_current_tenant_async)):
     """List all available roles for comparison picker."""
-    roles = db.query(JobRole).filter(JobRole.tenant_id == tenant.id).all()
+    roles = (await reference_data.get_async(db, tenant.id)).roles
     return [{"id": r.id, "title": r.title, "category": r.category} for r in roles]
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.auth import get_current_tenant
-from app.database import get_db
+from app.auth import get_current_tenant, get_current_tenant_async
+from app.database import get_async_db, get_db
 from app.models.sctp_course import SCTPCourse
 from app.models.tenant import Tenant
+from app.services.skill_index import skill_index
 from app.services.subsidy_calculator import calculate_subsidies
 
 router = APIRouter(tags=["courses"])
@@ -51,26 +54,29 @@ class SubsidyResponse(BaseModel):
 
 
 @router.get("/courses", response_model=CourseListResponse)
-def list_courses(
+async def list_courses(
     skill: str | None = None,
     provider: str | None = None,
     level: str | None = None,
     mces_eligible: bool | None = None,
-    db: Session = Depends(get_db),
-    tenant: Tenant = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_async_db),
+    tenant: Tenant = Depends(get_current_tenant_async),
 ):
-    query = db.query(SCTPCourse).filter(
+    query = select(SCTPCourse).where(
         (SCTPCourse.tenant_id == tenant.id) | (SCTPCourse.tenant_id == None)
     )
 
     if provider:
-        query = query.filter(SCTPCourse.provider == provider)
+        query = query.where(SCTPCourse.provider == provider)
     if level:
-        query = query.filter(SCTPCourse.level == level)
+        query = query.where(SCTPCourse.level == level)
     if mces_eligible is not None:
-        query = query.filter(SCTPCourse.mces_eligible == mces_eligible)
+        query = query.where(SCTPCourse.mces_eligible == mces_eligible)
+    if skill:
+        course_ids = await skill_index.course_ids_containing_async(db, tenant.id, skill)
+        query = query.where(SCTPCourse.id.in_(course_ids))
 
-    courses = query.all()
+    courses = (await db.execute(query)).scalars().all()
 
     # Filter by skill (JSON array contains)
     if skill:
@@ -45,9 +45,9 @@ def get_dashboard_summary(
 
     user_skills = set(s.lower() for s in (profile.skills or []))
 
-    # Use the optimized recommender service
-    from app.services.recommender import get_recommendations
-    recommendations = get_recommendations(profile, db, user.tenant_id, top_n=3)
+    # Use materialized recommendations when fresh, else the recommender service
+    from app.services.analysis_context import ProfileAnalysisContext
+    recommendations = ProfileAnalysisContext(profile, db, user.tenant_id).recommendations(3)
     
     # Calculate best match score (career readiness)
     best_match = recommendations[0].match_score if recommendations else 0.0
@@ -1,8 +1,9 @@
 """Export roadmap as PDF."""
 
 import io
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
@@ -15,9 +16,16 @@ router = APIRouter(tags=["export"])
 
 
 @router.get("/export/roadmap/{profile_id}")
-def export_roadmap_pdf(profile_id: int, db: Session = Depends(get_db), tenant: Tenant = Depends(get_current_tenant), user: User = Depends(get_current_user)):
+def export_roadmap_pdf(
+    profile_id: int,
+    schedule: Literal["sequential", "parallel"] = "sequential",
+    weekly_hours: int | None = Query(None, ge=1, le=80),
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_current_tenant),
+    user: User = Depends(get_current_user),
+):
     from app.models.user_profile import UserProfile
-    from app.services.roadmap_generator import generate_roadmap
+    from app.services.analysis_context import ProfileAnalysisContext
     from reportlab.lib.pagesizes import A4
     from reportlab.lib import colors
     from reportlab.lib.units import mm
@@ -28,7 +36,8 @@ def export_roadmap_pdf(profile_id: int, db: Session = Depends(get_db), tenant: T
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    roadmap = generate_roadmap(profile, db, tenant_id=tenant.id)
+    plan = ProfileAnalysisContext(profile, db, tenant.id).roadmap(schedule=schedule, weekly_hours=weekly_hours)
+    roadmap = plan.items
 
     buf = io.BytesIO()
     doc = SimpleDocTemplate(buf, pagesize=A4, topMargin=20*mm, bottomMargin=20*mm)
@@ -43,25 +52,32 @@ def export_roadmap_pdf(profile_id: int, db: Session = Depends(get_db), tenant: T
         elements.append(Paragraph("No upskilling items identified. Your skills are well-matched!", styles["Normal"]))
     else:
         # Summary
-        total_weeks = roadmap[-1].week_end if roadmap else 0
+        total_weeks = max((item.week_end for item in roadmap), default=0)
         elements.append(Paragraph(
             f"Total estimated timeline: {total_weeks} weeks ({(total_weeks + 3) // 4} months)",
             styles["Normal"],
         ))
+        if plan.tracks > 1:
+            elements.append(Paragraph(
+                f"Up to {plan.tracks} courses run in parallel; beginner courses come before more advanced ones on the same skill.",
+                styles["Normal"],
+            ))
         elements.append(Spacer(1, 5*mm))
 
         # Table
-        data = [["Week", "Skill Gap", "Course", "Provider", "Duration", "Level"]]
+        header = ["Week", "Skill Gap", "Course", "Provider", "Duration", "Level"]
+        data = [header + ["Track"] if plan.tracks > 1 else header]
         for item in roadmap:
             week_range = f"{item.week_start}-{item.week_end}" if item.week_start != item.week_end else str(item.week_start)
-            data.append([
+            row = [
                 week_range,
                 item.skill,
                 item.course_title,
                 item.provider,
                 f"{item.duration_weeks}w",
                 item.level,
-            ])
+            ]
+            data.append(row + [str(item.track)] if plan.tracks > 1 else row)
 
         table = Table(data, repeatRows=1)
         table.setStyle(TableStyle([
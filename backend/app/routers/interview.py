@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from app.config import settings
 from app.database import get_db
 from app.auth import get_current_user_optional
+from app.services.gemini import gemini_call
 
 router = APIRouter(tags=["interview"])
 
@@ -145,13 +146,13 @@ def _get_gap_targeted_questions(profile_id: int, db: Session, tenant_id: int) ->
     """
     try:
         from app.models.user_profile import UserProfile
-        from app.services.gap_analyzer import analyze_gaps
+        from app.services.analysis_context import ProfileAnalysisContext
 
         profile = db.query(UserProfile).filter(UserProfile.id == profile_id, UserProfile.tenant_id == tenant_id).first()
         if not profile:
             return []
 
-        gaps = analyze_gaps(profile, db, tenant_id=tenant_id)
+        gaps = ProfileAnalysisContext(profile, db, tenant_id).gaps
 
         # Collect gap skills with severity ordering
         gap_skills = []
@@ -315,7 +316,8 @@ def _llm_interview(
             system_instruction=system_prompt
         )
         chat = model.start_chat(history=history)
-        response = chat.send_message(last_msg)
+        with gemini_call("interview"):
+            response = chat.send_message(last_msg)
         reply = response.text
     except Exception as e:
         error_str = str(e)
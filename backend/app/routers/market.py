@@ -3,12 +3,13 @@
 from app.models.tenant import Tenant
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth import get_current_tenant
-from app.api_key_auth import get_current_tenant_for_read
-from app.database import get_db
-from app.models.market_insight import MarketInsight
+from app.api_key_auth import get_current_tenant_for_read_async
+from app.database import get_async_db, get_db
+from app.services.reference_data import reference_data
 
 router = APIRouter(tags=["market"])
 
@@ -35,10 +36,10 @@ from app.services.market_simulator import DEFAULT_INSIGHTS
 
 
 @router.get("/market-insights", response_model=MarketOverview)
-def get_market_insights(db: Session = Depends(get_db), tenant: Tenant = Depends(get_current_tenant_for_read)):
-    insights = db.query(MarketInsight).filter(
-        (MarketInsight.tenant_id == tenant.id) | (MarketInsight.tenant_id == None)
-    ).all()
+async def get_market_insights(
+    db: AsyncSession = Depends(get_async_db), tenant: Tenant = Depends(get_current_tenant_for_read_async)
+):
+    insights = (await reference_data.get_async(db, tenant.id)).insights
 
     if not insights:
         # Use default data
@@ -9,6 +9,7 @@ from app.database import get_db
 from app.models.user_profile import UserProfile
 from app.models.tenant import Tenant
 from app.models.user import User
+from app.services.skill_index import skill_index
 
 router = APIRouter(tags=["peer"])
 
@@ -37,24 +38,28 @@ def peer_comparison(profile_id: int, db: Session = Depends(get_db), tenant: Tena
         raise HTTPException(status_code=404, detail="Profile not found")
 
     # Get recommended roles for this profile
-    from app.services.recommender import get_recommendations
-    recs = get_recommendations(profile, db, tenant_id=tenant.id)
-
-    all_profiles = db.query(UserProfile).filter(UserProfile.tenant_id == tenant.id).all()
-    user_skills = set(s.lower() for s in (profile.skills or []))
+    from app.services.materializer import recommendations_for
+    recs = recommendations_for(profile, db, tenant_id=tenant.id)
+
+    # Candidate peers per role from the skill index, then one load of the union
+    role_skill_sets = [set(s.lower() for s in (rec.matched_skills + rec.missing_skills)) for rec in recs]
+    candidates = [
+        {pid for pid, overlap in skill_index.profile_overlaps(db, tenant.id, role_skills).items() if overlap >= 2}
+        - {profile_id}
+        for role_skills in role_skill_sets
+    ]
+    wanted = set().union(*candidates)
+    peers = {
+        p.id: p for p in db.query(UserProfile).filter(UserProfile.id.in_(wanted), UserProfile.tenant_id == tenant.id)
+    } if wanted else {}
 
     insights = []
-    for rec in recs:
-        # Find profiles with overlapping skills to this role
-        role_skills = set(s.lower() for s in (rec.matched_skills + rec.missing_skills))
-        similar_profiles = []
-        for p in all_profiles:
-            if p.id == profile_id:
-                continue
-            p_skills = set(s.lower() for s in (p.skills or []))
-            overlap = len(p_skills & role_skills)
-            if overlap >= 2:
-                similar_profiles.append(p)
+    for rec, role_skills, peer_ids in zip(recs, role_skill_sets, candidates):
+        # Profiles with overlapping skills to this role (re-checked against the loaded row)
+        similar_profiles = [
+            peers[pid] for pid in sorted(peer_ids)
+            if pid in peers and len(set(s.lower() for s in (peers[pid].skills or [])) & role_skills) >= 2
+        ]
 
         if not similar_profiles:
             # Generate synthetic peer data
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.auth import get_current_user, get_current_user_optional
-from app.database import get_db
+from app.auth import get_current_user, get_current_user_async, get_current_user_optional
+from app.database import get_async_db, get_db
 from app.models.tenant import Tenant
 from app.schemas.profile import ProfileCreate, ProfileResponse, ProfileUpdate
 
@@ -10,13 +12,17 @@ router = APIRouter(tags=["profile"])
 
 
 @router.get("/profile/me", response_model=ProfileResponse)
-def get_my_profile(
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+async def get_my_profile(
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
 ):
     from app.models.user_profile import UserProfile
 
-    profile = db.query(UserProfile).filter(UserProfile.user_id == user.id, UserProfile.tenant_id == user.tenant_id).first()
+    profile = (
+        await db.execute(
+            select(UserProfile).where(UserProfile.user_id == user.id, UserProfile.tenant_id == user.tenant_id)
+        )
+    ).scalars().first()
     if not profile:
         raise HTTPException(status_code=404, detail="No profile linked to this account")
     return profile
@@ -2,10 +2,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.auth import get_current_tenant, get_current_user
-from app.database import get_db
+from app.auth import get_current_tenant, get_current_tenant_async, get_current_user, get_current_user_async
+from app.database import get_async_db, get_db
 from app.models.skill_progress import SkillProgress
 from app.models.user_profile import UserProfile
 from app.models.tenant import Tenant
@@ -70,17 +72,29 @@ def record_progress(payload: ProgressUpdate, db: Session = Depends(get_db), tena
 
 
 @router.get("/progress/{profile_id}", response_model=ProgressResponse)
-def get_progress(profile_id: int, db: Session = Depends(get_db), tenant: Tenant = Depends(get_current_tenant), user: User = Depends(get_current_user)):
-    profile = db.query(UserProfile).filter(UserProfile.id == profile_id, UserProfile.tenant_id == tenant.id, UserProfile.user_id == user.id).first()
+async def get_progress(
+    profile_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    tenant: Tenant = Depends(get_current_tenant_async),
+    user: User = Depends(get_current_user_async),
+):
+    profile = (
+        await db.execute(
+            select(UserProfile.id).where(
+                UserProfile.id == profile_id, UserProfile.tenant_id == tenant.id, UserProfile.user_id == user.id
+            )
+        )
+    ).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
     entries = (
-        db.query(SkillProgress)
-        .filter_by(profile_id=profile_id, tenant_id=tenant.id)
-        .order_by(SkillProgress.recorded_at.desc())
-        .all()
-    )
+        await db.execute(
+            select(SkillProgress)
+            .filter_by(profile_id=profile_id, tenant_id=tenant.id)
+            .order_by(SkillProgress.recorded_at.desc())
+        )
+    ).scalars().all()
 
     # Dedupe to latest per skill
     latest: dict[str, SkillProgress] = {}
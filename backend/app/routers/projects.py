@@ -8,6 +8,7 @@ from app.auth import get_current_tenant, get_current_user
 from app.database import get_db
 from app.models.tenant import Tenant
 from app.models.user import User
+from app.services.gemini import gemini_call
 
 router = APIRouter(tags=["projects"])
 
@@ -170,14 +171,14 @@ PROJECT_CATALOG = {
 @router.get("/project-suggestions/{profile_id}", response_model=ProjectSuggestionsResponse)
 def get_project_suggestions(profile_id: int, db: Session = Depends(get_db), tenant: Tenant = Depends(get_current_tenant), user: User = Depends(get_current_user)):
     from app.models.user_profile import UserProfile
-    from app.services.gap_analyzer import analyze_gaps
+    from app.services.analysis_context import ProfileAnalysisContext
     from app.config import settings
 
     profile = db.query(UserProfile).filter(UserProfile.id == profile_id, UserProfile.tenant_id == tenant.id, UserProfile.user_id == user.id).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    gaps = analyze_gaps(profile, db, tenant_id=tenant.id)
+    gaps = ProfileAnalysisContext(profile, db, tenant.id).gaps
     
     # Identify top 3 unique skill gaps
     target_skills = []
@@ -217,7 +218,8 @@ def get_project_suggestions(profile_id: int, db: Session = Depends(get_db), tena
                 model_name=settings.gemini_model,
                 generation_config={"response_mime_type": "application/json"}
             )
-            response = model.generate_content(prompt)
+            with gemini_call("projects"):
+                response = model.generate_content(prompt)
             
             # Clean up potential markdown formatting
             text_response = response.text.strip()
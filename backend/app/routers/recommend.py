@@ -1,10 +1,13 @@
+import json
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api_key_auth import get_current_tenant_for_read
 from app.database import get_db
 from app.models.tenant import Tenant
-from app.schemas.recommendation import RecommendRequest, RecommendResponse
+from app.schemas.recommendation import BatchRecommendRequest, RecommendRequest, RecommendResponse
 
 router = APIRouter(tags=["recommend"])
 
@@ -20,3 +23,34 @@ def recommend_roles(payload: RecommendRequest, db: Session = Depends(get_db), te
 
     recommendations = get_recommendations(profile, db, tenant_id=tenant.id)
     return RecommendResponse(profile_id=profile.id, recommendations=recommendations)
+
+
+@router.post("/recommend/batch")
+def recommend_roles_batch(payload: BatchRecommendRequest, db: Session = Depends(get_db), tenant: Tenant = Depends(get_current_tenant_for_read)):
+    """Score many profiles at once, streaming one JSON object per line (NDJSON)."""
+    from app.models.user_profile import UserProfile
+    from app.services.recommender import iter_batch_recommendations
+
+    if not payload.all_profiles and not payload.profile_ids:
+        raise HTTPException(status_code=400, detail="Provide profile_ids or set all_profiles")
+
+    query = db.query(UserProfile).filter(UserProfile.tenant_id == tenant.id)
+    if not payload.all_profiles:
+        query = query.filter(UserProfile.id.in_(payload.profile_ids))
+    profiles = query.order_by(UserProfile.id).all()
+
+    missing_ids = []
+    if not payload.all_profiles:
+        found = {p.id for p in profiles}
+        missing_ids = [pid for pid in dict.fromkeys(payload.profile_ids) if pid not in found]
+
+    results = iter_batch_recommendations(profiles, db, tenant_id=tenant.id, top_n=payload.top_n)
+
+    def _lines():
+        for profile, recs in results:
+            body = RecommendResponse(profile_id=profile.id, recommendations=recs)
+            yield body.model_dump_json() + "\n"
+        for pid in missing_ids:
+            yield json.dumps({"profile_id": pid, "error": "Profile not found"}) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
@@ -8,6 +8,7 @@ from app.config import settings
 from app.auth import get_current_user
 from app.database import get_db
 from app.models.user import User
+from app.services.gemini import gemini_call
 
 router = APIRouter(tags=["resume-rewriter"])
 
@@ -49,7 +50,8 @@ def rewrite_bullet_point(payload: RewriteRequest, db: Session = Depends(get_db),
             model_name=settings.gemini_model,
             generation_config={"response_mime_type": "application/json"}
         )
-        response = model.generate_content(prompt)
+        with gemini_call("resume_rewriter"):
+            response = model.generate_content(prompt)
         
         # Clean up potential markdown formatting
         text_response = response.text.strip()
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+
+from app.api_key_auth import get_current_tenant_for_read
+from app.config import settings
+from app.models.tenant import Tenant
+from app.schemas.skill import SkillCandidate, SkillSuggestion, SkillSuggestRequest, SkillSuggestResponse
+
+router = APIRouter(tags=["skills"])
+
+
+@router.post("/skills/suggest", response_model=SkillSuggestResponse)
+def suggest_skills(payload: SkillSuggestRequest, tenant: Tenant = Depends(get_current_tenant_for_read)):
+    """Top-k taxonomy candidates for many free-text skills, plus the normalized pick for each."""
+    from app.ml import taxonomy
+
+    threshold = settings.skill_match_threshold
+    candidates = taxonomy.suggest_skills(payload.skills, k=payload.k)
+    # Same decision as normalize_skills, reusing the top-1 of the search above
+    nearest = {text: ranked[0] for text, ranked in zip(payload.skills, candidates) if ranked}
+    resolved = taxonomy.get_normalizer().resolve(payload.skills, threshold, nearest=nearest)
+
+    suggestions = []
+    for text, ranked, (canonical, tier) in zip(payload.skills, candidates, resolved):
+        suggestions.append(SkillSuggestion(
+            input=text,
+            normalized=canonical,
+            tier=tier,
+            candidates=[SkillCandidate(skill=s, score=round(score, 4)) for s, score in ranked],
+        ))
+    return SkillSuggestResponse(threshold=threshold, suggestions=suggestions)
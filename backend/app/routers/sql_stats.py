@@ -0,0 +1,15 @@
+"""Per-route SQL statistics collected by ``app.query_stats`` (admin only)."""
+
+from fastapi import APIRouter, Depends
+
+from app.auth import has_role
+from app.models.user import Role, User
+from app.query_stats import route_stats
+
+router = APIRouter(tags=["diagnostics"])
+
+
+@router.get("/sql-stats")
+def get_sql_stats(current_user: User = Depends(has_role([Role.ADMIN]))):
+    """Statement, row and timing totals and averages per route in this worker process."""
+    return {"routes": route_stats.snapshot()}
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.auth import get_current_tenant, get_current_user
@@ -11,17 +13,28 @@ router = APIRouter(tags=["upskilling"])
 
 
 @router.get("/upskilling/{profile_id}", response_model=RoadmapResponse)
-def get_upskilling_roadmap(profile_id: int, db: Session = Depends(get_db), tenant: Tenant = Depends(get_current_tenant), user: User = Depends(get_current_user)):
+def get_upskilling_roadmap(
+    profile_id: int,
+    objective: Literal["fee", "weeks", "greedy"] | None = None,
+    schedule: Literal["sequential", "parallel"] = "sequential",
+    weekly_hours: int | None = Query(None, ge=1, le=80),
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_current_tenant),
+    user: User = Depends(get_current_user),
+):
     from app.models.user_profile import UserProfile
-    from app.services.roadmap_generator import generate_roadmap
+    from app.services.analysis_context import ProfileAnalysisContext
 
     profile = db.query(UserProfile).filter(UserProfile.id == profile_id, UserProfile.tenant_id == tenant.id, UserProfile.user_id == user.id).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    roadmap = generate_roadmap(profile, db, tenant_id=tenant.id)
+    plan = ProfileAnalysisContext(profile, db, tenant.id).roadmap(
+        objective=objective, schedule=schedule, weekly_hours=weekly_hours
+    )
+    roadmap = plan.items
 
-    total_weeks = roadmap[-1].week_end if roadmap else 0
+    total_weeks = max((r.week_end for r in roadmap), default=0)
     total_cost = sum(r.course_fee for r in roadmap)
     total_after_subsidy = sum(r.nett_fee_after_subsidy for r in roadmap)
     total_sf = sum(r.skillsfuture_credit_amount for r in roadmap if r.skillsfuture_eligible)
@@ -33,4 +46,8 @@ def get_upskilling_roadmap(profile_id: int, db: Session = Depends(get_db), tenan
         total_cost=round(total_cost, 2),
         total_after_subsidy=round(total_after_subsidy, 2),
         total_skillsfuture_applicable=round(total_sf, 2),
+        objective=plan.objective,
+        objective_value=plan.objective_value,
+        schedule=plan.schedule,
+        tracks=plan.tracks,
     )
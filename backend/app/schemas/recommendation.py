@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class RoleRecommendation(BaseModel):
@@ -23,3 +23,9 @@ class RecommendRequest(BaseModel):
 class RecommendResponse(BaseModel):
     profile_id: int
     recommendations: list[RoleRecommendation]
+
+
+class BatchRecommendRequest(BaseModel):
+    profile_ids: list[int] = Field(default_factory=list, max_length=10000)
+    all_profiles: bool = False  # score every profile in the tenant
+    top_n: int = Field(5, ge=1, le=50)
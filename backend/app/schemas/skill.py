@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+
+
+class SkillSuggestRequest(BaseModel):
+    skills: list[str] = Field(..., min_length=1, max_length=500)
+    k: int = Field(5, ge=1, le=20)
+
+
+class SkillCandidate(BaseModel):
+    skill: str
+    score: float
+
+
+class SkillSuggestion(BaseModel):
+    input: str
+    normalized: str | None  # canonical skill chosen by normalize_skills, None if unmatched
+    tier: str  # exact, alias, fuzzy, embedding or unmatched
+    candidates: list[SkillCandidate]
+
+
+class SkillSuggestResponse(BaseModel):
+    threshold: float
+    suggestions: list[SkillSuggestion]
@@ -33,6 +33,7 @@ class RoadmapItem(BaseModel):
     priority: int
     week_start: int
     week_end: int
+    track: int = 1  # parallel schedules: which concurrent course slot
     # SkillsFuture Credit fields
     skillsfuture_eligible: bool = True
     skillsfuture_credit_amount: float = 0.0
@@ -47,3 +48,8 @@ class RoadmapResponse(BaseModel):
     total_cost: float = 0.0
     total_after_subsidy: float = 0.0
     total_skillsfuture_applicable: float = 0.0
+    # What the course set minimises (fee | weeks | greedy) and its value: dollars nett, or weeks
+    objective: str = "greedy"
+    objective_value: float = 0.0
+    schedule: str = "sequential"
+    tracks: int = 1
@@ -0,0 +1,106 @@
+"""Per-request analysis of one profile, each piece computed at most once.
+
+Chat, interview, export, projects, dashboard and upskilling all need some of
+recommendations -> skill gaps -> roadmap -> learning pathways, and each step
+used to recompute the previous ones. A ``ProfileAnalysisContext`` computes
+them lazily and shares the intermediate results:
+
+* the tenant's reference data (``reference_data``) is fetched once and its
+  roles reused for ranking, the materialization freshness check and gap
+  analysis;
+* a fresh materialized row (see ``materializer``) supplies recommendations and
+  gaps without any scoring;
+* the roadmap and pathways reuse the gaps.
+
+Create one per request; it holds ORM rows bound to the request's session.
+"""
+
+from functools import cached_property
+from typing import Mapping
+
+from sqlalchemy.orm import Session
+
+from app.models.materialized_analysis import MaterializedAnalysis
+from app.models.user_profile import UserProfile
+from app.schemas.recommendation import RoleRecommendation
+from app.schemas.skill_gap import RoleGap
+from app.services import materializer
+from app.services.course_pathways import generate_learning_pathways
+from app.services.gap_analyzer import analyze_gaps
+from app.services.reference_data import RoleRef, TenantReference, tenant_reference
+from app.services.recommender import get_recommendations
+from app.services.roadmap_generator import RoadmapPlan, plan_roadmap
+
+
+class ProfileAnalysisContext:
+    def __init__(self, profile: UserProfile, db: Session, tenant_id: int):
+        self.profile = profile
+        self.db = db
+        self.tenant_id = tenant_id
+        self._recommendations: list[RoleRecommendation] | None = None
+        self._recommendations_top_n = 0
+        self._plans: dict[tuple, RoadmapPlan] = {}
+
+    @cached_property
+    def reference(self) -> TenantReference:
+        return tenant_reference(self.db, self.tenant_id)
+
+    @cached_property
+    def roles(self) -> list[RoleRef]:
+        return list(self.reference.roles)
+
+    @cached_property
+    def roles_by_id(self) -> Mapping[int, RoleRef]:
+        return self.reference.roles_by_id
+
+    @cached_property
+    def materialized(self) -> MaterializedAnalysis | None:
+        return materializer.fresh_row(self.profile, self.db, self.tenant_id, reference=self.reference)
+
+    def recommendations(self, top_n: int = 3) -> list[RoleRecommendation]:
+        """Top ``top_n`` roles; a longer list computed earlier is sliced rather than re-ranked."""
+        if self._recommendations is None or top_n > self._recommendations_top_n:
+            row = self.materialized
+            if row is not None and top_n <= row.top_n:
+                recs = [RoleRecommendation.model_validate(r) for r in row.recommendations[:top_n]]
+            else:
+                recs = get_recommendations(self.profile, self.db, tenant_id=self.tenant_id, top_n=top_n, roles=self.roles)
+            self._recommendations, self._recommendations_top_n = recs, top_n
+        return self._recommendations[:top_n]
+
+    @cached_property
+    def gaps(self) -> list[RoleGap]:
+        row = self.materialized
+        if row is not None:
+            return [RoleGap.model_validate(g) for g in row.gaps]
+        return analyze_gaps(
+            self.profile, self.db, tenant_id=self.tenant_id,
+            recommendations=self.recommendations(3), roles=self.roles_by_id,
+        )
+
+    def roadmap(
+        self, objective: str | None = None, schedule: str = "sequential", weekly_hours: int | None = None
+    ) -> RoadmapPlan:
+        key = (objective, schedule, weekly_hours)
+        if key not in self._plans:
+            self._plans[key] = plan_roadmap(
+                self.profile, self.db, self.tenant_id, objective=objective, schedule=schedule,
+                weekly_hours=weekly_hours, gaps=self.gaps,
+            )
+        return self._plans[key]
+
+    def missing_skills(self, top_roles: int = 2) -> list[str]:
+        """High/medium gap skills of the first ``top_roles`` roles, deduplicated in order."""
+        skills: list[str] = []
+        for role_gap in self.gaps[:top_roles]:
+            for g in role_gap.gaps:
+                if g.gap_severity in ("high", "medium") and g.skill not in skills:
+                    skills.append(g.skill)
+        return skills
+
+    @cached_property
+    def pathways(self) -> list[dict]:
+        skills = self.missing_skills()
+        if not skills:
+            return []
+        return generate_learning_pathways(skills, self.db, tenant_id=self.tenant_id)
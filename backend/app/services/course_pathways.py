@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.sctp_course import SCTPCourse
+from app.services.reference_data import tenant_reference
+from app.services.skill_index import SkillPostings, skill_index
 
 def generate_learning_pathways(skills_needed: list[str], db: Session, tenant_id: int | None = None) -> list[dict]:
     """
@@ -8,22 +10,27 @@ def generate_learning_pathways(skills_needed: list[str], db: Session, tenant_id:
     """
     pathways = []
     
-    # 1. Fetch all courses
-    query = db.query(SCTPCourse)
+    # 1. Find courses with a taught skill containing each missing skill
     if tenant_id:
-        query = query.filter((SCTPCourse.tenant_id == tenant_id) | (SCTPCourse.tenant_id == None))
-    all_courses = query.all()
+        matches = {skill: skill_index.course_ids_containing(db, tenant_id, skill) for skill in skills_needed}
+        courses = tenant_reference(db, tenant_id).courses
+    else:
+        # Unscoped: no maintained index spans every tenant, build a throwaway one
+        postings = SkillPostings()
+        courses = {}
+        for course in db.query(SCTPCourse).all():
+            postings.put(course.id, course.skills_taught or [])
+            courses[course.id] = course
+        matches = {skill: postings.ids_containing(skill) for skill in skills_needed}
 
-    # 2. For each missing skill, find relevant courses
+    # 2. For each missing skill, collect relevant courses (re-checked against the course data)
     for skill in skills_needed:
-        relevant_courses = []
         skill_lower = skill.lower()
-        
-        for course in all_courses:
-            # Check if skill is in course.skills_taught
-            if course.skills_taught and any(skill_lower in s.lower() for s in course.skills_taught):
-                relevant_courses.append(course)
-        
+        relevant_courses = [
+            courses[course_id] for course_id in sorted(matches[skill])
+            if course_id in courses and any(skill_lower in s.lower() for s in courses[course_id].skills_taught or [])
+        ]
+
         if not relevant_courses:
             continue
 
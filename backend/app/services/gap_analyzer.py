@@ -1,10 +1,15 @@
 """Skill gap analysis — compares user skills against recommended roles."""
 
+from typing import Mapping
+
 from sqlalchemy.orm import Session
 
 from app.models.user_profile import UserProfile
+from app.schemas.recommendation import RoleRecommendation
 from app.schemas.skill_gap import RoleGap, SkillGapItem
 from app.services.recommender import get_recommendations
+from app.services.reference_data import RoleRef, tenant_reference
+from app.services.request_memo import profile_key, request_memoized
 from app.services.skill_matcher import match_skills
 
 
@@ -32,18 +37,41 @@ def _priority(severity: str, required_level: str) -> int:
     return p
 
 
-def analyze_gaps(profile: UserProfile, db: Session, tenant_id: int) -> list[RoleGap]:
-    recommendations = get_recommendations(profile, db, tenant_id=tenant_id, top_n=3)
+def _gaps_key(profile, db, tenant_id, recommendations=None, roles=None):
+    role_ids = None if recommendations is None else tuple(r.role_id for r in recommendations[:3])
+    return profile_key(profile, db), tenant_id, role_ids
+
+
+@request_memoized(key=_gaps_key)
+def analyze_gaps(
+    profile: UserProfile,
+    db: Session,
+    tenant_id: int,
+    recommendations: list[RoleRecommendation] | None = None,
+    roles: Mapping[int, RoleRef] | None = None,
+) -> list[RoleGap]:
+    """Gap analysis for the top 3 recommended roles.
+
+    Pass ``recommendations`` (ranked, at least 3 if available) to reuse an
+    already computed recommendation list, and ``roles`` (the tenant's roles by
+    id) if they are already at hand; otherwise they come from the tenant's
+    reference-data snapshot.
+    """
+    if recommendations is None:
+        recommendations = get_recommendations(profile, db, tenant_id=tenant_id, top_n=3)
+    recommendations = recommendations[:3]
     user_skills = profile.skills or []
 
     # Pre-build skill index (optimization)
     from app.services.skill_matcher import build_skill_index
     cached_index = build_skill_index(user_skills) if user_skills else None
 
+    if roles is None:
+        roles = tenant_reference(db, tenant_id).roles_by_id
+
     results = []
     for rec in recommendations:
-        from app.models.job_role import JobRole
-        role = db.query(JobRole).filter(JobRole.id == rec.role_id, JobRole.tenant_id == tenant_id).first()
+        role = roles.get(rec.role_id)
         if not role:
             continue
 
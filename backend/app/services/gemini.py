@@ -0,0 +1,39 @@
+"""Latency and error metrics for Gemini API calls.
+
+Each call site wraps only the network round trip::
+
+    with gemini_call("chat"):
+        response = chat.send_message(prompt)
+
+Errors are counted by caller and kind (``rate_limited`` for 429 / quota
+responses, ``error`` otherwise) and re-raised for the caller's own fallback.
+"""
+
+import time
+from contextlib import contextmanager
+
+from app import metrics
+
+request_seconds = metrics.histogram(
+    "gemini_request_seconds", "Gemini API call latency by caller",
+    (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0),
+    labelnames=("caller",),
+)
+errors_total = metrics.counter("gemini_errors_total", "Failed Gemini API calls", labelnames=("caller", "kind"))
+
+
+def is_rate_limited(error: Exception) -> bool:
+    message = str(error)
+    return "429" in message or "ResourceExhausted" in message or "quota" in message.lower()
+
+
+@contextmanager
+def gemini_call(caller: str):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        errors_total.labels(caller=caller, kind="rate_limited" if is_rate_limited(e) else "error").inc()
+        raise
+    finally:
+        request_seconds.labels(caller=caller).observe(time.perf_counter() - started)
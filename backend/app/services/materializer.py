@@ -0,0 +1,150 @@
+"""Offline materialization of recommendations and skill gaps per profile.
+
+Request handlers (dashboard, peer comparison, project suggestions, interview)
+read the stored rows through ``recommendations_for`` / ``gaps_for`` when they
+are fresh, i.e. when both the profile fingerprint and the tenant's role
+fingerprint still match what the row was computed from. Otherwise they fall
+back to computing on the request path. The role fingerprint is hashed once
+per reference-data snapshot (``TenantReference.roles_fingerprint``) and
+derived from the rows themselves, so it agrees across workers, the CLI and
+restarts.
+
+Run as a CLI::
+
+    python -m app.services.materializer [--tenant ID] [--force]
+
+or in-process by setting ``MATERIALIZE_INTERVAL_MINUTES`` (see ``main.lifespan``).
+"""
+
+import argparse
+import hashlib
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.materialized_analysis import MaterializedAnalysis
+from app.models.tenant import Tenant
+from app.models.user_profile import UserProfile
+from app.schemas.recommendation import RoleRecommendation
+from app.schemas.skill_gap import RoleGap
+from app.services.gap_analyzer import analyze_gaps
+from app.services.recommender import get_recommendations, iter_batch_recommendations
+from app.services.reference_data import TenantReference, tenant_reference
+
+logger = logging.getLogger(__name__)
+
+
+def profile_fingerprint(profile: UserProfile) -> str:
+    """Hash of the profile fields that recommendations and gaps depend on."""
+    raw = repr((
+        sorted(profile.skills or []), profile.years_experience,
+        profile.education, bool(profile.is_career_switcher),
+    ))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def materialize_tenant(db: Session, tenant_id: int, force: bool = False) -> dict:
+    """Recompute rows for profiles (or roles) that changed since the last run."""
+    # Read before computing: a role write landing meanwhile leaves the rows stale
+    roles_fp = tenant_reference(db, tenant_id).roles_fingerprint
+    profiles = db.query(UserProfile).filter(UserProfile.tenant_id == tenant_id).all()
+    existing = {
+        row.profile_id: row
+        for row in db.query(MaterializedAnalysis).filter(MaterializedAnalysis.tenant_id == tenant_id)
+    }
+
+    stale = []
+    for profile in profiles:
+        row = existing.get(profile.id)
+        if (
+            force or row is None
+            or row.roles_fingerprint != roles_fp
+            or row.top_n != settings.materialize_top_n
+            or row.profile_fingerprint != profile_fingerprint(profile)
+        ):
+            stale.append(profile)
+
+    batches = iter_batch_recommendations(stale, db, tenant_id=tenant_id, top_n=settings.materialize_top_n)
+    for profile, recs in batches:
+        gaps = analyze_gaps(profile, db, tenant_id=tenant_id, recommendations=recs)
+        row = existing.get(profile.id)
+        if row is None:
+            row = MaterializedAnalysis(profile_id=profile.id, tenant_id=tenant_id)
+            db.add(row)
+        row.top_n = settings.materialize_top_n
+        row.recommendations = [r.model_dump() for r in recs]
+        row.gaps = [g.model_dump() for g in gaps]
+        row.profile_fingerprint = profile_fingerprint(profile)
+        row.roles_fingerprint = roles_fp
+        row.computed_at = datetime.now(timezone.utc)
+    db.commit()
+
+    stats = {"tenant_id": tenant_id, "profiles": len(profiles), "recomputed": len(stale)}
+    logger.info("Materialized analyses: %s", stats)
+    return stats
+
+
+def materialize_all(db: Session, force: bool = False) -> list[dict]:
+    return [materialize_tenant(db, tenant.id, force=force) for tenant in db.query(Tenant).all()]
+
+
+def fresh_row(
+    profile: UserProfile, db: Session, tenant_id: int, reference: TenantReference | None = None
+) -> MaterializedAnalysis | None:
+    """The profile's materialized row if it is still current, else None.
+
+    ``reference`` is the tenant's snapshot if the caller already holds it.
+    """
+    row = (
+        db.query(MaterializedAnalysis)
+        .filter(MaterializedAnalysis.profile_id == profile.id, MaterializedAnalysis.tenant_id == tenant_id)
+        .first()
+    )
+    if row is None or row.profile_fingerprint != profile_fingerprint(profile):
+        return None
+    if reference is None:
+        reference = tenant_reference(db, tenant_id)
+    if row.roles_fingerprint != reference.roles_fingerprint:
+        return None
+    return row
+
+
+def recommendations_for(profile: UserProfile, db: Session, tenant_id: int, top_n: int = 5) -> list[RoleRecommendation]:
+    """Materialized recommendations when fresh, otherwise computed on demand."""
+    row = fresh_row(profile, db, tenant_id)
+    if row is not None and top_n <= row.top_n:
+        return [RoleRecommendation.model_validate(r) for r in row.recommendations[:top_n]]
+    return get_recommendations(profile, db, tenant_id=tenant_id, top_n=top_n)
+
+
+def gaps_for(profile: UserProfile, db: Session, tenant_id: int) -> list[RoleGap]:
+    """Materialized skill gaps when fresh, otherwise computed on demand."""
+    row = fresh_row(profile, db, tenant_id)
+    if row is not None:
+        return [RoleGap.model_validate(g) for g in row.gaps]
+    return analyze_gaps(profile, db, tenant_id=tenant_id)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Materialize recommendations and skill gaps per profile.")
+    parser.add_argument("--tenant", type=int, help="Only this tenant id (default: all tenants)")
+    parser.add_argument("--force", action="store_true", help="Recompute every profile")
+    args = parser.parse_args(argv)
+
+    from app.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        if args.tenant is not None:
+            materialize_tenant(db, args.tenant, force=args.force)
+        else:
+            materialize_all(db, force=args.force)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
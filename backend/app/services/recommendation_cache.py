@@ -0,0 +1,273 @@
+"""Bounded TTL cache for recommendation results with targeted invalidation.
+
+Cache keys embed two generation counters:
+
+* ``tenant:<id>`` — bumped whenever a JobRole or SCTPCourse row of the tenant
+  is inserted, updated or deleted (``tenant:all`` for shared courses);
+* ``profile:<id>`` — bumped whenever a UserProfile row is written;
+* ``profiles:<tenant id>`` — bumped when a UserProfile row of the tenant is
+  inserted, updated or deleted (``profiles:all`` without a tenant); only
+  ``skill_index`` uses it;
+* ``insights:<id>`` — bumped on MarketInsight writes (``insights:all`` for
+  shared rows). Recommendations do not depend on it; ``reference_data``
+  versions its snapshots with these counters too.
+
+Bumping a counter makes every older key unreachable, so invalidation is O(1)
+and stale entries simply age out. Counters are bumped from SQLAlchemy events
+after the owning transaction commits, so every write path (routers, seeding,
+scripts) is covered without explicit calls.
+
+By default entries live in-process. Set ``RECOMMENDATION_CACHE_URL`` to a
+``redis://`` URL to share entries and counters between workers.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app import metrics
+from app.config import settings
+from app.models.job_role import JobRole
+from app.models.market_insight import MarketInsight
+from app.models.sctp_course import SCTPCourse
+from app.models.user_profile import UserProfile
+from app.schemas.recommendation import RoleRecommendation
+
+logger = logging.getLogger(__name__)
+
+hits_total = metrics.counter("recommendation_cache_hits_total", "Recommendation cache lookups that found an entry")
+misses_total = metrics.counter("recommendation_cache_misses_total", "Recommendation cache lookups that found nothing")
+
+_PENDING_KEY = "recommendation_cache_pending"
+
+
+class LocalBackend:
+    """In-process store. TTL is constant, so insertion order is expiry order."""
+
+    shared = False  # counters only see this process's writes
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.maxsize:
+                break
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            self._evict(time.time())
+
+    def generations(self, names: list[str]) -> list[int]:
+        with self._lock:
+            return [self._generations.get(n, 0) for n in names]
+
+    def bump(self, name: str) -> None:
+        with self._lock:
+            self._generations[name] = self._generations.get(name, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+class RedisBackend:
+    """Shared store backed by Redis; values are stored as JSON."""
+
+    shared = True
+
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5)
+
+    def get(self, key: str) -> Any | None:
+        raw = self._client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self._client.set(key, json.dumps(value), ex=ttl)
+
+    def generations(self, names: list[str]) -> list[int]:
+        return [int(v or 0) for v in self._client.mget([f"gen:{n}" for n in names])]
+
+    def bump(self, name: str) -> None:
+        self._client.incr(f"gen:{name}")
+
+    def clear(self) -> None:
+        pass
+
+
+class RecommendationCache:
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, profile: UserProfile, top_n: int, tenant_id: int) -> str:
+        tenant_gen, shared_gen, profile_gen = self.backend.generations(
+            [f"tenant:{tenant_id}", "tenant:all", f"profile:{profile.id}"]
+        )
+        # Profile fields are hashed too, so uncommitted edits never hit a stale entry
+        skills_str = ",".join(sorted(profile.skills or []))
+        raw = f"{skills_str}:{profile.years_experience}:{profile.education}:{profile.is_career_switcher}"
+        digest = hashlib.md5(raw.encode()).hexdigest()
+        return f"rec:{tenant_id}.{tenant_gen}.{shared_gen}:{profile.id}.{profile_gen}:{top_n}:{digest}"
+
+    def get(self, profile: UserProfile, top_n: int, tenant_id: int) -> list[RoleRecommendation] | None:
+        try:
+            value = self.backend.get(self._key(profile, top_n, tenant_id))
+        except Exception as e:
+            logger.warning("Recommendation cache read failed: %s", e)
+            return None
+        if value is None:
+            self.misses += 1
+            misses_total.inc()
+            return None
+        self.hits += 1
+        hits_total.inc()
+        return [RoleRecommendation.model_validate(r) for r in value]
+
+    def set(self, profile: UserProfile, top_n: int, tenant_id: int, recommendations: list[RoleRecommendation]) -> None:
+        try:
+            self.backend.set(
+                self._key(profile, top_n, tenant_id),
+                [r.model_dump() for r in recommendations],
+                self.ttl,
+            )
+        except Exception as e:
+            logger.warning("Recommendation cache write failed: %s", e)
+
+    def invalidate_tenant(self, tenant_id: int | None) -> None:
+        self._bump(f"tenant:{tenant_id}" if tenant_id is not None else "tenant:all")
+
+    def invalidate_profile(self, profile_id: int) -> None:
+        self._bump(f"profile:{profile_id}")
+
+    def invalidate_profiles(self, tenant_id: int | None) -> None:
+        self._bump(f"profiles:{tenant_id}" if tenant_id is not None else "profiles:all")
+
+    def invalidate_insights(self, tenant_id: int | None) -> None:
+        self._bump(f"insights:{tenant_id}" if tenant_id is not None else "insights:all")
+
+    def generations(self, names: list[str]) -> list[int | None]:
+        """Current counters; None for each if the backend is unreachable (callers must not cache on those)."""
+        try:
+            return self.backend.generations(names)
+        except Exception as e:
+            logger.warning("Recommendation cache generation lookup failed: %s", e)
+            return [None] * len(names)
+
+    def _bump(self, name: str) -> None:
+        try:
+            self.backend.bump(name)
+        except Exception as e:
+            logger.warning("Recommendation cache invalidation of %s failed: %s", name, e)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def _create_backend():
+    if settings.recommendation_cache_url:
+        try:
+            backend = RedisBackend(settings.recommendation_cache_url)
+            logger.info("Recommendation cache using shared backend")
+            return backend
+        except ImportError:
+            logger.warning("redis package not installed; using in-process recommendation cache")
+    return LocalBackend(maxsize=settings.recommendation_cache_size)
+
+
+recommendation_cache = RecommendationCache(_create_backend(), ttl=settings.recommendation_cache_ttl)
+
+
+# --- Invalidation hooks ---
+
+def _record(session: Session, name: str, value: int | None) -> None:
+    session.info.setdefault(_PENDING_KEY, set()).add((name, value))
+
+
+@event.listens_for(JobRole, "after_insert")
+@event.listens_for(JobRole, "after_update")
+@event.listens_for(JobRole, "after_delete")
+@event.listens_for(SCTPCourse, "after_insert")
+@event.listens_for(SCTPCourse, "after_update")
+@event.listens_for(SCTPCourse, "after_delete")
+def _on_reference_write(mapper, connection, target) -> None:
+    _record_tenants(target, "tenant")
+
+
+@event.listens_for(MarketInsight, "after_insert")
+@event.listens_for(MarketInsight, "after_update")
+@event.listens_for(MarketInsight, "after_delete")
+def _on_insight_write(mapper, connection, target) -> None:
+    _record_tenants(target, "insights")
+
+
+def _record_tenants(target, name: str) -> None:
+    session = Session.object_session(target)
+    if session is None:
+        return
+    _record(session, name, target.tenant_id)
+    # A row moved between tenants also changes what its previous tenant sees
+    for previous in inspect(target).attrs.tenant_id.history.deleted:
+        _record(session, name, previous)
+
+
+@event.listens_for(UserProfile, "after_update")
+@event.listens_for(UserProfile, "after_delete")
+def _on_profile_write(mapper, connection, target) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        _record(session, "profile", target.id)
+
+
+@event.listens_for(UserProfile, "after_insert")
+@event.listens_for(UserProfile, "after_update")
+@event.listens_for(UserProfile, "after_delete")
+def _on_tenant_profiles_write(mapper, connection, target) -> None:
+    _record_tenants(target, "profiles")
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    for name, value in session.info.pop(_PENDING_KEY, ()):
+        if name == "tenant":
+            recommendation_cache.invalidate_tenant(value)
+        elif name == "insights":
+            recommendation_cache.invalidate_insights(value)
+        elif name == "profiles":
+            recommendation_cache.invalidate_profiles(value)
+        else:
+            recommendation_cache.invalidate_profile(value)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
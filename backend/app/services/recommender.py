@@ -1,14 +1,26 @@
 """Hybrid job recommender combining content-based and rule-based scoring."""
 
-import hashlib
-import time
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
 
+import numpy as np
 from sqlalchemy.orm import Session
 
+from app.ml.snapshots import load_role_matrix, save_role_matrix
 from app.models.job_role import JobRole
 from app.models.user_profile import UserProfile
 from app.schemas.recommendation import RoleRecommendation
-from app.services.skill_matcher import compute_content_similarity, match_skills
+from app.services.recommendation_cache import recommendation_cache
+from app.services.reference_data import RoleRef, roles_fingerprint, tenant_reference
+from app.services.request_memo import profile_key, request_memoized
+from app.services.skill_matcher import (
+    RoleSkillMatrix,
+    build_role_skill_matrix,
+    matrix_content_scores,
+    matrix_required_split,
+    score_profiles_against_matrix,
+)
 
 # Hybrid weights
 W_CONTENT = 0.55
@@ -22,15 +34,58 @@ EDUCATION_RANK = {
     "phd": 4,
 }
 
-# In-memory TTL cache for recommendation results
-_rec_cache: dict[str, tuple[float, list["RoleRecommendation"]]] = {}
-_CACHE_TTL = 300  # seconds
 
-
-def _cache_key(profile: UserProfile, top_n: int, tenant_id: int) -> str:
-    skills_str = ",".join(sorted(profile.skills or []))
-    raw = f"{profile.id}:{skills_str}:{profile.years_experience}:{profile.education}:{profile.is_career_switcher}:{top_n}:{tenant_id}"
-    return hashlib.md5(raw.encode()).hexdigest()
+@dataclass(frozen=True)
+class RoleCatalog:
+    """Plain-data snapshot of a tenant's roles plus their stacked skill matrix."""
+
+    fingerprint: str
+    role_ids: list[int]
+    titles: list[str]
+    categories: list[str]
+    salary_ranges: list[str | None]
+    education_ranks: np.ndarray
+    min_experience_years: np.ndarray
+    career_switcher_friendly: np.ndarray
+    matrix: RoleSkillMatrix
+
+
+# Tenant-scoped role catalogs, rebuilt when the role rows change
+_role_catalogs: dict[int, RoleCatalog] = {}
+_catalog_lock = threading.Lock()
+
+
+def get_role_catalog(roles: list[JobRole], tenant_id: int) -> RoleCatalog:
+    """Return the cached RoleCatalog for a tenant, rebuilding it if the roles changed."""
+    roles = sorted(roles, key=lambda r: r.id)
+    fingerprint = roles_fingerprint(roles)
+    catalog = _role_catalogs.get(tenant_id)
+    if catalog is not None and catalog.fingerprint == fingerprint:
+        return catalog
+
+    with _catalog_lock:
+        catalog = _role_catalogs.get(tenant_id)
+        if catalog is not None and catalog.fingerprint == fingerprint:
+            return catalog
+        matrix = load_role_matrix(tenant_id, fingerprint)
+        if matrix is None:
+            matrix = build_role_skill_matrix([(r.required_skills, r.preferred_skills) for r in roles])
+            save_role_matrix(tenant_id, fingerprint, matrix)
+        catalog = RoleCatalog(
+            fingerprint=fingerprint,
+            role_ids=[r.id for r in roles],
+            titles=[r.title for r in roles],
+            categories=[r.category for r in roles],
+            salary_ranges=[r.salary_range for r in roles],
+            education_ranks=np.asarray(
+                [EDUCATION_RANK.get((r.education_level or "").lower(), 0) for r in roles], dtype=np.int64
+            ),
+            min_experience_years=np.asarray([r.min_experience_years or 0 for r in roles], dtype=np.int64),
+            career_switcher_friendly=np.asarray([bool(r.career_switcher_friendly) for r in roles], dtype=bool),
+            matrix=matrix,
+        )
+        _role_catalogs[tenant_id] = catalog
+        return catalog
 
 
 def _rule_score(profile: UserProfile, role: JobRole) -> float:
@@ -61,6 +116,26 @@ def _career_switcher_bonus(profile: UserProfile, role: JobRole) -> float:
     return 0.0
 
 
+def _rule_scores(profiles: list[UserProfile], catalog: RoleCatalog) -> np.ndarray:
+    """Vectorised ``_rule_score``: an (R, P) matrix over roles x profiles."""
+    user_ed = np.asarray([EDUCATION_RANK.get((p.education or "").lower(), 0) for p in profiles])
+    years = np.asarray([p.years_experience or 0 for p in profiles])
+    role_ed = catalog.education_ranks[:, None]
+    min_exp = catalog.min_experience_years[:, None]
+    edu = np.where(user_ed >= role_ed, 0.5, np.where(user_ed == role_ed - 1, 0.25, 0.0))
+    exp = np.where(years >= min_exp, 0.5, np.where(years >= min_exp - 1, 0.25, 0.0))
+    return edu + exp
+
+
+def _career_switcher_bonuses(profiles: list[UserProfile], catalog: RoleCatalog) -> np.ndarray:
+    """Vectorised ``_career_switcher_bonus``: an (R, P) matrix over roles x profiles."""
+    bonus = np.asarray([
+        max(0.0, 1.0 - (p.years_experience or 0) * 0.1) if p.is_career_switcher else 0.0
+        for p in profiles
+    ])
+    return np.where(catalog.career_switcher_friendly[:, None], bonus, 0.0)
+
+
 def _skill_match_quality(content_score: float) -> str:
     """Classify skill match quality based on content similarity score."""
     if content_score >= 0.7:
@@ -70,78 +145,105 @@ def _skill_match_quality(content_score: float) -> str:
     return "developing"
 
 
+def _rank_profiles(
+    profiles: list[UserProfile], catalog: RoleCatalog, top_n: int
+) -> list[list[RoleRecommendation]]:
+    """Score every profile against every role in one vectorised pass and keep the top_n."""
+    skill_scores = score_profiles_against_matrix(catalog.matrix, [p.skills or [] for p in profiles])
+    content_scores = matrix_content_scores(catalog.matrix, skill_scores)
+    rule_scores = _rule_scores(profiles, catalog)
+    cs_bonuses = _career_switcher_bonuses(profiles, catalog)
+    match_scores = (
+        W_CONTENT * content_scores
+        + W_RULE * rule_scores
+        + W_CAREER_SWITCHER * cs_bonuses
+    )
+
+    # Stable sort on the rounded score keeps ties in role-id order
+    order = np.argsort(-np.round(match_scores, 3), axis=0, kind="stable")[:top_n]
+
+    results = []
+    for p in range(len(profiles)):
+        scored = []
+        for i in order[:, p]:
+            i = int(i)
+            content_score = float(content_scores[i, p])
+            cs_bonus = float(cs_bonuses[i, p])
+            matched, missing = matrix_required_split(catalog.matrix, skill_scores[:, p], i)
+
+            # Build rationale
+            parts = []
+            if matched:
+                parts.append(f"Strong in: {', '.join(matched[:3])}")
+            if missing:
+                parts.append(f"Gaps in: {', '.join(missing[:3])}")
+            if cs_bonus > 0:
+                parts.append("Career-switcher friendly role")
+            rationale = ". ".join(parts) if parts else "General match"
+
+            scored.append(RoleRecommendation(
+                role_id=catalog.role_ids[i],
+                title=catalog.titles[i],
+                category=catalog.categories[i],
+                match_score=round(float(match_scores[i, p]), 3),
+                content_score=round(content_score, 3),
+                rule_score=round(float(rule_scores[i, p]), 3),
+                career_switcher_bonus=round(cs_bonus, 3),
+                matched_skills=matched,
+                missing_skills=missing,
+                rationale=rationale,
+                salary_range=catalog.salary_ranges[i],
+                skill_match_quality=_skill_match_quality(content_score),
+            ))
+        results.append(scored)
+    return results
+
+
+def tenant_roles(db: Session, tenant_id: int) -> list[RoleRef]:
+    """The tenant's job roles from the reference-data snapshot, id order."""
+    return list(tenant_reference(db, tenant_id).roles)
+
+
+@request_memoized(key=lambda profile, db, tenant_id, top_n=5, roles=None: (profile_key(profile, db), tenant_id, top_n))
 def get_recommendations(
-    profile: UserProfile, db: Session, tenant_id: int, top_n: int = 5
+    profile: UserProfile, db: Session, tenant_id: int, top_n: int = 5, roles: list[RoleRef] | None = None
 ) -> list[RoleRecommendation]:
-    # Check cache (clean expired entries first)
-    key = _cache_key(profile, top_n, tenant_id)
-    now = time.time()
-    expired_keys = [k for k, (t, _) in _rec_cache.items() if now - t >= _CACHE_TTL]
-    for k in expired_keys:
-        del _rec_cache[k]
-    if key in _rec_cache:
-        cached_time, cached_result = _rec_cache[key]
-        if now - cached_time < _CACHE_TTL:
-            return cached_result
-
-    roles = db.query(JobRole).filter(JobRole.tenant_id == tenant_id).all()
-    
-    # Pre-build skill index for the user (optimization)
-    from app.services.skill_matcher import build_skill_index
-    user_skills = profile.skills or []
-    
-    # Only build index if user has skills
-    cached_index = build_skill_index(user_skills) if user_skills else None
-
-    scored = []
-    for role in roles:
-            
-        all_role_skills = role.required_skills + role.preferred_skills
-
-        content_score = compute_content_similarity(user_skills, all_role_skills, cached_index=cached_index)
-        rule_score = _rule_score(profile, role)
-        cs_bonus = _career_switcher_bonus(profile, role)
-
-        match_score = (
-            W_CONTENT * content_score
-            + W_RULE * rule_score
-            + W_CAREER_SWITCHER * cs_bonus
-        )
-
-        # Determine matched/missing skills
-        skill_scores = match_skills(user_skills, role.required_skills, cached_index=cached_index)
-        matched = [s for s, v in skill_scores.items() if v >= 0.5]
-        missing = [s for s, v in skill_scores.items() if v < 0.5]
-
-        # Build rationale
-        parts = []
-        if matched:
-            parts.append(f"Strong in: {', '.join(matched[:3])}")
-        if missing:
-            parts.append(f"Gaps in: {', '.join(missing[:3])}")
-        if cs_bonus > 0:
-            parts.append("Career-switcher friendly role")
-        rationale = ". ".join(parts) if parts else "General match"
-
-        scored.append(RoleRecommendation(
-            role_id=role.id,
-            title=role.title,
-            category=role.category,
-            match_score=round(match_score, 3),
-            content_score=round(content_score, 3),
-            rule_score=round(rule_score, 3),
-            career_switcher_bonus=round(cs_bonus, 3),
-            matched_skills=matched,
-            missing_skills=missing,
-            rationale=rationale,
-            salary_range=role.salary_range,
-            skill_match_quality=_skill_match_quality(content_score),
-        ))
-
-    scored.sort(key=lambda r: r.match_score, reverse=True)
-    result = scored[:top_n]
-
-    # Store in cache
-    _rec_cache[key] = (time.time(), result)
-
-    return result
+    """Top ``top_n`` roles for the profile; pass ``roles`` if the tenant's roles are already loaded."""
+    cached = recommendation_cache.get(profile, top_n, tenant_id)
+    if cached is not None:
+        return cached
+
+    if roles is None:
+        roles = tenant_roles(db, tenant_id)
+    catalog = get_role_catalog(roles, tenant_id)
+    scored = _rank_profiles([profile], catalog, top_n)[0]
+
+    recommendation_cache.set(profile, top_n, tenant_id, scored)
+
+    return scored
+
+
+def iter_batch_recommendations(
+    profiles: list[UserProfile],
+    db: Session,
+    tenant_id: int,
+    top_n: int = 5,
+    chunk_size: int = 256,
+) -> Iterator[tuple[UserProfile, list[RoleRecommendation]]]:
+    """Recommend roles for many profiles, loading the tenant's roles once.
+
+    Profiles are processed in chunks; each chunk encodes its users' skills in
+    one batch and computes the profile x role score matrix in one step.
+    Roles are loaded eagerly, so the database is not touched while iterating.
+    """
+    roles = tenant_roles(db, tenant_id)
+    catalog = get_role_catalog(roles, tenant_id)
+
+    def _iterate():
+        for start in range(0, len(profiles), chunk_size):
+            chunk = profiles[start:start + chunk_size]
+            for profile, recs in zip(chunk, _rank_profiles(chunk, catalog, top_n)):
+                recommendation_cache.set(profile, top_n, tenant_id, recs)
+                yield profile, recs
+
+    return _iterate()
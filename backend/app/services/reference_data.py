@@ -0,0 +1,230 @@
+"""Per-tenant, in-process snapshots of reference data: roles, courses, market insights.
+
+Hot endpoints read whole tenant tables (recommendations read every role,
+roadmaps and pathways read courses, chat and ``/market-insights`` read every
+insight). ``reference_data.get(db, tenant_id)`` returns an immutable
+``TenantReference`` of plain frozen dataclasses instead, loaded once and
+shared by every request until the data changes.
+
+Snapshots are versioned by the generation counters of
+``recommendation_cache`` (``tenant:<id>`` / ``tenant:all`` for roles and
+courses, ``insights:<id>`` / ``insights:all`` for market insights). Those are
+bumped from SQLAlchemy events after every committed write, so seeding, the
+market simulation and any router write invalidate the affected snapshots
+without explicit calls, and with a shared (Redis) backend other workers see
+the bump as well. With the in-process backend the counters only see this
+process's writes, so snapshots are also rebuilt once older than
+``REFERENCE_DATA_MAX_AGE_SECONDS``.
+
+``get_async`` serves ``async def`` routers: the version check (a blocking
+cache client) runs in a worker thread and a rebuild queries through the
+request's ``AsyncSession``.
+
+The dataclasses mirror their models' columns, with JSON lists as tuples, so
+read-only code written against the ORM rows works on them unchanged. Each
+snapshot also carries ``roles_fingerprint``, a hash of the role rows that is
+stable across processes (materialized rows are checked against it).
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import Mapping
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.job_role import JobRole
+from app.models.market_insight import MarketInsight
+from app.models.sctp_course import SCTPCourse
+from app.services.recommendation_cache import recommendation_cache
+from app.services.request_memo import request_memoized
+
+
+@dataclass(frozen=True)
+class RoleRef:
+    id: int
+    title: str
+    category: str
+    description: str
+    required_skills: tuple[str, ...]
+    preferred_skills: tuple[str, ...]
+    min_experience_years: int | None
+    education_level: str | None
+    career_switcher_friendly: bool | None
+    salary_range: str | None
+    tenant_id: int
+
+
+@dataclass(frozen=True)
+class CourseRef:
+    id: int
+    title: str
+    provider: str
+    skills_taught: tuple[str, ...]
+    duration_weeks: int | None
+    level: str | None
+    url: str | None
+    certification: str | None
+    skillsfuture_eligible: bool | None
+    skillsfuture_credit_amount: float | None
+    course_fee: float | None
+    nett_fee_after_subsidy: float | None
+    subsidy_percent: float | None
+    mces_eligible: bool | None
+    tenant_id: int | None
+
+
+@dataclass(frozen=True)
+class InsightRef:
+    id: int
+    role_category: str
+    trending_skills: tuple[str, ...]
+    avg_salary_sgd: float | None
+    demand_level: str | None
+    hiring_volume: int | None
+    yoy_growth_pct: float | None
+    forecast_2026: str | None
+    outlook: str | None
+    tenant_id: int | None
+
+
+def roles_fingerprint(roles) -> str:
+    """Stable hash of every role field that affects recommendations (JobRole or RoleRef)."""
+    h = hashlib.md5()
+    for r in sorted(roles, key=lambda r: r.id):
+        h.update(repr((
+            r.id, r.title, r.category, r.salary_range,
+            list(r.required_skills), list(r.preferred_skills),
+            r.min_experience_years, r.education_level, r.career_switcher_friendly,
+        )).encode())
+    return h.hexdigest()
+
+
+def _freeze(ref_type, row):
+    values = {}
+    for f in fields(ref_type):
+        value = getattr(row, f.name)
+        values[f.name] = tuple(value or ()) if f.type == tuple[str, ...] else value
+    return ref_type(**values)
+
+
+@dataclass(frozen=True)
+class TenantReference:
+    tenant_id: int
+    version: tuple[int, ...]
+    roles: tuple[RoleRef, ...]  # the tenant's roles, id order
+    roles_by_id: Mapping[int, RoleRef]
+    courses: Mapping[int, CourseRef]  # the tenant's and shared courses, id order
+    insights: tuple[InsightRef, ...]  # the tenant's and shared insights, id order
+    roles_fingerprint: str
+    built_at: float = field(default_factory=time.monotonic, compare=False)
+
+    @staticmethod
+    def queries(tenant_id: int) -> tuple:
+        """Roles, courses and insights statements, in the order ``from_rows`` takes them."""
+        return (
+            select(JobRole).where(JobRole.tenant_id == tenant_id).order_by(JobRole.id),
+            select(SCTPCourse)
+            .where((SCTPCourse.tenant_id == tenant_id) | (SCTPCourse.tenant_id == None))
+            .order_by(SCTPCourse.id),
+            select(MarketInsight)
+            .where((MarketInsight.tenant_id == tenant_id) | (MarketInsight.tenant_id == None))
+            .order_by(MarketInsight.id),
+        )
+
+    @classmethod
+    def build(cls, db: Session, tenant_id: int, version: tuple[int, ...]) -> "TenantReference":
+        return cls.from_rows(tenant_id, version, *(db.scalars(q).all() for q in cls.queries(tenant_id)))
+
+    @classmethod
+    async def build_async(cls, db: AsyncSession, tenant_id: int, version: tuple[int, ...]) -> "TenantReference":
+        rows = [(await db.scalars(q)).all() for q in cls.queries(tenant_id)]
+        return cls.from_rows(tenant_id, version, *rows)
+
+    @classmethod
+    def from_rows(cls, tenant_id: int, version: tuple[int, ...], roles, courses, insights) -> "TenantReference":
+        roles = tuple(_freeze(RoleRef, r) for r in roles)
+        courses = {c.id: _freeze(CourseRef, c) for c in courses}
+        insights = tuple(_freeze(InsightRef, i) for i in insights)
+        return cls(
+            tenant_id=tenant_id,
+            version=version,
+            roles=roles,
+            roles_by_id=MappingProxyType({r.id: r for r in roles}),
+            courses=MappingProxyType(courses),
+            insights=insights,
+            roles_fingerprint=roles_fingerprint(roles),
+        )
+
+
+class ReferenceDataCache:
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._snapshots: dict[int, TenantReference] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    @staticmethod
+    def _version(tenant_id: int) -> tuple[int, ...]:
+        return tuple(recommendation_cache.generations(
+            [f"tenant:{tenant_id}", "tenant:all", f"insights:{tenant_id}", "insights:all"]
+        ))
+
+    def get(self, db: Session, tenant_id: int) -> TenantReference:
+        """Current snapshot for the tenant, rebuilt if any of its tables changed."""
+        version = self._version(tenant_id)
+        if None in version:
+            # Counters unreadable (cache backend down): writes can't be detected,
+            # so build from the database every time and keep nothing
+            return TenantReference.build(db, tenant_id, version)
+        snapshot = self._cached(tenant_id, version)
+        if snapshot is None:
+            # Built outside the lock; a write landing meanwhile bumps the version
+            # past the one read above, so this snapshot is replaced on next use
+            snapshot = self._store(TenantReference.build(db, tenant_id, version))
+        return snapshot
+
+    async def get_async(self, db: AsyncSession, tenant_id: int) -> TenantReference:
+        """``get`` for async routers, querying through ``db`` when a rebuild is needed."""
+        version = await asyncio.to_thread(self._version, tenant_id)
+        if None in version:
+            return await TenantReference.build_async(db, tenant_id, version)
+        snapshot = self._cached(tenant_id, version)
+        if snapshot is None:
+            snapshot = self._store(await TenantReference.build_async(db, tenant_id, version))
+        return snapshot
+
+    def _cached(self, tenant_id: int, version: tuple[int, ...]) -> TenantReference | None:
+        snapshot = self._snapshots.get(tenant_id)
+        if snapshot is not None and snapshot.version == version and self._current(snapshot):
+            return snapshot
+        return None
+
+    def _store(self, snapshot: TenantReference) -> TenantReference:
+        with self._lock:
+            self._snapshots[snapshot.tenant_id] = snapshot
+            self.builds += 1
+        return snapshot
+
+    def _current(self, snapshot: TenantReference) -> bool:
+        # Writes from other workers only reach shared counters; bound the staleness otherwise
+        return recommendation_cache.backend.shared or time.monotonic() - snapshot.built_at < self.max_age
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+
+reference_data = ReferenceDataCache(max_age=settings.reference_data_max_age_seconds)
+
+
+@request_memoized(key=lambda db, tenant_id: tenant_id)
+def tenant_reference(db: Session, tenant_id: int) -> TenantReference:
+    """``reference_data.get``, checked against the version counters once per request."""
+    return reference_data.get(db, tenant_id)
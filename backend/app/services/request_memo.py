@@ -0,0 +1,125 @@
+"""Request-scoped memoization of service calls.
+
+Inside one request the same service is often called repeatedly with the same
+arguments (the chat fallback rebuilding the roadmap the chat handler already
+built, every service reloading the tenant's roles, ...). Functions decorated
+with ``request_memoized`` return the first result for a given key for the
+rest of the request instead of recomputing it.
+
+The memo lives in a ``ContextVar`` set by ``RequestMemoMiddleware`` (or
+``request_scope()`` in scripts and tests), so it follows the request into the
+threadpool that runs sync endpoints and is never shared between requests.
+Outside a scope decorated functions are called as usual. Nothing here touches
+the process-wide caches (``recommendation_cache``, ``skill_index``).
+
+Results are shared between callers within the request and must not be
+mutated; lists are handed out as shallow copies. Any commit on a session
+clears the memo, since the data it was computed from may have changed.
+"""
+
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app import metrics
+from app.config import settings
+
+hits_total = metrics.counter("request_memo_hits_total", "Service calls answered from the request memo")
+misses_total = metrics.counter("request_memo_misses_total", "Service calls computed and stored in the request memo")
+
+
+class RequestMemo:
+    def __init__(self):
+        self.values: dict[tuple, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        self.values.clear()
+
+
+_current: ContextVar[RequestMemo | None] = ContextVar("request_memo", default=None)
+
+
+def current_memo() -> RequestMemo | None:
+    return _current.get()
+
+
+def profile_key(profile, db) -> tuple:
+    """Memo key part for a profile: its row in this session plus the fields services read."""
+    return (
+        id(db), profile.id, tuple(profile.skills or []), profile.years_experience,
+        profile.education, profile.is_career_switcher,
+    )
+
+
+@contextmanager
+def request_scope():
+    """Activate a fresh memo for the enclosed block (nested scopes reuse the outer one)."""
+    memo = _current.get()
+    if memo is not None:
+        yield memo
+        return
+    memo = RequestMemo()
+    token = _current.set(memo)
+    try:
+        yield memo
+    finally:
+        _current.reset(token)
+
+
+def request_memoized(key: Callable[..., Hashable | None]):
+    """Memoize the decorated function per request under ``key(*args, **kwargs)``.
+
+    ``key`` receives the call's arguments and returns a hashable key, or None
+    to bypass the memo for that call (e.g. when the caller passes precomputed
+    inputs the key does not capture).
+    """
+    def decorator(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            memo = _current.get()
+            if memo is None or not settings.request_memo_enabled:
+                return fn(*args, **kwargs)
+            k = key(*args, **kwargs)
+            if k is None:
+                return fn(*args, **kwargs)
+            k = (name, k)
+            if k in memo.values:
+                memo.hits += 1
+                hits_total.inc()
+                value = memo.values[k]
+            else:
+                memo.misses += 1
+                misses_total.inc()
+                value = memo.values[k] = fn(*args, **kwargs)
+            return list(value) if isinstance(value, list) else value
+
+        return wrapper
+
+    return decorator
+
+
+class RequestMemoMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        with request_scope() as memo:
+            response = await call_next(request)
+        if settings.request_memo_debug_headers:
+            response.headers["X-Memo-Hits"] = str(memo.hits)
+            response.headers["X-Memo-Misses"] = str(memo.misses)
+        return response
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_on_commit(session: Session) -> None:
+    memo = _current.get()
+    if memo is not None:
+        memo.clear()
@@ -1,7 +1,8 @@
 import json
 import logging
 from app.config import settings
-import google.generativeai as genai
+from app.ml.taxonomy import normalize_skills
+from app.services.gemini import gemini_call
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,8 @@ def extract_skills(resume_text: str) -> list[str]:
         return []
 
     try:
+        import google.generativeai as genai
+
         genai.configure(api_key=settings.gemini_api_key)
         model = genai.GenerativeModel(
             model_name=settings.gemini_model,
@@ -28,15 +31,24 @@ def extract_skills(resume_text: str) -> list[str]:
             f"Resume Text:\n{resume_text[:10000]}"  # Truncate to avoid token limits if necessary
         )
 
-        response = model.generate_content(prompt)
+        with gemini_call("resume_parser"):
+            response = model.generate_content(prompt)
         
         text_response = response.text.strip()
         if text_response.startswith("```"):
             text_response = text_response.strip("`").replace("json", "", 1).strip()
             
         parsed = json.loads(text_response)
-        return parsed.get("skills", [])
+        skills = parsed.get("skills", [])
 
     except Exception as e:
         logger.exception("Gemini skill extraction failed: %s", e)
         return []
+
+    # Map to canonical taxonomy names so matching against roles is exact
+    try:
+        return normalize_skills(skills)
+    except Exception as e:
+        # Encoder / index failures in the embedding tier must not fail uploads
+        logger.warning("Skill normalization failed, keeping extracted names: %s", e)
+        return skills
@@ -1,20 +1,103 @@
-"""Upskilling roadmap generator — maps missing skills to SCTP courses."""
+"""Upskilling roadmap generator — maps missing skills to SCTP courses.
+
+The course set is chosen by ``roadmap_optimizer`` (cheapest set covering the
+gap skills, by nett fee or weeks). ``greedy`` keeps the earlier behaviour of
+picking one course per skill, highest priority first.
+
+Courses run back to back (``sequential``) or, with ``parallel``, on as many
+concurrent tracks as the learner's weekly hours allow, scheduled by
+``roadmap_scheduler`` for the shortest overall timeline.
+"""
+
+from dataclasses import dataclass
 
 from sqlalchemy.orm import Session
 
-from app.models.sctp_course import SCTPCourse
+from app import metrics
+from app.config import settings
 from app.models.user_profile import UserProfile
-from app.schemas.skill_gap import RoadmapItem
+from app.schemas.skill_gap import RoadmapItem, RoleGap
+from app.services import roadmap_scheduler
 from app.services.gap_analyzer import analyze_gaps
+from app.services.roadmap_optimizer import OBJECTIVES, CourseOption, select_courses
+from app.services.request_memo import profile_key, request_memoized
+from app.services.reference_data import CourseRef, tenant_reference
+from app.services.skill_index import skill_index
 from app.services.subsidy_calculator import calculate_subsidies
 
+ROADMAP_OBJECTIVES = OBJECTIVES + ("greedy",)
+SCHEDULES = ("sequential", "parallel")
+
+roadmap_seconds_histogram = metrics.histogram(
+    "roadmap_generation_seconds", "Time to plan an upskilling roadmap (request-memo hits excluded)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+@dataclass
+class RoadmapPlan:
+    items: list[RoadmapItem]
+    objective: str
+    objective_value: float  # total nett fee (fee, greedy) or total weeks (weeks)
+    optimal: bool  # False when the optimizer fell back to its greedy cover
+    schedule: str = "sequential"
+    tracks: int = 1
+
+
+def parallel_tracks(weekly_hours: int | None = None) -> int:
+    """Concurrent courses that fit the learner's weekly study hours."""
+    hours = weekly_hours if weekly_hours is not None else settings.roadmap_weekly_hours
+    return max(1, min(settings.roadmap_max_tracks, hours // settings.roadmap_course_hours_per_week))
 
-def generate_roadmap(profile: UserProfile, db: Session, tenant_id: int) -> list[RoadmapItem]:
-    gaps = analyze_gaps(profile, db, tenant_id=tenant_id)
-    courses = db.query(SCTPCourse).filter(
-        (SCTPCourse.tenant_id == tenant_id) | (SCTPCourse.tenant_id == None)
-    ).all()
 
+def generate_roadmap(
+    profile: UserProfile,
+    db: Session,
+    tenant_id: int,
+    objective: str | None = None,
+    schedule: str = "sequential",
+    weekly_hours: int | None = None,
+) -> list[RoadmapItem]:
+    return plan_roadmap(profile, db, tenant_id, objective, schedule, weekly_hours).items
+
+
+def _plan_key(profile, db, tenant_id, objective=None, schedule="sequential", weekly_hours=None, gaps=None):
+    gaps_key = None if gaps is None else tuple(g.model_dump_json() for g in gaps)
+    return profile_key(profile, db), tenant_id, objective, schedule, weekly_hours, gaps_key
+
+
+@request_memoized(key=_plan_key)
+def plan_roadmap(
+    profile: UserProfile,
+    db: Session,
+    tenant_id: int,
+    objective: str | None = None,
+    schedule: str = "sequential",
+    weekly_hours: int | None = None,
+    gaps: list[RoleGap] | None = None,
+) -> RoadmapPlan:
+    """Roadmap for the profile's gaps; pass ``gaps`` to reuse an already computed gap analysis."""
+    with roadmap_seconds_histogram.time():
+        return _plan_roadmap(profile, db, tenant_id, objective, schedule, weekly_hours, gaps)
+
+
+def _plan_roadmap(
+    profile: UserProfile,
+    db: Session,
+    tenant_id: int,
+    objective: str | None,
+    schedule: str,
+    weekly_hours: int | None,
+    gaps: list[RoleGap] | None,
+) -> RoadmapPlan:
+    objective = objective or settings.roadmap_objective
+    if objective not in ROADMAP_OBJECTIVES:
+        raise ValueError(f"Unknown roadmap objective {objective!r}; expected one of {ROADMAP_OBJECTIVES}")
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Unknown roadmap schedule {schedule!r}; expected one of {SCHEDULES}")
+
+    if gaps is None:
+        gaps = analyze_gaps(profile, db, tenant_id=tenant_id)
     is_career_switcher = profile.is_career_switcher or False
 
     # Collect all missing/partial skills across recommended roles, deduped
@@ -32,53 +115,138 @@ def generate_roadmap(profile: UserProfile, db: Session, tenant_id: int) -> list[
     # Sort skills by priority
     sorted_skills = sorted(skill_priorities.items(), key=lambda x: x[1])
 
-    # Map skills to courses
+    # Only the courses teaching at least one gap skill
+    catalog = tenant_reference(db, tenant_id).courses
+    courses = [
+        catalog[course_id] for course_id in sorted(skill_index.course_ids(db, tenant_id, skill_priorities))
+        if course_id in catalog
+    ]
+
+    if objective == "greedy":
+        picks = _pick_per_skill(sorted_skills, courses)
+        optimal = False
+    else:
+        picks, optimal = _pick_optimal(sorted_skills, courses, objective, is_career_switcher)
+
+    durations = [course.duration_weeks or 4 for _, _, course in picks]
+    tracks = parallel_tracks(weekly_hours) if schedule == "parallel" else 1
+    if tracks > 1:
+        gap_keys = {skill.lower() for skill, _ in sorted_skills}
+        preds = roadmap_scheduler.prerequisites(
+            [{s.lower() for s in course.skills_taught} & gap_keys for _, _, course in picks],
+            [course.level for _, _, course in picks],
+        )
+        slots, _ = roadmap_scheduler.schedule(durations, preds, tracks)
+    else:
+        # Back to back, in pick order
+        slots, week = [], 1
+        for duration in durations:
+            slots.append(roadmap_scheduler.ScheduledCourse(start=week, end=week + duration - 1, track=1))
+            week += duration
+
     roadmap = []
-    current_week = 1
-    used_courses = set()
+    for (skill, priority, course), duration, slot in zip(picks, durations, slots):
+
+        # Calculate real subsidies
+        subsidies = calculate_subsidies(course, is_career_switcher)
+
+        roadmap.append(RoadmapItem(
+            skill=skill,
+            course_title=course.title,
+            provider=course.provider,
+            duration_weeks=duration,
+            level=course.level,
+            url=course.url,
+            certification=course.certification,
+            priority=priority,
+            week_start=slot.start,
+            week_end=slot.end,
+            track=slot.track,
+            skillsfuture_eligible=course.skillsfuture_eligible if course.skillsfuture_eligible is not None else True,
+            skillsfuture_credit_amount=subsidies["sfc_applicable"],
+            course_fee=subsidies["course_fee"],
+            nett_fee_after_subsidy=subsidies["nett_payable"],
+        ))
+    roadmap.sort(key=lambda item: (item.week_start, item.track))
+
+    if objective == "weeks":
+        value = float(sum(item.duration_weeks for item in roadmap))
+    else:
+        value = round(sum(item.nett_fee_after_subsidy for item in roadmap), 2)
+    return RoadmapPlan(
+        items=roadmap, objective=objective, objective_value=value, optimal=optimal, schedule=schedule, tracks=tracks,
+    )
+
+
+def _pick_per_skill(
+    sorted_skills: list[tuple[str, int]], courses: list[CourseRef]
+) -> list[tuple[str, int, CourseRef]]:
+    """One unused course per skill, preferring courses that cover multiple gap skills."""
+    courses_by_skill: dict[str, list[CourseRef]] = {}
+    match_counts: dict[int, int] = {}
+    for course in courses:
+        taught = {s.lower() for s in course.skills_taught}
+        for s in taught:
+            courses_by_skill.setdefault(s, []).append(course)
+        match_counts[course.id] = sum(1 for s, _ in sorted_skills if s.lower() in taught)
 
+    picks = []
+    used_courses = set()
     for skill, priority in sorted_skills:
         # Find best course for this skill
         best_course = None
         best_match_count = 0
-        for course in courses:
+        for course in courses_by_skill.get(skill.lower(), ()):
             if course.id in used_courses:
                 continue
-            taught = [s.lower() for s in course.skills_taught]
-            if skill.lower() in taught:
-                # Prefer courses that cover multiple gap skills
-                match_count = sum(
-                    1 for s, _ in sorted_skills
-                    if s.lower() in taught
-                )
-                if match_count > best_match_count:
-                    best_match_count = match_count
-                    best_course = course
-
+            if match_counts[course.id] > best_match_count:
+                best_match_count = match_counts[course.id]
+                best_course = course
         if best_course:
             used_courses.add(best_course.id)
-            duration = best_course.duration_weeks or 4
-            week_end = current_week + duration - 1
-
-            # Calculate real subsidies
-            subsidies = calculate_subsidies(best_course, is_career_switcher)
-
-            roadmap.append(RoadmapItem(
-                skill=skill,
-                course_title=best_course.title,
-                provider=best_course.provider,
-                duration_weeks=duration,
-                level=best_course.level,
-                url=best_course.url,
-                certification=best_course.certification,
-                priority=priority,
-                week_start=current_week,
-                week_end=week_end,
-                skillsfuture_eligible=best_course.skillsfuture_eligible if best_course.skillsfuture_eligible is not None else True,
-                skillsfuture_credit_amount=subsidies["sfc_applicable"],
-                course_fee=subsidies["course_fee"],
-                nett_fee_after_subsidy=subsidies["nett_payable"],
+            picks.append((skill, priority, best_course))
+    return picks
+
+
+def _pick_optimal(
+    sorted_skills: list[tuple[str, int]], courses: list[CourseRef], objective: str, is_career_switcher: bool
+) -> tuple[list[tuple[str, int, CourseRef]], bool]:
+    """Cheapest course set covering the gap skills, ordered by the most urgent skill each covers."""
+    # One bit per distinct (case-insensitive) gap skill, in priority order
+    bits: dict[str, int] = {}
+    labels: list[tuple[str, int]] = []
+    for skill, priority in sorted_skills:
+        if skill.lower() not in bits:
+            bits[skill.lower()] = len(labels)
+            labels.append((skill, priority))
+
+    options = []
+    for course in courses:
+        mask = 0
+        for s in course.skills_taught:
+            bit = bits.get(s.lower())
+            if bit is not None:
+                mask |= 1 << bit
+        if mask:
+            nett = calculate_subsidies(course, is_career_switcher)["nett_payable"]
+            options.append(CourseOption(
+                key=course.id, mask=mask, fee_cents=round(nett * 100), weeks=course.duration_weeks or 4,
             ))
-            current_week = week_end + 1
 
-    return roadmap
+    # Priority 1 (most urgent) weighs 5, priority 5 weighs 1
+    weights = [max(6 - priority, 1) for _, priority in labels]
+    selection = select_courses(options, weights, objective)
+
+    by_id = {course.id: course for course in courses}
+    masks = {option.key: option.mask for option in options}
+    ordered = sorted(selection.keys, key=lambda key: ((masks[key] & -masks[key]).bit_length(), key))
+
+    picks = []
+    covered = 0
+    for key in ordered:
+        # Label each course with the most urgent skill it adds (else the most urgent it teaches)
+        new = masks[key] & ~covered or masks[key]
+        skill, priority = labels[(new & -new).bit_length() - 1]
+        covered |= masks[key]
+        picks.append((skill, priority, by_id[key]))
+    return picks, selection.exact
@@ -0,0 +1,160 @@
+"""Course-set selection for upskilling roadmaps as weighted set cover.
+
+Every gap skill taught by at least one candidate course must be covered; the
+chosen set minimises the objective:
+
+* ``fee``   — total nett fee after subsidies and SkillsFuture Credit, then weeks;
+* ``weeks`` — total course duration, then nett fee.
+
+Remaining ties go to fewer courses. Skill coverage is a bitset (a Python int
+with one bit per gap skill), so unions and subset tests are single integer
+operations regardless of catalog size.
+
+Courses with identical coverage collapse to the cheapest one, and any course
+whose coverage is contained in a no-more-expensive course's is dropped. When
+the remaining search space is small (``2**skills * courses`` below
+``_EXACT_BUDGET``) the optimum is found by dynamic programming over coverage
+masks; otherwise a priority-weighted greedy cover is used and redundant
+courses are pruned afterwards.
+"""
+
+from dataclasses import dataclass
+
+OBJECTIVES = ("fee", "weeks")
+
+# Upper bound on DP work (states x options); ~1s of pure Python at the limit
+_EXACT_BUDGET = 1_000_000
+
+
+@dataclass(frozen=True)
+class CourseOption:
+    key: int  # caller's id for the course
+    mask: int  # bit i set = teaches gap skill i
+    fee_cents: int  # nett payable, in cents so sums are exact
+    weeks: int
+
+
+@dataclass(frozen=True)
+class Selection:
+    keys: list[int]  # chosen course keys, in no particular order
+    covered: int  # union of the chosen masks
+    fee_cents: int
+    weeks: int
+    exact: bool  # True if proven optimal
+
+
+def _cost(option: CourseOption, objective: str) -> tuple[int, int, int]:
+    if objective == "weeks":
+        return option.weeks, option.fee_cents, 1
+    return option.fee_cents, option.weeks, 1
+
+
+def _add(a: tuple[int, int, int], b: tuple[int, int, int]) -> tuple[int, int, int]:
+    return a[0] + b[0], a[1] + b[1], a[2] + b[2]
+
+
+def _prune(options: list[CourseOption], target: int, objective: str) -> list[CourseOption]:
+    """Drop courses that another course covers as well for no more cost."""
+    cheapest: dict[int, CourseOption] = {}
+    for option in options:
+        mask = option.mask & target
+        if not mask:
+            continue
+        best = cheapest.get(mask)
+        if best is None or (_cost(option, objective), option.key) < (_cost(best, objective), best.key):
+            cheapest[mask] = option
+
+    kept: list[CourseOption] = []
+    for option in sorted(cheapest.values(), key=lambda o: (_cost(o, objective), -bin(o.mask & target).count("1"), o.key)):
+        mask = option.mask & target
+        if not any(mask & k.mask == mask for k in kept):
+            kept.append(option)
+    return kept
+
+
+def _exact(options: list[CourseOption], target: int, objective: str) -> list[CourseOption]:
+    # best[mask] = (cost, chosen option indices) for the cheapest way to cover exactly ``mask``
+    best: dict[int, tuple[tuple[int, int, int], tuple[int, ...]]] = {0: ((0, 0, 0), ())}
+    for i, option in enumerate(options):
+        cost = _cost(option, objective)
+        for mask, (total, chosen) in list(best.items()):
+            new_mask = mask | (option.mask & target)
+            if new_mask == mask:
+                continue
+            candidate = _add(total, cost)
+            current = best.get(new_mask)
+            if current is None or candidate < current[0]:
+                best[new_mask] = (candidate, chosen + (i,))
+    return [options[i] for i in best[target][1]]
+
+
+def _greedy(options: list[CourseOption], target: int, objective: str, weights: list[int]) -> list[CourseOption]:
+    def gain(mask: int) -> int:
+        total = 0
+        while mask:
+            low = mask & -mask
+            total += weights[low.bit_length() - 1]
+            mask ^= low
+        return total
+
+    chosen: list[CourseOption] = []
+    covered = 0
+    remaining = list(options)
+    while covered != target:
+        best, best_key = None, None
+        for option in remaining:
+            new = option.mask & target & ~covered
+            if not new:
+                continue
+            g = gain(new)
+            cost = _cost(option, objective)
+            key = (cost[0] / g, -g, cost[1] / g, option.key)
+            if best_key is None or key < best_key:
+                best, best_key = option, key
+        chosen.append(best)
+        covered |= best.mask & target
+        remaining.remove(best)
+
+    # Drop courses made redundant by later picks, most expensive first
+    for option in sorted(chosen, key=lambda o: _cost(o, objective), reverse=True):
+        rest = 0
+        for other in chosen:
+            if other is not option:
+                rest |= other.mask
+        if rest & target == target:
+            chosen.remove(option)
+    return chosen
+
+
+def select_courses(
+    options: list[CourseOption],
+    weights: list[int],
+    objective: str = "fee",
+) -> Selection:
+    """Cheapest course set covering every skill some option teaches.
+
+    ``weights[i]`` is the importance of skill bit ``i``; it only steers the
+    greedy fallback (cost per unit of newly covered weight).
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown roadmap objective {objective!r}; expected one of {OBJECTIVES}")
+
+    target = 0
+    for option in options:
+        target |= option.mask
+    target &= (1 << len(weights)) - 1
+
+    candidates = _prune(options, target, objective)
+    exact = (1 << bin(target).count("1")) * max(len(candidates), 1) <= _EXACT_BUDGET
+    if exact:
+        chosen = _exact(candidates, target, objective)
+    else:
+        chosen = _greedy(candidates, target, objective, weights)
+
+    return Selection(
+        keys=[o.key for o in chosen],
+        covered=target,
+        fee_cents=sum(o.fee_cents for o in chosen),
+        weeks=sum(o.weeks for o in chosen),
+        exact=exact,
+    )
@@ -0,0 +1,164 @@
+"""Minimal-makespan scheduling of roadmap courses on parallel tracks.
+
+A learner takes up to ``tracks`` courses at once. Course B must start after
+course A ends when both teach a common gap skill and A is at a lower level
+(beginner -> intermediate -> advanced -> specialist). Durations are whole
+weeks.
+
+Schedules are built with the serial schedule-generation scheme: courses are
+taken in a precedence-feasible order and each starts at the earliest week
+where its prerequisites are done and a track is free. Some order yields an
+optimal schedule, so for up to ``_EXACT_MAX_COURSES`` courses every order is
+searched (branch and bound on the critical path and the work per track);
+larger roadmaps use the longest-remaining-path order. Tracks are assigned
+afterwards by interval colouring, which never needs more than ``tracks``.
+"""
+
+from dataclasses import dataclass
+
+LEVELS = {"beginner": 1, "intermediate": 2, "advanced": 3, "specialist": 4}
+
+_EXACT_MAX_COURSES = 8
+
+
+@dataclass(frozen=True)
+class ScheduledCourse:
+    start: int  # first week, 1-based
+    end: int  # last week, inclusive
+    track: int  # 1-based
+
+
+def level_rank(level: str | None) -> int:
+    return LEVELS.get((level or "intermediate").lower(), 2)
+
+
+def prerequisites(skills: list[set[str]], levels: list[str | None]) -> list[set[int]]:
+    """``result[b]`` = courses that must finish before course ``b`` starts."""
+    ranks = [level_rank(level) for level in levels]
+    return [
+        {a for a in range(len(skills)) if ranks[a] < ranks[b] and skills[a] & skills[b]}
+        for b in range(len(skills))
+    ]
+
+
+def _tails(durations: list[int], preds: list[set[int]]) -> list[int]:
+    """Weeks from the start of each course to the end of its longest dependent chain."""
+    succs: list[list[int]] = [[] for _ in durations]
+    for b, before in enumerate(preds):
+        for a in before:
+            succs[a].append(b)
+    tails: dict[int, int] = {}
+
+    def tail(a: int) -> int:
+        if a not in tails:
+            tails[a] = durations[a] + max((tail(b) for b in succs[a]), default=0)
+        return tails[a]
+
+    return [tail(a) for a in range(len(durations))]
+
+
+class _Profile:
+    """Courses placed so far as ``(start, end)`` weeks, end exclusive."""
+
+    def __init__(self, tracks: int):
+        self.tracks = tracks
+        self.intervals: list[tuple[int, int]] = []
+
+    def _fits(self, start: int, end: int) -> bool:
+        # Occupancy only rises at interval starts, so checking those points suffices
+        points = [start] + [s for s, _ in self.intervals if start < s < end]
+        return all(sum(1 for s, e in self.intervals if s <= p < e) < self.tracks for p in points)
+
+    def earliest(self, ready: int, duration: int) -> int:
+        for start in sorted({ready} | {e for _, e in self.intervals if e > ready}):
+            if self._fits(start, start + duration):
+                return start
+        raise AssertionError("unreachable: a start after every interval always fits")
+
+
+def _assign_tracks(starts: list[int], durations: list[int], tracks: int) -> list[int]:
+    """Interval colouring in start order; never needs more than ``tracks`` tracks."""
+    free_at = [0] * tracks
+    assigned = [0] * len(starts)
+    for c in sorted(range(len(starts)), key=lambda c: (starts[c], c)):
+        track = next(t for t in range(tracks) if free_at[t] <= starts[c])
+        assigned[c] = track
+        free_at[track] = starts[c] + durations[c]
+    return assigned
+
+
+def schedule(durations: list[int], preds: list[set[int]], tracks: int) -> tuple[list[ScheduledCourse], bool]:
+    """Schedule courses on ``tracks`` parallel tracks; returns ``(slots, proven_optimal)``."""
+    n = len(durations)
+    if n == 0:
+        return [], True
+    tracks = max(1, min(tracks, n))
+    # Week offsets are 0-based internally
+    tails = _tails(durations, preds)
+    lower_bound = max(max(tails), -(-sum(durations) // tracks))
+
+    def build(order: list[int]) -> list[int]:
+        profile = _Profile(tracks)
+        starts = [0] * n
+        for c in order:
+            ready = max((starts[p] + durations[p] for p in preds[c]), default=0)
+            starts[c] = profile.earliest(ready, durations[c])
+            profile.intervals.append((starts[c], starts[c] + durations[c]))
+        return starts
+
+    def priority_order() -> list[int]:
+        done: set[int] = set()
+        order: list[int] = []
+        while len(order) < n:
+            ready = [c for c in range(n) if c not in done and preds[c] <= done]
+            c = min(ready, key=lambda c: (-tails[c], -durations[c], c))
+            order.append(c)
+            done.add(c)
+        return order
+
+    best_order = priority_order()
+    best_span = max(s + d for s, d in zip(build(best_order), durations))
+    optimal = best_span == lower_bound
+
+    if not optimal and n <= _EXACT_MAX_COURSES:
+        profile = _Profile(tracks)
+        finish = [0] * n
+        order: list[int] = []
+        done: set[int] = set()
+
+        def search() -> None:
+            nonlocal best_span, best_order
+            if best_span == lower_bound:
+                return
+            if len(order) == n:
+                span = max(finish)
+                if span < best_span:
+                    best_span, best_order = span, list(order)
+                return
+            for c in sorted((c for c in range(n) if c not in done), key=lambda c: (-tails[c], c)):
+                if not preds[c] <= done:
+                    continue
+                ready = max((finish[p] for p in preds[c]), default=0)
+                start = profile.earliest(ready, durations[c])
+                # This course's chain alone ends no earlier than start + tail
+                if start + tails[c] >= best_span:
+                    continue
+                profile.intervals.append((start, start + durations[c]))
+                finish[c] = start + durations[c]
+                order.append(c)
+                done.add(c)
+                search()
+                done.discard(c)
+                order.pop()
+                finish[c] = 0
+                profile.intervals.pop()
+
+        search()
+        optimal = True
+
+    starts = build(best_order)
+    assigned = _assign_tracks(starts, durations, tracks)
+    return [
+        ScheduledCourse(start=starts[c] + 1, end=starts[c] + durations[c], track=assigned[c] + 1)
+        for c in range(n)
+    ], optimal
@@ -0,0 +1,226 @@
+"""In-memory inverted index from lower-cased skill to role, course and profile ids.
+
+One ``TenantSkillIndex`` per tenant (``None`` holds shared courses and
+profiles without a tenant) is built on first use from the database and
+versioned, like ``reference_data`` snapshots, by ``recommendation_cache``
+generation counters: ``tenant:<id>`` (JobRole and SCTPCourse commits) and
+``profiles:<id>`` (UserProfile commits), ``all`` for rows without a tenant. A
+committed write bumps the counter and the index is rebuilt on next use; with
+the shared (Redis) backend that includes writes from other workers.
+
+The in-process backend only counts this process's writes, so there an index
+older than ``SKILL_INDEX_MAX_AGE_SECONDS`` is also rebuilt.
+
+``course_ids_containing_async`` serves ``async def`` routers: the version
+check runs in a worker thread and a rebuild queries through the request's
+``AsyncSession``.
+
+Queries return ids only; callers load the rows they need by primary key.
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.job_role import JobRole
+from app.models.sctp_course import SCTPCourse
+from app.models.user_profile import UserProfile
+from app.services.recommendation_cache import recommendation_cache
+
+KINDS = ("roles", "courses", "profiles")
+_MODELS = {"roles": JobRole, "courses": SCTPCourse, "profiles": UserProfile}
+
+
+def _skills_of(kind: str, row) -> list[str]:
+    if kind == "roles":
+        return (row.required_skills or []) + (row.preferred_skills or [])
+    if kind == "courses":
+        return row.skills_taught or []
+    return row.skills or []
+
+
+class SkillPostings:
+    """skill -> ids, plus ids -> skills so an item can be replaced or removed."""
+
+    def __init__(self):
+        self._ids: dict[str, set[int]] = {}
+        self._skills: dict[int, frozenset[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def put(self, item_id: int, skills: Iterable[str]) -> None:
+        self.discard(item_id)
+        lowered = frozenset(s.lower() for s in skills)
+        self._skills[item_id] = lowered
+        for skill in lowered:
+            self._ids.setdefault(skill, set()).add(item_id)
+
+    def discard(self, item_id: int) -> None:
+        for skill in self._skills.pop(item_id, ()):
+            ids = self._ids[skill]
+            ids.discard(item_id)
+            if not ids:
+                del self._ids[skill]
+
+    def ids(self, skill: str) -> set[int]:
+        return set(self._ids.get(skill.lower(), ()))
+
+    def ids_containing(self, fragment: str) -> set[int]:
+        """Ids of items with a skill containing ``fragment`` (case-insensitive).
+
+        Scans the distinct skill names instead of every item's skill list.
+        """
+        fragment = fragment.lower()
+        found: set[int] = set()
+        for skill, ids in self._ids.items():
+            if fragment in skill:
+                found |= ids
+        return found
+
+    def overlap_counts(self, skills: Iterable[str]) -> Counter:
+        """Number of distinct ``skills`` each item shares."""
+        counts: Counter = Counter()
+        for skill in {s.lower() for s in skills}:
+            counts.update(self._ids.get(skill, ()))
+        return counts
+
+
+class TenantSkillIndex:
+    def __init__(self, tenant_id: int | None, version: tuple[int | None, ...] = ()):
+        self.tenant_id = tenant_id
+        self.version = version
+        self.postings = {kind: SkillPostings() for kind in KINDS}
+        self.built_at = time.monotonic()
+
+    @staticmethod
+    def _query(kind: str, tenant_id: int | None):
+        model = _MODELS[kind]
+        return select(model).where(model.tenant_id == tenant_id)
+
+    @classmethod
+    def build(cls, db: Session, tenant_id: int | None, version: tuple[int | None, ...] = ()) -> "TenantSkillIndex":
+        rows = {kind: db.scalars(cls._query(kind, tenant_id)).all() for kind in KINDS}
+        return cls.from_rows(tenant_id, version, rows)
+
+    @classmethod
+    async def build_async(
+        cls, db: AsyncSession, tenant_id: int | None, version: tuple[int | None, ...] = ()
+    ) -> "TenantSkillIndex":
+        rows = {kind: (await db.scalars(cls._query(kind, tenant_id))).all() for kind in KINDS}
+        return cls.from_rows(tenant_id, version, rows)
+
+    @classmethod
+    def from_rows(cls, tenant_id: int | None, version: tuple[int | None, ...], rows: dict) -> "TenantSkillIndex":
+        index = cls(tenant_id, version)
+        for kind, kind_rows in rows.items():
+            for row in kind_rows:
+                index.postings[kind].put(row.id, _skills_of(kind, row))
+        return index
+
+
+class SkillIndex:
+    """Process-wide registry of per-tenant indexes.
+
+    Indexes are never modified once built, only replaced, so reads take no lock.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._tenants: dict[int | None, TenantSkillIndex] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version(tenant_id: int | None) -> tuple[int | None, ...]:
+        owner = tenant_id if tenant_id is not None else "all"
+        return tuple(recommendation_cache.generations([f"tenant:{owner}", f"profiles:{owner}"]))
+
+    def _tenant(self, db: Session, tenant_id: int | None) -> TenantSkillIndex:
+        version = self._version(tenant_id)
+        index = self._cached(tenant_id, version)
+        if index is None:
+            # Built against the version read above; a commit landing meanwhile bumps
+            # past it, so this index is replaced on next use
+            index = self._store(TenantSkillIndex.build(db, tenant_id, version))
+        return index
+
+    async def _tenant_async(self, db: AsyncSession, tenant_id: int | None) -> TenantSkillIndex:
+        version = await asyncio.to_thread(self._version, tenant_id)
+        index = self._cached(tenant_id, version)
+        if index is None:
+            index = self._store(await TenantSkillIndex.build_async(db, tenant_id, version))
+        return index
+
+    def _cached(self, tenant_id: int | None, version: tuple[int | None, ...]) -> TenantSkillIndex | None:
+        with self._lock:
+            index = self._tenants.get(tenant_id)
+        if (
+            index is not None and index.version == version
+            and (recommendation_cache.backend.shared or time.monotonic() - index.built_at < self.max_age)
+        ):
+            return index
+        return None
+
+    def _store(self, index: TenantSkillIndex) -> TenantSkillIndex:
+        if None not in index.version:
+            # Counters unreadable (cache backend down): writes can't be detected, keep nothing
+            with self._lock:
+                self._tenants[index.tenant_id] = index
+        return index
+
+    # --- Queries ---
+
+    def role_ids(self, db: Session, tenant_id: int, skill: str) -> set[int]:
+        return self._tenant(db, tenant_id).postings["roles"].ids(skill)
+
+    def course_ids(self, db: Session, tenant_id: int | None, skills: Iterable[str]) -> set[int]:
+        """Courses visible to the tenant (its own and shared) teaching any of ``skills`` exactly."""
+        skills = list(skills)
+        found: set[int] = set()
+        for owner in {tenant_id, None}:
+            postings = self._tenant(db, owner).postings["courses"]
+            for skill in skills:
+                found |= postings.ids(skill)
+        return found
+
+    def course_ids_containing(self, db: Session, tenant_id: int | None, fragment: str) -> set[int]:
+        """Courses visible to the tenant with a taught skill containing ``fragment``."""
+        found: set[int] = set()
+        for owner in {tenant_id, None}:
+            found |= self._tenant(db, owner).postings["courses"].ids_containing(fragment)
+        return found
+
+    async def course_ids_containing_async(self, db: AsyncSession, tenant_id: int | None, fragment: str) -> set[int]:
+        """``course_ids_containing`` for async routers."""
+        found: set[int] = set()
+        for owner in {tenant_id, None}:
+            found |= (await self._tenant_async(db, owner)).postings["courses"].ids_containing(fragment)
+        return found
+
+    def profile_overlaps(self, db: Session, tenant_id: int, skills: Iterable[str]) -> Counter:
+        """Profile id -> number of distinct ``skills`` (case-insensitive) it lists."""
+        return self._tenant(db, tenant_id).postings["profiles"].overlap_counts(skills)
+
+    # --- Maintenance ---
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                str(tenant_id): {kind: len(index.postings[kind]) for kind in KINDS}
+                for tenant_id, index in self._tenants.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tenants.clear()
+
+
+skill_index = SkillIndex(max_age=settings.skill_index_max_age_seconds)
+
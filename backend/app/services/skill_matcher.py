@@ -1,11 +1,21 @@
 """Skill matching using Sentence Transformers + FAISS for similarity search."""
 
-import faiss
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 import numpy as np
 
+from app.config import settings
 from app.ml.embeddings import encode_texts
+from app.ml.indexes import build_index, quantize_rows, search
 from app.ml.taxonomy import get_skill_category
 
+if TYPE_CHECKING:
+    import faiss
+
 # SSG category weights for skill importance
 CATEGORY_WEIGHTS = {
     "critical_core": 1.3,
@@ -14,26 +24,122 @@ CATEGORY_WEIGHTS = {
 }
 
 
-from functools import lru_cache
+class SkillEmbeddingCache:
+    """Bounded LRU cache of embeddings keyed by individual skill string.
+
+    List embeddings are assembled by gathering cached rows, so reordering a
+    skill list or adding one skill only encodes the strings never seen before.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._vectors: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def encode(self, skills: list[str] | tuple[str, ...]) -> np.ndarray:
+        """Return an (n, dim) float32 matrix of embeddings for ``skills``."""
+        if not skills:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        rows: dict[str, np.ndarray] = {}
+        with self._lock:
+            for skill in skills:
+                vec = self._vectors.get(skill)
+                if vec is not None:
+                    self._vectors.move_to_end(skill)
+                    rows[skill] = vec
+            self.hits += sum(1 for s in skills if s in rows)
+
+        new = [s for s in dict.fromkeys(skills) if s not in rows]
+        if new:
+            # Encode every genuinely new string in a single batch
+            encoded = np.asarray(encode_texts(new), dtype=np.float32)
+            with self._lock:
+                self.misses += len(new)
+                for skill, vec in zip(new, encoded):
+                    self._vectors[skill] = vec
+                    self._vectors.move_to_end(skill)
+                    rows[skill] = vec
+                while len(self._vectors) > self.maxsize:
+                    self._vectors.popitem(last=False)
+
+        return np.stack([rows[s] for s in skills])
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._vectors), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+skill_embedding_cache = SkillEmbeddingCache(maxsize=settings.skill_embedding_cache_size)
+
+
+def _encode_skills(skills: list[str] | tuple[str, ...]) -> np.ndarray:
+    return skill_embedding_cache.encode(skills)
+
 
-# ... imports ...
+def build_skill_index(skills: list[str]) -> tuple["faiss.Index", list[str]]:
+    """Build a FAISS index from a list of skill strings.
 
+    Always flat: these are one user's handful of skills, built per request, so
+    quantizing saves nothing and only adds training time and error.
+    """
+    return build_index(_encode_skills(skills), "flat"), skills
+
+
+@dataclass(frozen=True)
+class SkillWeights:
+    """Precomputed per-skill-list SSG weights and lower-cased names."""
 
-@lru_cache(maxsize=1024)
-def _cached_encode(texts: tuple[str]) -> np.ndarray:
-    """Cache embedding generation for immutable tuple of texts."""
-    print(f"DEBUG: CACHE MISS - Encoding {len(texts)} texts: {texts[:2]}...")
-    return encode_texts(list(texts)).astype(np.float32)
+    weights: np.ndarray  # (n,) float64 category weight
+    lowered: tuple[str, ...]
 
 
-def build_skill_index(skills: list[str]) -> tuple[faiss.Index, list[str]]:
-    """Build a FAISS index from a list of skill strings."""
-    # Use cached encoding (convert list to tuple)
-    embeddings = _cached_encode(tuple(skills))
-    dim = embeddings.shape[1]
-    index = faiss.IndexFlatIP(dim)
-    index.add(embeddings)
-    return index, skills
+@lru_cache(maxsize=16384)
+def skill_weights(skills: tuple[str, ...]) -> SkillWeights:
+    """Weights for a (deduplicated) skill list, cached per list, e.g. one role's requirements."""
+    return SkillWeights(
+        weights=np.asarray([CATEGORY_WEIGHTS.get(get_skill_category(s), 1.0) for s in skills], dtype=np.float64),
+        lowered=tuple(s.lower() for s in skills),
+    )
+
+
+def _score_vector(
+    user_skills: list[str],
+    required_skills: tuple[str, ...],
+    partial_threshold: float,
+    strong_threshold: float,
+    cached_index: tuple["faiss.Index", list[str]] | None,
+) -> np.ndarray:
+    """1.0 / 0.5 / 0.0 score per required skill, computed as array operations."""
+    if not user_skills or not required_skills:
+        return np.zeros(len(required_skills), dtype=np.float64)
+
+    if cached_index:
+        user_index, _ = cached_index
+    else:
+        user_index, _ = build_skill_index(user_skills)
+    sims, _ = search(user_index, _encode_skills(required_skills), 1, "user_skills")
+    sims = sims[:, 0]
+
+    # Exact text match overrides similarity
+    user_lower = {u.lower() for u in user_skills}
+    lowered = skill_weights(required_skills).lowered
+    exact = np.fromiter((s in user_lower for s in lowered), dtype=bool, count=len(lowered))
+
+    scores = np.zeros(len(required_skills), dtype=np.float64)
+    scores[sims >= partial_threshold] = 0.5
+    scores[exact | (sims >= strong_threshold)] = 1.0
+    return scores
 
 
 def match_skills(
@@ -41,7 +147,7 @@ def match_skills(
     required_skills: list[str],
     partial_threshold: float = 0.6,
     strong_threshold: float = 0.85,
-    cached_index: tuple[faiss.Index, list[str]] | None = None,
+    cached_index: tuple["faiss.Index", list[str]] | None = None,
 ) -> dict[str, float]:
     """Score each required skill against user skills.
 
@@ -50,38 +156,15 @@ def match_skills(
       0.5 = partial match
       0.0 = missing
     """
-    if not user_skills or not required_skills:
-        return {skill: 0.0 for skill in required_skills}
-
-    if cached_index:
-        user_index, _ = cached_index
-    else:
-        user_index, _ = build_skill_index(user_skills)
-    
-    # Use cached encoding for required skills (query)
-    query_embeddings = _cached_encode(tuple(required_skills))
-
-    scores, _ = user_index.search(query_embeddings, 1)
-
-    result = {}
-    for i, skill in enumerate(required_skills):
-        sim = float(scores[i][0])
-        # Exact text match override
-        if skill.lower() in [u.lower() for u in user_skills]:
-            result[skill] = 1.0
-        elif sim >= strong_threshold:
-            result[skill] = 1.0
-        elif sim >= partial_threshold:
-            result[skill] = 0.5
-        else:
-            result[skill] = 0.0
-    return result
+    required_skills = tuple(dict.fromkeys(required_skills))
+    scores = _score_vector(user_skills, required_skills, partial_threshold, strong_threshold, cached_index)
+    return dict(zip(required_skills, scores.tolist()))
 
 
 def compute_content_similarity(
-    user_skills: list[str], 
-    role_skills: list[str], 
-    cached_index: tuple[faiss.Index, list[str]] | None = None
+    user_skills: list[str],
+    role_skills: list[str],
+    cached_index: tuple["faiss.Index", list[str]] | None = None
 ) -> float:
     """Compute weighted content similarity between user skills and role requirements.
 
@@ -90,25 +173,180 @@ def compute_content_similarity(
     """
     if not role_skills:
         return 0.0
-    scores = match_skills(user_skills, role_skills, cached_index=cached_index)
-    weighted_sum = 0.0
-    weight_total = 0.0
-    for skill, score in scores.items():
-        w = CATEGORY_WEIGHTS.get(get_skill_category(skill), 1.0)
-        weighted_sum += score * w
-        weight_total += w
+    role_skills = tuple(dict.fromkeys(role_skills))
+    scores = _score_vector(user_skills, role_skills, 0.6, 0.85, cached_index)
+    weights = skill_weights(role_skills).weights
+    weight_total = weights.sum()
     if weight_total == 0:
         return 0.0
-    if weight_total == 0:
-        return 0.0
-    return weighted_sum / weight_total
+    return float(scores @ weights / weight_total)
+
+
+# Rows of int8 role-skill codes widened to float32 per matmul (~1.5 MB at 384 dims)
+_DEQUANTIZE_BLOCK_ROWS = 1024
+
+
+@dataclass(frozen=True)
+class RoleSkillMatrix:
+    """All role skills of a catalog stacked into one embedding matrix.
+
+    Role ``r`` owns rows ``offsets[r]:offsets[r] + lengths[r]``; the first
+    ``required_counts[r]`` of those are its required skills, the rest its
+    preferred skills. Skills are deduplicated per role in the same way as
+    ``match_skills`` (which keys its result dict by skill).
+
+    Outside ``flat`` index mode the embeddings are kept as per-row int8 codes
+    with ``scales``, a quarter of the float32 footprint.
+    """
+
+    skills: list[str]
+    embeddings: np.ndarray  # (S, dim) float32 L2-normalised, or int8 codes when ``scales`` is set
+    vocab_ids: np.ndarray  # (S,) id of the lower-cased skill in ``vocab``
+    vocab: dict[str, int]  # lower-cased skill -> id
+    weights: np.ndarray  # (S,) SSG category weight
+    offsets: np.ndarray  # (R,)
+    lengths: np.ndarray  # (R,)
+    required_counts: np.ndarray  # (R,)
+    scales: np.ndarray | None = None  # (S,) dequantization scale per row
+
+    @property
+    def num_roles(self) -> int:
+        return len(self.offsets)
+
+    def similarities(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every role skill with each query row, (S, Q).
+
+        int8 codes are widened to float32 a block of rows at a time, so a query
+        never materialises a float32 copy of the whole matrix.
+        """
+        queries_t = np.ascontiguousarray(queries.T, dtype=np.float32)
+        if self.scales is None:
+            return self.embeddings @ queries_t
+        sims = np.empty((len(self.embeddings), queries_t.shape[1]), dtype=np.float32)
+        for start in range(0, len(self.embeddings), _DEQUANTIZE_BLOCK_ROWS):
+            stop = start + _DEQUANTIZE_BLOCK_ROWS
+            np.matmul(self.embeddings[start:stop].astype(np.float32), queries_t, out=sims[start:stop])
+            sims[start:stop] *= self.scales[start:stop, None]
+        return sims
+
+
+def build_role_skill_matrix(role_skills: list[tuple[list[str], list[str]]]) -> RoleSkillMatrix:
+    """Build a RoleSkillMatrix from ``(required_skills, preferred_skills)`` per role."""
+    skills: list[str] = []
+    offsets, lengths, required_counts = [], [], []
+    for required, preferred in role_skills:
+        required = list(dict.fromkeys(required or []))
+        combined = list(dict.fromkeys(required + list(preferred or [])))
+        offsets.append(len(skills))
+        lengths.append(len(combined))
+        required_counts.append(len(required))
+        skills.extend(combined)
+
+    lengths_arr = np.asarray(lengths, dtype=np.int64)
+    required_arr = np.asarray(required_counts, dtype=np.int64)
+
+    # Encode and weight each distinct skill string once, then gather per row
+    unique = list(dict.fromkeys(skills))
+    row_of = {s: i for i, s in enumerate(unique)}
+    if unique:
+        unique_emb = _encode_skills(unique)
+        embeddings = unique_emb[[row_of[s] for s in skills]]
+    else:
+        embeddings = np.zeros((0, 0), dtype=np.float32)
+    unique_weights = np.asarray(
+        [CATEGORY_WEIGHTS.get(get_skill_category(s), 1.0) for s in unique], dtype=np.float64
+    )
+    weights = unique_weights[[row_of[s] for s in skills]] if unique else np.zeros(0, dtype=np.float64)
+
+    vocab: dict[str, int] = {}
+    vocab_ids = np.asarray(
+        [vocab.setdefault(s.lower(), len(vocab)) for s in skills], dtype=np.int64
+    )
+
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    scales = None
+    if settings.embedding_index_mode != "flat":
+        embeddings, scales = quantize_rows(embeddings)
+
+    return RoleSkillMatrix(
+        skills=skills,
+        embeddings=embeddings,
+        vocab_ids=vocab_ids,
+        vocab=vocab,
+        weights=weights,
+        offsets=np.asarray(offsets, dtype=np.int64),
+        lengths=lengths_arr,
+        required_counts=required_arr,
+        scales=scales,
+    )
+
+
+def score_profiles_against_matrix(
+    matrix: RoleSkillMatrix,
+    user_skill_lists: list[list[str]],
+    partial_threshold: float = 0.6,
+    strong_threshold: float = 0.85,
+) -> np.ndarray:
+    """Score every role skill in the matrix against each user's skills in one pass.
+
+    Returns an (S, P) array, one column per user, on the same 1.0 / 0.5 / 0.0
+    scale as ``match_skills``. All users' skills are encoded in a single batch.
+    """
+    num_users = len(user_skill_lists)
+    scores = np.zeros((len(matrix.skills), num_users), dtype=np.float64)
+    flat = [s for skills in user_skill_lists for s in skills]
+    if not flat or not matrix.skills:
+        return scores
+
+    # Best cosine similarity per role skill per user: segmented max over columns
+    sims = matrix.similarities(_encode_skills(flat))
+    lengths = np.asarray([len(skills) for skills in user_skill_lists], dtype=np.int64)
+    has_skills = np.flatnonzero(lengths)
+    starts = (np.cumsum(lengths) - lengths)[has_skills]
+    best = np.full(scores.shape, -np.inf)
+    best[:, has_skills] = np.maximum.reduceat(sims, starts, axis=1)
+
+    # Case-insensitive exact matches override similarity
+    owns = np.zeros((len(matrix.vocab), num_users), dtype=bool)
+    for p, skills in enumerate(user_skill_lists):
+        ids = [matrix.vocab[s.lower()] for s in skills if s.lower() in matrix.vocab]
+        owns[ids, p] = True
+    exact = owns[matrix.vocab_ids]
+
+    scores[best >= partial_threshold] = 0.5
+    scores[(best >= strong_threshold) | exact] = 1.0
+    return scores
+
+
+def matrix_content_scores(matrix: RoleSkillMatrix, scores: np.ndarray) -> np.ndarray:
+    """Category-weighted mean skill score per role and user, as in ``compute_content_similarity``.
+
+    ``scores`` is (S, P); the result is (R, P). Roles without skills score 0.
+    """
+    out = np.zeros((matrix.num_roles, scores.shape[1]), dtype=np.float64)
+    nonempty = np.flatnonzero(matrix.lengths)
+    if len(nonempty):
+        starts = matrix.offsets[nonempty]
+        weighted = np.add.reduceat(scores * matrix.weights[:, None], starts, axis=0)
+        totals = np.add.reduceat(matrix.weights, starts)
+        out[nonempty] = weighted / totals[:, None]
+    return out
+
+
+def matrix_required_split(
+    matrix: RoleSkillMatrix, scores: np.ndarray, role_index: int
+) -> tuple[list[str], list[str]]:
+    """Matched / missing required skills of one role (threshold 0.5)."""
+    start = int(matrix.offsets[role_index])
+    end = start + int(matrix.required_counts[role_index])
+    matched = [matrix.skills[i] for i in range(start, end) if scores[i] >= 0.5]
+    missing = [matrix.skills[i] for i in range(start, end) if scores[i] < 0.5]
+    return matched, missing
 
 
-def warmup_skill_cache(skill_sets: list[list[str]]):
-    """Force encoding of skill sets to populate LRU cache."""
-    count = 0
-    for skills in skill_sets:
-        if skills:
-            _cached_encode(tuple(skills))
-            count += 1
-    return count
+def warmup_skill_cache(skill_sets: list[list[str]]) -> int:
+    """Encode every distinct skill in ``skill_sets`` into the skill cache in one batch."""
+    unique = list(dict.fromkeys(s for skills in skill_sets for s in (skills or [])))
+    if unique:
+        _encode_skills(unique)
+    return len(unique)
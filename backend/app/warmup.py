@@ -0,0 +1,101 @@
+"""Background ML warmup with progress reporting for ``/ready``.
+
+The API serves non-ML routes as soon as the database is seeded; the model,
+taxonomy index and per-tenant role catalogs are warmed in a worker thread
+(the latter two from ``INDEX_SNAPSHOT_DIR`` when snapshots are current).
+ML routes called before warmup finishes still work, they just pay the load
+cost. A failed stage keeps ``/ready`` at 503 and is listed under ``failed``.
+"""
+
+import logging
+import threading
+import time
+
+from app.database import SessionLocal
+from app.models import JobRole
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupProgress:
+    """Thread-safe status of each warmup stage: pending, running, done or failed."""
+
+    def __init__(self, stages: list[str]):
+        self._lock = threading.Lock()
+        self._started_at: float | None = None
+        self._stages = {name: {"status": "pending", "seconds": None, "detail": None} for name in stages}
+
+    def run(self, name: str, fn) -> None:
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+            self._stages[name]["status"] = "running"
+        start = time.perf_counter()
+        try:
+            detail = fn()
+            status = "done"
+        except Exception as e:
+            logger.warning("Warmup stage %s failed (will retry on first request): %s", name, e)
+            detail, status = str(e), "failed"
+        with self._lock:
+            self._stages[name].update(status=status, seconds=round(time.perf_counter() - start, 3), detail=detail)
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return all(s["status"] == "done" for s in self._stages.values())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = [{"name": name, **state} for name, state in self._stages.items()]
+            elapsed = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+        finished = sum(1 for s in stages if s["status"] in ("done", "failed"))
+        failed = [s["name"] for s in stages if s["status"] == "failed"]
+        return {
+            "ready": finished == len(stages) and not failed,
+            "progress": round(finished / len(stages), 2),
+            "failed": failed,
+            "elapsed_seconds": round(elapsed, 3),
+            "stages": stages,
+        }
+
+
+warmup_progress = WarmupProgress(["model", "taxonomy_index", "role_catalogs"])
+
+
+def _warm_model():
+    from app.ml.embeddings import warmup_model
+
+    warmup_model()
+
+
+def _warm_taxonomy_index():
+    from app.ml.taxonomy import get_taxonomy_index
+
+    _, skills = get_taxonomy_index()
+    return f"{len(skills)} skills"
+
+
+def _warm_role_catalogs():
+    """Load (from snapshot) or build every tenant's role catalog."""
+    from app.services.recommender import get_role_catalog
+
+    db = SessionLocal()
+    try:
+        roles = db.query(JobRole).all()
+    finally:
+        db.close()
+    by_tenant: dict[int, list[JobRole]] = {}
+    for role in roles:
+        by_tenant.setdefault(role.tenant_id, []).append(role)
+    for tenant_id, tenant_roles in by_tenant.items():
+        get_role_catalog(tenant_roles, tenant_id)
+    return f"{len(roles)} roles across {len(by_tenant)} tenants"
+
+
+def run_warmup() -> None:
+    """Run every warmup stage in order; blocking, meant for a background thread."""
+    warmup_progress.run("model", _warm_model)
+    warmup_progress.run("taxonomy_index", _warm_taxonomy_index)
+    warmup_progress.run("role_catalogs", _warm_role_catalogs)
+    logger.info("ML warmup finished: %s", warmup_progress.snapshot())
@@ -0,0 +1,107 @@
+"""Read-endpoint throughput and latency at high concurrency, compared across servers.
+
+Usage (from ``backend/``), with the sync build on one port and the async
+build on another, both on the same database::
+
+    python -m benchmarks.async_load \\
+        --target sync=http://localhost:8001 --target async=http://localhost:8000 \\
+        --token "$ACCESS_TOKEN" --profile-id 1 --concurrency 10 100 400 --requests 4000
+
+Requests cycle through the six async read endpoints (``/market-insights``,
+``/roles``, ``/courses``, ``/profile/me``, ``/progress/{id}``, ``/audit-logs``;
+the token must belong to an admin for the last one). Use ``--path`` to load a
+single endpoint. Each target gets one warm-up pass, then every concurrency
+level is run against each target in turn.
+
+Run uvicorn with one worker for a like-for-like comparison: sync handlers are
+capped by the threadpool (40 threads by default), async handlers by the
+database pool (``pool_size`` + ``max_overflow``).
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+import httpx
+import numpy as np
+
+PATHS = (
+    "/api/market-insights",
+    "/api/roles",
+    "/api/courses",
+    "/api/profile/me",
+    "/api/progress/{profile_id}",
+    "/api/audit-logs/",
+)
+
+
+async def _load(client: httpx.AsyncClient, paths: list[str], concurrency: int, total: int) -> dict:
+    counter = itertools.count()
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while (i := next(counter)) < total:
+            started = time.perf_counter()
+            try:
+                response = await client.get(paths[i % len(paths)])
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {"rps": total / elapsed, "p50": p50, "p95": p95, "p99": p99, "errors": errors}
+
+
+async def _run(args: argparse.Namespace) -> None:
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    paths = [p.format(profile_id=args.profile_id) for p in (args.path or PATHS)]
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+
+    clients = {}
+    for name, url in args.target:
+        clients[name] = httpx.AsyncClient(base_url=url, headers=headers, limits=limits, timeout=args.timeout)
+        await _load(clients[name], paths, 1, len(paths))  # warm caches and connections
+
+    print(f"paths={len(paths)} requests={args.requests} per level")
+    print(f"{'concurrency':>11s} {'target':10s} {'req/s':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'errors':>7s}")
+    try:
+        for concurrency in args.concurrency:
+            for name, client in clients.items():
+                r = await _load(client, paths, concurrency, args.requests)
+                print(
+                    f"{concurrency:11d} {name:10s} {r['rps']:9.1f} {r['p50']:9.1f} {r['p95']:9.1f} "
+                    f"{r['p99']:9.1f} {r['errors']:7d}"
+                )
+    finally:
+        for client in clients.values():
+            await client.aclose()
+
+
+def _target(value: str) -> tuple[str, str]:
+    name, sep, url = value.partition("=")
+    return (name, url) if sep else (value, value)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", action="append", type=_target, required=True,
+                        help="name=base_url; repeat to compare servers")
+    parser.add_argument("--token", default="", help="access token (admin, for /audit-logs)")
+    parser.add_argument("--profile-id", type=int, default=1)
+    parser.add_argument("--path", action="append", help="endpoint to load instead of the default set")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 400])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    asyncio.run(_run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Micro-benchmark of content similarity scoring across a role catalog.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.content_similarity                  # 50 seed roles + 5,000 synthetic roles
+    python -m benchmarks.content_similarity --fake-encoder   # no model download needed
+
+Compares, per user profile against every role:
+
+* ``legacy``     — the previous per-skill Python loop (category lookup and
+  user-skill lower-casing inside the loop), reproduced here as a baseline;
+* ``per-role``   — ``compute_content_similarity`` with cached weight vectors;
+* ``matrix``     — ``RoleSkillMatrix`` scoring of all roles at once.
+
+Skill embeddings are warmed first, so timings exclude model inference.
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from unittest.mock import patch
+
+import numpy as np
+
+from app.ml.taxonomy import get_skill_category
+from app.services import skill_matcher
+
+_SEED_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data", "seed")
+
+
+def _fake_encode(texts):
+    vectors = []
+    for text in texts:
+        rng = np.random.default_rng(abs(hash(text.lower())) % (2 ** 32))
+        vec = rng.standard_normal(384).astype(np.float32)
+        vectors.append(vec / np.linalg.norm(vec))
+    return np.asarray(vectors)
+
+
+def _legacy_content_similarity(user_skills, role_skills, cached_index):
+    """The pre-vectorization implementation, kept as the benchmark baseline."""
+    if not role_skills:
+        return 0.0
+    user_index, _ = cached_index
+    query = skill_matcher._encode_skills(role_skills)
+    sims, _ = user_index.search(query, 1)
+    scores = {}
+    for i, skill in enumerate(role_skills):
+        sim = float(sims[i][0])
+        if skill.lower() in [u.lower() for u in user_skills]:
+            scores[skill] = 1.0
+        elif sim >= 0.85:
+            scores[skill] = 1.0
+        elif sim >= 0.6:
+            scores[skill] = 0.5
+        else:
+            scores[skill] = 0.0
+    weighted_sum = weight_total = 0.0
+    for skill, score in scores.items():
+        w = skill_matcher.CATEGORY_WEIGHTS.get(get_skill_category(skill), 1.0)
+        weighted_sum += score * w
+        weight_total += w
+    return weighted_sum / weight_total if weight_total else 0.0
+
+
+def _catalogs(synthetic: int, seed: int = 0):
+    with open(os.path.join(_SEED_DIR, "job_roles.json")) as f:
+        roles = [(r["required_skills"], r["preferred_skills"]) for r in json.load(f)["roles"]]
+    with open(os.path.join(_SEED_DIR, "skills_taxonomy.json")) as f:
+        taxonomy = [s for c in json.load(f)["categories"] for s in c["skills"]]
+    pool = sorted({s for req, pref in roles for s in req + pref} | set(taxonomy))
+    rng = random.Random(seed)
+    synthetic_roles = [
+        (rng.sample(pool, rng.randint(5, 10)), rng.sample(pool, rng.randint(2, 5))) for _ in range(synthetic)
+    ]
+    profiles = [rng.sample(pool, rng.randint(3, 15)) for _ in range(20)]
+    return {"seed": roles, "synthetic": synthetic_roles}, profiles, pool
+
+
+def _time(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(synthetic: int, repeats: int) -> None:
+    catalogs, profiles, pool = _catalogs(synthetic)
+    skill_matcher.warmup_skill_cache([pool] + profiles)
+    indexes = [skill_matcher.build_skill_index(p) for p in profiles]
+
+    print(f"{len(profiles)} profiles; times are per profile against the whole catalog")
+    print(f"{'catalog':10s} {'roles':>6s} {'legacy ms':>10s} {'per-role ms':>12s} {'matrix ms':>10s} {'build ms':>9s}")
+    for name, roles in catalogs.items():
+        combined = [list(req) + list(pref) for req, pref in roles]
+
+        def legacy():
+            for user, index in zip(profiles, indexes):
+                for skills in combined:
+                    _legacy_content_similarity(user, skills, index)
+
+        def per_role():
+            for user, index in zip(profiles, indexes):
+                for skills in combined:
+                    skill_matcher.compute_content_similarity(user, skills, cached_index=index)
+
+        build_s = _time(lambda: skill_matcher.build_role_skill_matrix(roles), 1)
+        matrix = skill_matcher.build_role_skill_matrix(roles)
+
+        def batched():
+            scores = skill_matcher.score_profiles_against_matrix(matrix, profiles)
+            skill_matcher.matrix_content_scores(matrix, scores)
+
+        per_profile = 1000 / len(profiles)
+        print(
+            f"{name:10s} {len(roles):6d} {_time(legacy, repeats) * per_profile:10.2f} "
+            f"{_time(per_role, repeats) * per_profile:12.2f} {_time(batched, repeats) * per_profile:10.3f} "
+            f"{build_s * 1000:9.1f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=5000, help="Roles in the synthetic catalog")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--fake-encoder", action="store_true", help="Random vectors instead of the model")
+    args = parser.parse_args(argv)
+
+    if args.fake_encoder:
+        with patch("app.services.skill_matcher.encode_texts", _fake_encode):
+            run(args.synthetic, args.repeats)
+    else:
+        run(args.synthetic, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Encoder throughput (texts/sec) and parity per inference backend.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.encoder_throughput
+    python -m benchmarks.encoder_throughput --backends torch onnx-int8 --threads 1
+
+Texts are the seed role skills and descriptions, so lengths match the resume /
+JD paths. Each backend is compared with the PyTorch embeddings (minimum cosine
+similarity over all texts).
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.ml.embeddings import ENCODER_BACKENDS, load_model
+
+_SEED_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data", "seed")
+BATCH_SIZES = (1, 8, 64)
+
+
+def _texts(limit: int) -> list[str]:
+    with open(os.path.join(_SEED_DIR, "job_roles.json")) as f:
+        roles = json.load(f)["roles"]
+    texts = []
+    for role in roles:
+        texts += role.get("required_skills", []) + role.get("preferred_skills", [])
+        if role.get("description"):
+            texts.append(role["description"])
+    texts = list(dict.fromkeys(texts))
+    return (texts * (limit // max(len(texts), 1) + 1))[:limit]
+
+
+def _throughput(model, texts: list[str], batch_size: int, repeats: int) -> float:
+    model.encode(texts[:batch_size], batch_size=batch_size, normalize_embeddings=True)  # warm up
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for i in range(0, len(texts), batch_size):
+            model.encode(texts[i:i + batch_size], batch_size=batch_size, normalize_embeddings=True)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=list(ENCODER_BACKENDS), choices=ENCODER_BACKENDS)
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=settings.encoder_num_threads)
+    args = parser.parse_args(argv)
+
+    settings.encoder_num_threads = args.threads
+    texts = _texts(args.texts)
+    reference = None
+    print(f"texts={len(texts)} threads={args.threads or 'default'}")
+    print(f"{'backend':10s} " + " ".join(f"{'bs=' + str(b):>10s}" for b in BATCH_SIZES) + "  min_cos_vs_torch")
+
+    for backend in args.backends:
+        try:
+            model = load_model(backend)
+        except Exception as e:
+            print(f"{backend:10s} unavailable: {e}")
+            continue
+        rates = [_throughput(model, texts, b, args.repeats) for b in BATCH_SIZES]
+        embeddings = np.asarray(model.encode(texts, normalize_embeddings=True), dtype=np.float32)
+        if reference is None and backend == "torch":
+            reference = embeddings
+        parity = f"{float(np.min(np.sum(embeddings * reference, axis=1))):.4f}" if reference is not None else "n/a"
+        print(f"{backend:10s} " + " ".join(f"{r:10.1f}" for r in rates) + f"  {parity}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Recall / agreement of quantized embedding indexes against the exact flat index.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.index_recall                      # seed taxonomy + role skills
+    python -m benchmarks.index_recall --synthetic 20000    # random corpus, no model needed
+    python -m benchmarks.index_recall --modes sq8 --tolerance 0.005
+
+For each mode it reports recall@1, similarity deviation, how often
+``normalize_skills`` (threshold 0.75) and ``match_skills`` (0.6 / 0.85 bands)
+would return a different result than with the flat index, the int8 role-matrix
+disagreement, index size and search time. Exits non-zero if any disagreement
+rate exceeds the tolerance (default ``EMBEDDING_INDEX_TOLERANCE``).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.ml.indexes import INDEX_MODES, build_index, index_nbytes, quantize_rows
+
+_SEED_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data", "seed")
+
+
+def _bands(sims: np.ndarray, partial: float = 0.6, strong: float = 0.85) -> np.ndarray:
+    return (sims >= partial).astype(np.int8) + (sims >= strong)
+
+
+def _seed_vectors() -> tuple[np.ndarray, np.ndarray]:
+    from app.ml.embeddings import encode_texts
+
+    with open(os.path.join(_SEED_DIR, "skills_taxonomy.json")) as f:
+        taxonomy = [s for c in json.load(f)["categories"] for s in c["skills"]]
+    with open(os.path.join(_SEED_DIR, "job_roles.json")) as f:
+        roles = json.load(f)["roles"]
+    queries = list(dict.fromkeys(
+        s for r in roles for s in r.get("required_skills", []) + r.get("preferred_skills", [])
+    ))
+    # Lower-cased / abbreviated variants exercise the near-threshold region
+    queries += [q.lower() for q in queries] + [q.split()[0] for q in queries if " " in q]
+    return encode_texts(taxonomy), encode_texts(queries)
+
+
+def _synthetic_vectors(n: int, n_queries: int, dim: int = 384, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    corpus = rng.standard_normal((n, dim)).astype(np.float32)
+    corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+    # Queries are noisy copies of corpus rows, spread across all similarity bands
+    picks = rng.integers(0, n, n_queries)
+    noise = rng.uniform(0.2, 1.5, (n_queries, 1)).astype(np.float32)
+    queries = corpus[picks] + noise * rng.standard_normal((n_queries, dim)).astype(np.float32) / np.sqrt(dim)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return corpus, queries
+
+
+def evaluate(corpus: np.ndarray, queries: np.ndarray, mode: str, threshold: float = 0.75) -> dict:
+    exact = build_index(corpus, "flat")
+    approx = build_index(corpus, mode)
+    exact_scores, exact_ids = exact.search(queries, 1)
+    start = time.perf_counter()
+    approx_scores, approx_ids = approx.search(queries, 1)
+    search_ms = (time.perf_counter() - start) * 1000
+
+    fs, fi, aps, ai = exact_scores[:, 0], exact_ids[:, 0], approx_scores[:, 0], approx_ids[:, 0]
+    # normalize_skills: canonical skill when above threshold, else the input text
+    same_normalized = np.where(fs >= threshold, (aps >= threshold) & (ai == fi), aps < threshold)
+
+    codes, scales = quantize_rows(corpus)
+    exact_sims = corpus @ queries.T
+    approx_sims = (codes @ queries.T) * scales[:, None]
+
+    return {
+        "mode": type(approx).__name__ if mode != "flat" else "flat",
+        "recall@1": float(np.mean(ai == fi)),
+        "mean_abs_score_dev": float(np.mean(np.abs(aps - fs))),
+        "max_abs_score_dev": float(np.max(np.abs(aps - fs))),
+        "normalize_disagreement": float(1 - np.mean(same_normalized)),
+        "match_disagreement": float(np.mean(_bands(fs) != _bands(aps))),
+        "matrix_disagreement": float(np.mean(_bands(exact_sims) != _bands(approx_sims))),
+        "index_bytes": index_nbytes(approx),
+        "flat_bytes": index_nbytes(exact),
+        "search_ms": round(search_ms, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=[m for m in INDEX_MODES if m != "flat"], choices=INDEX_MODES)
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N random corpus vectors instead of the seed data")
+    parser.add_argument("--queries", type=int, default=2000, help="Query count for --synthetic")
+    parser.add_argument("--tolerance", type=float, default=settings.embedding_index_tolerance)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        corpus, queries = _synthetic_vectors(args.synthetic, args.queries)
+    else:
+        corpus, queries = _seed_vectors()
+    corpus = np.ascontiguousarray(corpus, dtype=np.float32)
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    print(f"corpus={corpus.shape[0]} queries={queries.shape[0]} dim={corpus.shape[1]} tolerance={args.tolerance}")
+
+    failed = False
+    for mode in args.modes:
+        report = evaluate(corpus, queries, mode)
+        worst = max(report["normalize_disagreement"], report["match_disagreement"], report["matrix_disagreement"])
+        ok = worst <= args.tolerance
+        failed |= not ok
+        ratio = report["flat_bytes"] / max(report["index_bytes"], 1)
+        print(f"\n[{mode}] {'OK' if ok else 'EXCEEDS TOLERANCE'}  ({ratio:.1f}x smaller than flat)")
+        for key, value in report.items():
+            print(f"  {key:24s} {value:.4f}" if isinstance(value, float) else f"  {key:24s} {value}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Sweep skill-normalization thresholds against a labeled file.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.normalization_calibration
+    python -m benchmarks.normalization_calibration --labels my_labels.json --tiers embedding
+
+Every input is encoded and searched once; each threshold is then evaluated on
+the stored top-1 scores. With ``--tiers all`` (default) the exact / alias /
+fuzzy tiers resolve inputs first and only the rest depend on the threshold,
+matching ``normalize_skills``. Prints precision, recall and F1 per threshold
+and the best-F1 value to use for ``SKILL_MATCH_THRESHOLD``.
+
+Labels file: ``{"labels": {"<input>": "<canonical skill>" | null}}``.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+_DEFAULT_LABELS = os.path.join(os.path.dirname(__file__), "data", "skill_normalization_labels.json")
+
+
+def _metrics(predicted: list[str | None], expected: list[str | None]) -> tuple[float, float, float]:
+    made = sum(p is not None for p in predicted)
+    correct = sum(p is not None and p == e for p, e in zip(predicted, expected))
+    positives = sum(e is not None for e in expected)
+    precision = correct / made if made else 1.0
+    recall = correct / positives if positives else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--labels", default=_DEFAULT_LABELS)
+    parser.add_argument("--tiers", choices=("all", "embedding"), default="all")
+    parser.add_argument("--start", type=float, default=0.40)
+    parser.add_argument("--stop", type=float, default=0.95)
+    parser.add_argument("--step", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    from app.ml.embeddings import encode_texts
+    from app.ml.taxonomy import get_normalizer, get_taxonomy_index
+
+    with open(args.labels) as f:
+        labels: dict[str, str | None] = json.load(f)["labels"]
+    inputs, expected = list(labels), list(labels.values())
+
+    start = time.perf_counter()
+    index, skills = get_taxonomy_index()
+    normalizer = get_normalizer()
+    setup_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    string_hits = [normalizer.lookup(t) if args.tiers == "all" else (None, "embedding") for t in inputs]
+    lookup_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    queries = np.asarray(encode_texts(inputs), dtype=np.float32)
+    encode_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    scores, indices = index.search(queries, 1)
+    search_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(inputs)} labeled inputs ({sum(e is not None for e in expected)} positive), tiers={args.tiers}")
+    print(f"setup {setup_s:.2f}s, string tiers {lookup_ms:.1f}ms, encode {encode_ms:.1f}ms, search {search_ms:.2f}ms")
+    resolved_by_string = sum(tier != "embedding" for _, tier in string_hits)
+    if args.tiers == "all":
+        print(f"resolved by string tiers: {resolved_by_string}")
+
+    print(f"\n{'threshold':>9s} {'precision':>9s} {'recall':>7s} {'f1':>6s}")
+    best = (-1.0, 0.0)
+    for threshold in np.arange(args.start, args.stop + 1e-9, args.step):
+        predicted = [
+            canonical if tier != "embedding"
+            else (skills[indices[i][0]] if scores[i][0] >= threshold else None)
+            for i, (canonical, tier) in enumerate(string_hits)
+        ]
+        precision, recall, f1 = _metrics(predicted, expected)
+        best = max(best, (f1, -threshold))
+        print(f"{threshold:9.2f} {precision:9.3f} {recall:7.3f} {f1:6.3f}")
+    print(f"\nbest F1 {best[0]:.3f} at threshold {-best[1]:.2f} (SKILL_MATCH_THRESHOLD)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Roadmap course selection: per-skill greedy vs the set-cover optimizer.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.roadmap_optimizer
+    python -m benchmarks.roadmap_optimizer --courses 200 2000 10000 --skills 8 12 30
+
+Builds random catalogs (no database or model needed) and reports, per catalog
+size and number of gap skills, the nett fee and weeks of the course set each
+strategy picks, how many courses it takes and the selection time. ``exact``
+says whether the optimizer proved its answer optimal or used its greedy cover.
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from app.services.roadmap_generator import _pick_optimal, _pick_per_skill
+from app.services.subsidy_calculator import calculate_subsidies
+
+_VOCAB = [f"Skill {i}" for i in range(120)]
+
+
+def _catalog(n: int, rng: random.Random) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=i, title=f"Course {i}", skills_taught=rng.sample(_VOCAB, rng.randint(1, 5)),
+            course_fee=rng.choice([0, 500, 1200, 2500, 4000, 8000]), subsidy_percent=70, mces_eligible=False,
+            duration_weeks=rng.randint(1, 12),
+        )
+        for i in range(n)
+    ]
+
+
+def _totals(picks) -> tuple[float, int, int]:
+    courses = [course for _, _, course in picks]
+    fee = sum(calculate_subsidies(c)["nett_payable"] for c in courses)
+    return round(fee, 2), sum(c.duration_weeks for c in courses), len(courses)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, nargs="+", default=[200, 2000, 10000])
+    parser.add_argument("--skills", type=int, nargs="+", default=[6, 12, 30])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'courses':>8} {'skills':>6} {'strategy':>9} {'nett $':>10} {'weeks':>6} {'n':>3} {'ms':>8}  exact")
+    for n_courses in args.courses:
+        rng = random.Random(args.seed)
+        catalog = _catalog(n_courses, rng)
+        for n_skills in args.skills:
+            gap_skills = [(s, 1 + i * 5 // n_skills) for i, s in enumerate(rng.sample(_VOCAB, n_skills))]
+            wanted = {s.lower() for s, _ in gap_skills}
+            candidates = [c for c in catalog if any(s.lower() in wanted for s in c.skills_taught)]
+
+            start = time.perf_counter()
+            picks = _pick_per_skill(gap_skills, candidates)
+            ms = (time.perf_counter() - start) * 1000
+            fee, weeks, count = _totals(picks)
+            print(f"{n_courses:>8} {n_skills:>6} {'greedy':>9} {fee:>10.2f} {weeks:>6} {count:>3} {ms:>8.2f}")
+
+            for objective in ("fee", "weeks"):
+                start = time.perf_counter()
+                picks, exact = _pick_optimal(gap_skills, candidates, objective, False)
+                ms = (time.perf_counter() - start) * 1000
+                fee, weeks, count = _totals(picks)
+                print(f"{'':>8} {'':>6} {objective:>9} {fee:>10.2f} {weeks:>6} {count:>3} {ms:>8.2f}  {exact}")
+
+
+if __name__ == "__main__":
+    main()
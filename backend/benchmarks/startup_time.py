@@ -0,0 +1,99 @@
+"""Startup-time benchmark: cold import cost and time to /health and /ready.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.startup_time                      # cold import of app.main
+    python -m benchmarks.startup_time --max-import 3.0     # fail on regression
+    python -m benchmarks.startup_time --url http://localhost:8000   # poll a server that is starting
+
+Import mode runs ``import app.main`` in fresh interpreters and fails if any
+heavy ML / PDF / LLM module gets imported eagerly. URL mode polls ``/health``
+and ``/ready`` and prints the per-stage warmup timings.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+HEAVY_MODULES = ("sentence_transformers", "torch", "transformers", "faiss", "reportlab", "google.generativeai", "spacy")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_import(runs: int) -> tuple[list[float], set[str]]:
+    times, heavy = [], set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result["seconds"])
+        heavy.update(result["heavy"])
+    return times, heavy
+
+
+def _get(url: str) -> tuple[int, dict]:
+    try:
+        with urllib.request.urlopen(url, timeout=2) as resp:
+            return resp.status, json.loads(resp.read() or b"{}")
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def poll_server(base_url: str, timeout: float) -> int:
+    start = time.perf_counter()
+    health_at = None
+    while time.perf_counter() - start < timeout:
+        try:
+            if health_at is None and _get(f"{base_url}/health")[0] == 200:
+                health_at = time.perf_counter() - start
+                print(f"/health ok after {health_at:.2f}s")
+            if health_at is not None:
+                status, body = _get(f"{base_url}/ready")
+                if status == 200:
+                    print(f"/ready ok after {time.perf_counter() - start:.2f}s")
+                    for stage in body.get("stages", []):
+                        print(f"  {stage['name']:16s} {stage['status']:8s} {stage['seconds']}s  {stage['detail'] or ''}")
+                    return 0
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.1)
+    print(f"server not ready after {timeout}s")
+    return 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-import", type=float, default=0.0, help="Fail if median import time exceeds this (s)")
+    parser.add_argument("--url", help="Poll a starting server instead of measuring imports")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args(argv)
+
+    if args.url:
+        return poll_server(args.url.rstrip("/"), args.timeout)
+
+    times, heavy = measure_import(args.runs)
+    median = statistics.median(times)
+    print(f"import app.main: median {median:.2f}s over {len(times)} runs ({', '.join(f'{t:.2f}' for t in times)})")
+    failed = False
+    if heavy:
+        print(f"eagerly imported heavy modules: {', '.join(sorted(heavy))}")
+        failed = True
+    if args.max_import and median > args.max_import:
+        print(f"median import time exceeds {args.max_import:.2f}s")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
+from contextlib import contextmanager
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.database import Base
@@ -23,8 +25,13 @@ def db_session():
     # Store tenant_id for fixtures to use
     session._test_tenant_id = tenant.id
 
+    # Reference-data snapshots are per process; don't carry them across test databases
+    from app.services.reference_data import reference_data
+    reference_data.clear()
+
     yield session
     session.close()
+    reference_data.clear()
 
 
 @pytest.fixture
@@ -56,3 +63,41 @@ def sample_role(db_session):
         "salary_range": "SGD 5,000 - 8,000",
         "tenant_id": db_session._test_tenant_id,
     }
+
+
+class QueryCounter:
+    """SQL statements executed on an engine while counting."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def assert_at_most(self, budget: int, label: str = "") -> None:
+        if self.count > budget:
+            listing = "\n".join(f"  {i + 1}. {' '.join(s.split())[:160]}" for i, s in enumerate(self.statements))
+            pytest.fail(f"{label or 'block'} ran {self.count} SQL statements, budget is {budget}:\n{listing}")
+
+
+@pytest.fixture
+def count_queries():
+    """``with count_queries(engine, ...) as q: ...`` records every statement sent to the engines."""
+
+    @contextmanager
+    def _count(*binds):
+        counter = QueryCounter()
+
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            counter.statements.append(statement)
+
+        for bind in binds:
+            event.listen(bind, "before_cursor_execute", _before)
+        try:
+            yield counter
+        finally:
+            for bind in binds:
+                event.remove(bind, "before_cursor_execute", _before)
+
+    return _count
@@ -0,0 +1,15 @@
+"""Shared test doubles."""
+
+import numpy as np
+
+
+def mock_encode(texts, normalize_embeddings=True):
+    """Deterministic stand-in for ``SentenceTransformer.encode``: same text (any case), same unit vector."""
+    embeddings = []
+    for text in texts:
+        seed = sum(ord(c) for c in text.lower())
+        local_rng = np.random.RandomState(seed)
+        vec = local_rng.randn(384).astype(np.float32)
+        vec = vec / np.linalg.norm(vec)
+        embeddings.append(vec)
+    return np.array(embeddings)
@@ -0,0 +1,85 @@
+"""Tests for the per-request profile analysis context."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.models.job_role import JobRole
+from app.models.sctp_course import SCTPCourse
+from app.models.user_profile import UserProfile
+from tests.helpers import mock_encode
+
+
+@pytest.fixture
+def seeded(db_session, sample_profile, sample_role):
+    from app.services.skill_index import skill_index
+
+    skill_index.clear()
+    tenant_id = db_session._test_tenant_id
+    db_session.add_all([
+        JobRole(**sample_role),
+        JobRole(**{**sample_role, "title": "ML Engineer", "required_skills": ["Python", "PyTorch", "Kubernetes"]}),
+        SCTPCourse(title="Spark Basics", provider="NUS", duration_weeks=4, level="beginner", course_fee=1000,
+                   skills_taught=["Spark", "Kafka"], tenant_id=None),
+        SCTPCourse(title="Airflow Pipelines", provider="NTU", duration_weeks=3, level="intermediate", course_fee=800,
+                   skills_taught=["Airflow", "dbt"], tenant_id=tenant_id),
+        SCTPCourse(title="Deep Learning", provider="SMU", duration_weeks=6, level="advanced", course_fee=2000,
+                   skills_taught=["PyTorch", "Kubernetes"], tenant_id=tenant_id),
+    ])
+    profile = UserProfile(**sample_profile)
+    db_session.add(profile)
+    db_session.commit()
+    yield db_session, tenant_id, profile
+    skill_index.clear()
+
+
+@patch("app.services.skill_matcher.get_skill_category", return_value="technical")
+@patch("app.ml.embeddings.get_model")
+def test_each_stage_runs_once_and_matches_separate_calls(mock_model, mock_category, seeded):
+    mock_model.return_value.encode = mock_encode
+    from app.services import analysis_context
+    from app.services.analysis_context import ProfileAnalysisContext
+    from app.services.course_pathways import generate_learning_pathways
+    from app.services.gap_analyzer import analyze_gaps
+    from app.services.recommender import get_recommendations
+    from app.services.roadmap_generator import generate_roadmap
+
+    db, tenant_id, profile = seeded
+    context = ProfileAnalysisContext(profile, db, tenant_id)
+    with patch.object(analysis_context, "get_recommendations", wraps=get_recommendations) as recs_spy, \
+         patch.object(analysis_context, "analyze_gaps", wraps=analyze_gaps) as gaps_spy, \
+         patch("app.services.roadmap_generator.analyze_gaps") as roadmap_gaps:
+        recs = context.recommendations(3)
+        assert context.recommendations(1) == recs[:1]
+        gaps = context.gaps
+        roadmap = context.roadmap()
+        assert context.roadmap() is roadmap
+        pathways = context.pathways
+    recs_spy.assert_called_once()
+    gaps_spy.assert_called_once()
+    roadmap_gaps.assert_not_called()
+
+    assert recs == get_recommendations(profile, db, tenant_id=tenant_id, top_n=3)
+    assert gaps == analyze_gaps(profile, db, tenant_id=tenant_id)
+    assert roadmap.items == generate_roadmap(profile, db, tenant_id=tenant_id)
+    assert pathways and pathways == generate_learning_pathways(context.missing_skills(), db, tenant_id=tenant_id)
+
+
+@patch("app.services.skill_matcher.get_skill_category", return_value="technical")
+@patch("app.ml.embeddings.get_model")
+def test_fresh_materialized_row_skips_scoring(mock_model, mock_category, seeded):
+    mock_model.return_value.encode = mock_encode
+    from app.services import analysis_context
+    from app.services.analysis_context import ProfileAnalysisContext
+    from app.services.materializer import materialize_tenant
+
+    db, tenant_id, profile = seeded
+    materialize_tenant(db, tenant_id)
+    context = ProfileAnalysisContext(profile, db, tenant_id)
+    with patch.object(analysis_context, "get_recommendations") as recs_spy, \
+         patch.object(analysis_context, "analyze_gaps") as gaps_spy:
+        assert context.recommendations(3)
+        assert context.gaps
+        assert context.roadmap().items
+    recs_spy.assert_not_called()
+    gaps_spy.assert_not_called()
@@ -0,0 +1,187 @@
+"""Tests for the read endpoints served on the async session (get_async_db)."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.auth import create_access_token
+from app.database import Base, async_database_url, get_async_db, get_db
+from app.main import app
+from app.models.api_key import APIKey
+from app.models.audit_log import AuditLog
+from app.models.market_insight import MarketInsight
+from app.models.sctp_course import SCTPCourse
+from app.models.skill_progress import SkillProgress
+from app.models.tenant import Tenant
+from app.models.user import Role, User
+from app.models.user_profile import UserProfile
+from app.services.reference_data import reference_data
+from app.services.skill_index import skill_index
+
+_DB = "file:async_endpoints?mode=memory&cache=shared&uri=true"
+engine = create_engine(f"sqlite:///{_DB}", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{_DB}", poolclass=NullPool)
+TestSession = sessionmaker(bind=engine)
+AsyncTestSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+ASYNC_ROUTES = {
+    "/api/market-insights", "/api/roles", "/api/courses", "/api/profile/me",
+    "/api/progress/{profile_id}", "/api/audit-logs/",
+}
+
+
+def _get_db():
+    db = TestSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def _get_async_db():
+    async with AsyncTestSession() as db:
+        yield db
+
+
+@pytest.fixture
+def api():
+    previous = {dep: app.dependency_overrides.get(dep) for dep in (get_db, get_async_db)}
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_async_db] = _get_async_db
+    Base.metadata.create_all(bind=engine)
+    reference_data.clear()
+    skill_index.clear()
+
+    db = TestSession()
+    tenant, other = Tenant(name="Async"), Tenant(name="Elsewhere")
+    db.add_all([tenant, other])
+    db.flush()
+    admin = User(email="admin@example.com", hashed_password="-", name="Admin", tenant_id=tenant.id, role=Role.ADMIN)
+    member = User(email="member@example.com", hashed_password="-", name="Member", tenant_id=tenant.id)
+    db.add_all([admin, member])
+    db.flush()
+    profile = UserProfile(name="Member", skills=["Python"], years_experience=1, tenant_id=tenant.id, user_id=member.id)
+    db.add(profile)
+    db.flush()
+    db.add_all([
+        SkillProgress(profile_id=profile.id, skill="SQL", level=0.5, tenant_id=tenant.id),
+        SkillProgress(profile_id=profile.id, skill="Spark", level=1.0, tenant_id=tenant.id),
+        SCTPCourse(title="Spark Basics", provider="NUS", skills_taught=["Apache Spark"], level="beginner",
+                   course_fee=1000, tenant_id=None),
+        SCTPCourse(title="Airflow", provider="NTU", skills_taught=["Airflow"], tenant_id=tenant.id),
+        SCTPCourse(title="Theirs", provider="SMU", skills_taught=["Spark"], tenant_id=other.id),
+        MarketInsight(role_category="Data", trending_skills=["Spark", "dbt"], avg_salary_sgd=7000,
+                      demand_level="high", hiring_volume=100, yoy_growth_pct=5.0, tenant_id=None),
+        AuditLog(tenant_id=tenant.id, user_id=admin.id, action="user.login"),
+        AuditLog(tenant_id=other.id, user_id=None, action="user.login"),
+        APIKey(tenant_id=tenant.id, key="read-key", name="dashboard"),
+    ])
+    db.commit()
+    tokens = {
+        user.role: {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)}, tenant.id)}"}
+        for user in (admin, member)
+    }
+    profile_id = profile.id
+    db.close()
+
+    yield TestClient(app), tokens[Role.ADMIN], tokens[Role.MEMBER], profile_id
+
+    Base.metadata.drop_all(bind=engine)
+    reference_data.clear()
+    skill_index.clear()
+    for dep, override in previous.items():
+        if override is None:
+            app.dependency_overrides.pop(dep, None)
+        else:
+            app.dependency_overrides[dep] = override
+
+
+def test_read_endpoints_are_coroutines():
+    endpoints = {route.path: route.endpoint for route in app.routes if getattr(route, "methods", None) == {"GET"}}
+    assert all(asyncio.iscoroutinefunction(endpoints[path]) for path in ASYNC_ROUTES)
+
+
+def test_async_database_url_picks_the_async_driver():
+    assert async_database_url("postgresql://u:p%40ss@db:5432/app") == "postgresql+asyncpg://u:p%40ss@db:5432/app"
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u@db/app")
+
+
+def test_reference_endpoints(api):
+    client, admin, member, _ = api
+    assert [r["title"] for r in client.get("/api/roles", headers=member).json()] == []
+
+    market = client.get("/api/market-insights", headers={"X-API-Key": "read-key"})
+    assert market.status_code == 200
+    assert market.json()["top_skills_overall"] == ["Spark", "dbt"]
+    assert client.get("/api/market-insights").status_code == 401
+    assert client.get("/api/market-insights", headers={"X-API-Key": "wrong"}).status_code == 401
+
+    courses = client.get("/api/courses", headers=member).json()
+    assert sorted(c["title"] for c in courses["courses"]) == ["Airflow", "Spark Basics"]
+    spark = client.get("/api/courses", params={"skill": "spark"}, headers=member).json()
+    assert [c["title"] for c in spark["courses"]] == ["Spark Basics"]
+    assert spark["courses"][0]["nett_payable"] < 1000
+
+
+def test_profile_and_progress_are_scoped_to_the_user(api):
+    client, admin, member, profile_id = api
+    assert client.get("/api/profile/me", headers=member).json()["id"] == profile_id
+    assert client.get("/api/profile/me", headers=admin).status_code == 404
+    assert client.get("/api/profile/me").status_code == 401
+
+    progress = client.get(f"/api/progress/{profile_id}", headers=member).json()
+    assert (progress["skills_acquired"], progress["skills_in_progress"], progress["skills_total"]) == (1, 1, 2)
+    assert client.get(f"/api/progress/{profile_id}", headers=admin).status_code == 404
+
+
+def test_audit_logs_are_admin_only_and_tenant_scoped(api):
+    client, admin, member, _ = api
+    logs = client.get("/api/audit-logs/", headers=admin)
+    assert logs.status_code == 200
+    assert [entry["action"] for entry in logs.json()] == ["user.login"]
+    assert client.get("/api/audit-logs/", headers=member).status_code == 403
+
+
+def test_cache_version_checks_run_off_the_event_loop(api):
+    from app.services.recommendation_cache import recommendation_cache
+
+    client, _, member, _ = api
+    generations = recommendation_cache.generations
+    on_loop = []
+
+    def checked(keys):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(keys)
+        except RuntimeError:
+            pass
+        return generations(keys)
+
+    with patch.object(recommendation_cache, "generations", side_effect=checked) as spy:
+        assert client.get("/api/roles", headers=member).status_code == 200
+        assert client.get("/api/market-insights", headers=member).status_code == 200
+        assert client.get("/api/courses", params={"skill": "spark"}, headers=member).status_code == 200
+    assert spy.call_count >= 3
+    assert on_loop == []
+
+
+def test_reference_endpoints_only_use_the_async_session(api):
+    client, _, member, _ = api
+
+    def no_sync_session():
+        raise AssertionError("sync session opened")
+        yield
+
+    app.dependency_overrides[get_db] = no_sync_session
+    assert [r["title"] for r in client.get("/api/roles", headers=member).json()] == []
+    assert client.get("/api/market-insights", headers=member).json()["top_skills_overall"] == ["Spark", "dbt"]
+    spark = client.get("/api/courses", params={"skill": "spark"}, headers=member).json()
+    assert [c["title"] for c in spark["courses"]] == ["Spark Basics"]
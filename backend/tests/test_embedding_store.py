@@ -0,0 +1,87 @@
+"""Tests for the shared on-disk embedding store."""
+
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+
+from tests.helpers import mock_encode
+
+
+def test_store_roundtrip_across_instances(tmp_path):
+    """Vectors written by one store instance are visible to another (e.g. another worker)."""
+    from app.ml.embedding_store import EmbeddingStore, text_key
+
+    writer = EmbeddingStore(tmp_path, "test-model")
+    keys = [text_key("test-model", t) for t in ["Python", "SQL"]]
+    vectors = mock_encode(["Python", "SQL"])
+    writer.put_many(keys, vectors)
+
+    reader = EmbeddingStore(tmp_path, "test-model")
+    found = reader.get_many(keys + [text_key("test-model", "Go")])
+    assert set(found) == set(keys)
+    np.testing.assert_allclose(found[keys[0]], vectors[0])
+
+
+def test_text_key_normalizes_whitespace():
+    from app.ml.embedding_store import text_key
+
+    assert text_key("m", "  Machine   Learning ") == text_key("m", "Machine Learning")
+    assert text_key("m", "Python") != text_key("other", "Python")
+
+
+def test_encode_texts_only_encodes_misses(tmp_path):
+    from app.ml import embeddings
+    from app.ml.embedding_store import _store_registry
+
+    model = MagicMock()
+    model.encode.side_effect = mock_encode
+    with patch.object(embeddings.settings, "embedding_store_dir", str(tmp_path)), \
+         patch("app.ml.embeddings.get_model", return_value=model):
+        first = embeddings.encode_texts(["Python", "SQL", "Python"])
+        second = embeddings.encode_texts(["SQL", "Docker"])
+    _store_registry.clear()
+
+    assert first.shape == (3, 384)
+    np.testing.assert_allclose(first[0], first[2])
+    np.testing.assert_allclose(first[1], second[0], rtol=1e-6)
+    encoded = [call.args[0] for call in model.encode.call_args_list]
+    assert encoded == [["Python", "SQL"], ["Docker"]]
+
+
+def test_store_is_namespaced_by_encoder_runtime(tmp_path):
+    from app.ml import embeddings
+    from app.ml.embedding_store import _store_registry
+
+    model = MagicMock()
+    model.encode.side_effect = mock_encode
+    with patch.object(embeddings.settings, "embedding_store_dir", str(tmp_path)), \
+         patch("app.ml.embeddings.get_model", return_value=model), \
+         patch.object(embeddings, "_model_backend", None):
+        with patch.object(embeddings.settings, "encoder_backend", "torch"):
+            embeddings.encode_texts(["Python"])
+            embeddings.encode_texts(["Python"])
+        with patch.object(embeddings.settings, "encoder_backend", "onnx-int8"):
+            assert embeddings.encoder_identity().endswith("@onnx-int8:onnx/model_quint8_avx2.onnx")
+            embeddings.encode_texts(["Python"])
+        # A worker that fell back to torch reads and writes the torch namespace
+        with patch.object(embeddings.settings, "encoder_backend", "onnx-int8"), \
+             patch.object(embeddings, "_model_backend", "torch"):
+            embeddings.encode_texts(["Python"])
+    _store_registry.clear()
+
+    assert [call.args[0] for call in model.encode.call_args_list] == [["Python"], ["Python"]]
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_snapshot_key_changes_with_encoder_runtime():
+    from app.ml import embeddings
+    from app.ml.snapshots import snapshot_key
+
+    with patch.object(embeddings, "_model_backend", None):
+        with patch.object(embeddings.settings, "encoder_backend", "torch"):
+            torch_key = snapshot_key("taxonomy", "abc")
+        with patch.object(embeddings.settings, "encoder_backend", "onnx"):
+            onnx_key = snapshot_key("taxonomy", "abc")
+            with patch.object(embeddings.settings, "encoder_onnx_file", "onnx/model_O4.onnx"):
+                assert snapshot_key("taxonomy", "abc") not in (torch_key, onnx_key)
+    assert torch_key != onnx_key
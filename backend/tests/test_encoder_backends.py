@@ -0,0 +1,52 @@
+"""Tests for the pluggable sentence-transformer inference backend."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+
+def _load_or_skip(backend):
+    from app.ml.embeddings import load_model
+
+    try:
+        return load_model(backend)
+    except Exception as e:
+        pytest.skip(f"{backend} model unavailable: {e}")
+
+
+def test_onnx_backend_loads_onnx_model():
+    from app.ml import embeddings
+
+    with patch("sentence_transformers.SentenceTransformer") as st:
+        embeddings.load_model("onnx-int8")
+    kwargs = st.call_args.kwargs
+    assert kwargs["backend"] == "onnx"
+    assert kwargs["model_kwargs"]["file_name"] == "onnx/model_quint8_avx2.onnx"
+
+
+def test_get_model_falls_back_to_torch():
+    from app.ml import embeddings
+
+    def fake_st(name, device="cpu", backend="torch", model_kwargs=None):
+        if backend == "onnx":
+            raise Exception("optimum not installed")
+        return object()
+
+    with patch("sentence_transformers.SentenceTransformer", side_effect=fake_st), \
+         patch.object(embeddings.settings, "encoder_backend", "onnx"), \
+         patch.object(embeddings, "_model", None), \
+         patch.object(embeddings, "_model_backend", None):
+        model = embeddings.get_model()
+        assert model is not None
+        assert embeddings.get_encoder_backend() == "torch"
+
+
+@pytest.mark.parametrize("backend,min_cosine", [("onnx", 0.999), ("onnx-int8", 0.97)])
+def test_onnx_embeddings_match_torch(backend, min_cosine):
+    pytest.importorskip("optimum.onnxruntime")
+    texts = ["Python", "Machine Learning", "Stakeholder management", "Built ETL pipelines with Spark and Airflow"]
+    reference = np.asarray(_load_or_skip("torch").encode(texts, normalize_embeddings=True))
+    candidate = np.asarray(_load_or_skip(backend).encode(texts, normalize_embeddings=True))
+    assert candidate.shape == reference.shape
+    assert np.min(np.sum(candidate * reference, axis=1)) >= min_cosine
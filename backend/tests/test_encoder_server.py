@@ -0,0 +1,71 @@
+"""Tests for the Unix-socket encoder sidecar and its in-process fallback."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tests.helpers import mock_encode
+
+
+def test_remote_encode_roundtrip_and_fallback(tmp_path):
+    from app.ml import embeddings
+    from app.ml.encoder_server import EncoderServer
+
+    path = str(tmp_path / "encoder.sock")
+    server_model = MagicMock()
+    server_model.encode.side_effect = mock_encode
+    local_model = MagicMock()
+    local_model.encode.side_effect = mock_encode
+
+    server = EncoderServer(path, server_model.encode, "sidecar-model@onnx-int8:x.onnx")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with patch.object(embeddings.settings, "encoder_socket", path), \
+         patch.object(embeddings.settings, "encoder_batching_enabled", False), \
+         patch.object(embeddings, "_remote", None), \
+         patch.object(embeddings, "_encode_local", local_model.encode):
+        remote = embeddings.encode_texts(["Python", "SQL"])
+        server.shutdown()
+        server.server_close()
+        embeddings._remote._reset()
+        fallback = embeddings.encode_texts(["Docker"])
+
+    np.testing.assert_allclose(remote, mock_encode(["Python", "SQL"]), rtol=1e-6)
+    np.testing.assert_allclose(fallback, mock_encode(["Docker"]), rtol=1e-6)
+    assert server_model.encode.call_count == 1
+    assert local_model.encode.call_count == 1
+
+
+def test_vectors_are_namespaced_by_the_encoder_that_produced_them(tmp_path):
+    from app.ml import embeddings
+    from app.ml.embedding_store import get_store, text_key
+    from app.ml.encoder_server import EncoderServer
+
+    path = str(tmp_path / "encoder.sock")
+    sidecar = "sidecar-model@onnx-int8:x.onnx"
+    server = EncoderServer(path, mock_encode, sidecar)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    store_dir = str(tmp_path / "store")
+    with patch.object(embeddings.settings, "encoder_socket", path), \
+         patch.object(embeddings.settings, "encoder_batching_enabled", False), \
+         patch.object(embeddings.settings, "embedding_store_dir", store_dir), \
+         patch.object(embeddings, "_remote", None), \
+         patch.object(embeddings, "_encode_local", mock_encode):
+        assert embeddings.encoder_identity() == sidecar
+        embeddings.encode_texts(["Python"])
+        server.shutdown()
+        server.server_close()
+        embeddings._remote._reset()
+        # Sidecar down: the local fallback's vectors go under the local identity
+        embeddings.encode_texts(["Docker"])
+        local = embeddings.local_encoder_identity()
+        assert embeddings.encoder_identity() == local
+
+    assert local != sidecar
+    remote_store, local_store = get_store(store_dir, sidecar), get_store(store_dir, local)
+    assert set(remote_store.get_many([text_key(sidecar, "Python"), text_key(sidecar, "Docker")])) == {
+        text_key(sidecar, "Python")
+    }
+    assert set(local_store.get_many([text_key(local, "Python"), text_key(local, "Docker")])) == {
+        text_key(local, "Docker")
+    }
@@ -0,0 +1,84 @@
+"""Tests for quantized embedding index modes."""
+
+from unittest.mock import patch
+
+import numpy as np
+
+from tests.helpers import mock_encode
+
+
+def _unit_vectors(n, dim=384, seed=0):
+    rng = np.random.default_rng(seed)
+    vecs = rng.standard_normal((n, dim)).astype(np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def test_sq8_index_agrees_with_flat():
+    """Scalar-quantized search should return the flat nearest neighbour with close scores."""
+    from app.ml.indexes import build_index, index_nbytes
+
+    corpus = _unit_vectors(500)
+    queries = corpus[:100] + 0.02 * _unit_vectors(100, seed=1)
+    flat = build_index(corpus, "flat")
+    sq8 = build_index(corpus, "sq8")
+
+    flat_scores, flat_ids = flat.search(queries, 1)
+    sq8_scores, sq8_ids = sq8.search(queries, 1)
+    assert (flat_ids == sq8_ids).all()
+    assert np.abs(flat_scores - sq8_scores).max() < 0.01
+    assert index_nbytes(sq8) * 3 < index_nbytes(flat)
+
+
+def test_pq_falls_back_for_small_corpus():
+    from app.ml.indexes import build_index
+
+    index = build_index(_unit_vectors(50), "pq")
+    assert type(index).__name__ == "IndexScalarQuantizer"
+
+
+@patch("app.services.skill_matcher.get_skill_category", return_value="technical")
+@patch("app.ml.embeddings.get_model")
+def test_quantized_role_matrix_scores_match_flat(mock_model, mock_category):
+    mock_model.return_value.encode = mock_encode
+    from app.services import skill_matcher
+
+    roles = [(["Python", "SQL", "Spark"], ["Kafka"]), (["Docker", "Kubernetes"], ["AWS"])]
+    users = [["python", "Docker"], ["Spark", "Kafka", "Go"]]
+
+    flat = skill_matcher.build_role_skill_matrix(roles)
+    with patch.object(skill_matcher.settings, "embedding_index_mode", "sq8"):
+        quantized = skill_matcher.build_role_skill_matrix(roles)
+
+    assert quantized.embeddings.dtype == np.int8
+    np.testing.assert_array_equal(
+        skill_matcher.score_profiles_against_matrix(flat, users),
+        skill_matcher.score_profiles_against_matrix(quantized, users),
+    )
+
+
+def test_quantized_similarities_are_computed_in_blocks():
+    from app.ml.indexes import quantize_rows
+    from app.services import skill_matcher
+
+    embeddings = _unit_vectors(2500)
+    queries = _unit_vectors(7, seed=1)
+    codes, scales = quantize_rows(embeddings)
+    matrix = skill_matcher.RoleSkillMatrix(
+        skills=[""] * len(codes), embeddings=codes, vocab_ids=np.zeros(len(codes), dtype=np.int64), vocab={},
+        weights=np.ones(len(codes)), offsets=np.zeros(1, dtype=np.int64),
+        lengths=np.full(1, len(codes)), required_counts=np.full(1, len(codes)), scales=scales,
+    )
+    with patch.object(skill_matcher, "_DEQUANTIZE_BLOCK_ROWS", 1000):
+        sims = matrix.similarities(queries)
+    np.testing.assert_allclose(sims, (codes.astype(np.float32) * scales[:, None]) @ queries.T, rtol=1e-5, atol=1e-6)
+    assert np.abs(sims - embeddings @ queries.T).max() < 0.01
+
+
+@patch("app.ml.embeddings.get_model")
+def test_user_skill_index_is_flat_in_quantized_modes(mock_model):
+    mock_model.return_value.encode = mock_encode
+    from app.services import skill_matcher
+
+    with patch.object(skill_matcher.settings, "embedding_index_mode", "sq8"):
+        index, _ = skill_matcher.build_skill_index(["Python", "SQL"])
+    assert type(index).__name__ == "IndexFlatIP"
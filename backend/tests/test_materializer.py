@@ -0,0 +1,68 @@
+"""Tests for the recommendation / skill-gap materialization pipeline."""
+
+from unittest.mock import patch
+
+from tests.helpers import mock_encode
+
+
+@patch("app.services.skill_matcher.get_skill_category", return_value="technical")
+@patch("app.ml.embeddings.get_model")
+def test_materialize_is_incremental(
+    mock_model, mock_category, db_session, count_queries, sample_profile, sample_role
+):
+    mock_model.return_value.encode = mock_encode
+
+    from app.models.job_role import JobRole
+    from app.models.materialized_analysis import MaterializedAnalysis
+    from app.models.user_profile import UserProfile
+    from app.services.materializer import materialize_tenant, recommendations_for, gaps_for
+
+    tenant_id = db_session._test_tenant_id
+    role = JobRole(**sample_role)
+    first = UserProfile(**sample_profile)
+    second = UserProfile(**{**sample_profile, "skills": ["Kafka"]})
+    db_session.add_all([role, first, second])
+    db_session.commit()
+
+    assert materialize_tenant(db_session, tenant_id)["recomputed"] == 2
+    assert materialize_tenant(db_session, tenant_id)["recomputed"] == 0
+
+    # Profile change -> only that profile is recomputed
+    first.skills = first.skills + ["Spark"]
+    db_session.commit()
+    assert materialize_tenant(db_session, tenant_id)["recomputed"] == 1
+
+    # Fresh rows are served without recomputing
+    row = db_session.query(MaterializedAnalysis).filter_by(profile_id=first.id).one()
+    with patch("app.services.materializer.get_recommendations") as compute, \
+         patch("app.services.materializer.analyze_gaps") as compute_gaps:
+        recs = recommendations_for(first, db_session, tenant_id, top_n=1)
+        gaps = gaps_for(first, db_session, tenant_id)
+    compute.assert_not_called()
+    compute_gaps.assert_not_called()
+    assert recs[0].role_id == row.recommendations[0]["role_id"]
+    assert gaps[0].role_title == "Data Engineer"
+
+    # Role change makes every row stale
+    role.required_skills = role.required_skills + ["dbt"]
+    db_session.commit()
+    with patch("app.services.materializer.get_recommendations", return_value=[]) as compute:
+        recommendations_for(first, db_session, tenant_id)
+    compute.assert_called_once()
+    assert materialize_tenant(db_session, tenant_id)["recomputed"] == 2
+
+    # Freshness compares the snapshot's role fingerprint: no role query once the snapshot is built,
+    # and rows stay valid for a process with its own counters (another worker, the CLI, a restart)
+    from app.services import materializer
+    from app.services.recommendation_cache import recommendation_cache
+    from app.services.reference_data import reference_data
+
+    with count_queries(db_session.get_bind()) as queries:
+        assert materializer.fresh_row(first, db_session, tenant_id) is not None
+    assert [s for s in queries.statements if "job_roles" in s] == []
+    reference_data.clear()
+    recommendation_cache.backend.clear()
+    assert materializer.fresh_row(first, db_session, tenant_id) is not None
+    with patch.object(recommendation_cache.backend, "generations", side_effect=ConnectionError):
+        assert materializer.fresh_row(first, db_session, tenant_id) is not None
+    assert materialize_tenant(db_session, tenant_id)["recomputed"] == 0
@@ -0,0 +1,77 @@
+"""Tests for the metrics registry and the /metrics endpoint."""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+
+from app import metrics
+from app.http_metrics import RequestMetricsMiddleware, rate_limited_total, request_seconds
+from app.main import _rate_limit_exceeded_handler, app
+
+
+def test_renders_labelled_metrics_in_prometheus_text_format():
+    calls = metrics.counter("test_render_calls_total", "Calls\nby caller", labelnames=("caller",))
+    calls.labels(caller='say "hi"').inc(2)
+    latency = metrics.histogram("test_render_seconds", "Latency", (0.1, 1.0), labelnames=("caller",))
+    latency.labels(caller="a").observe(0.5)
+    metrics.gauge("test_render_depth", "Queue depth", lambda: 3)
+    metrics.gauge("test_render_broken", "Broken callback", lambda: 1 / 0)
+
+    text = metrics.render_prometheus()
+    assert "# HELP test_render_calls_total Calls\\nby caller\n# TYPE test_render_calls_total counter\n" in text
+    assert 'test_render_calls_total{caller="say \\"hi\\""} 2.0\n' in text
+    assert "# TYPE test_render_seconds histogram\n" in text
+    assert 'test_render_seconds_bucket{caller="a",le="0.1"} 0\n' in text
+    assert 'test_render_seconds_bucket{caller="a",le="1.0"} 1\n' in text
+    assert 'test_render_seconds_bucket{caller="a",le="+Inf"} 1\n' in text
+    assert 'test_render_seconds_sum{caller="a"} 0.5\n' in text
+    assert 'test_render_seconds_count{caller="a"} 1\n' in text
+    assert "# TYPE test_render_depth gauge\ntest_render_depth 3.0\n" in text
+    assert "test_render_broken NaN\n" in text
+
+    assert metrics.snapshot()["test_render_seconds"]["series"][0]["labels"] == {"caller": "a"}
+    with pytest.raises(ValueError):
+        calls.labels(route="/x")
+    with pytest.raises(ValueError):
+        metrics.histogram("test_render_calls_total", "Clash", (1,), labelnames=("caller",))
+
+
+def test_metrics_endpoint_reports_request_latency_by_route_template():
+    client = TestClient(app)
+    before = request_seconds.labels(method="GET", route="/health").count
+    assert client.get("/health").status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert request_seconds.labels(method="GET", route="/health").count == before + 1
+    for name in (
+        "http_request_duration_seconds_bucket", "encode_texts_duration_seconds", "faiss_search_seconds",
+        "recommendation_cache_hits_total", "gemini_request_seconds",
+        "db_pool_checkout_seconds", "db_pool_checked_out", "rate_limit_rejections_total",
+    ):
+        assert f"# TYPE {name.removesuffix('_bucket')} " in response.text, name
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+
+
+def test_rate_limit_rejections_are_counted_per_route():
+    limiter = Limiter(key_func=get_remote_address)
+    limited_app = FastAPI()
+    limited_app.state.limiter = limiter
+    limited_app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    limited_app.add_middleware(RequestMetricsMiddleware)
+
+    @limited_app.get("/limited/{item}")
+    @limiter.limit("1/minute")
+    def limited(request: Request, item: int):
+        return {"item": item}
+
+    client = TestClient(limited_app)
+    rejected = rate_limited_total.labels(method="GET", route="/limited/{item}")
+    before = rejected.value
+    assert client.get("/limited/1").status_code == 200
+    assert client.get("/limited/1").status_code == 429
+    assert rejected.value == before + 1
@@ -0,0 +1,51 @@
+"""Tests for the encoder micro-batcher."""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from tests.helpers import mock_encode
+
+
+def test_concurrent_calls_share_batches():
+    from app.ml.micro_batcher import MicroBatcher, batch_size_histogram
+
+    calls = []
+
+    def slow_encode(texts):
+        calls.append(list(texts))
+        time.sleep(0.02)
+        return mock_encode(texts)
+
+    batcher = MicroBatcher(slow_encode, max_batch=64, max_wait_ms=20)
+    observed_before = batch_size_histogram.count
+    inputs = [[f"skill {i}", "Python"] for i in range(16)]
+    results = [None] * len(inputs)
+
+    def worker(i):
+        results[i] = batcher.encode(inputs[i])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(inputs))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) < len(inputs)
+    assert sum(c.count("Python") for c in calls) == len(calls)  # deduplicated within a batch
+    for texts, result in zip(inputs, results):
+        np.testing.assert_allclose(result, mock_encode(texts), rtol=1e-6)
+    assert batch_size_histogram.count - observed_before == len(calls)
+
+
+def test_encode_errors_reach_every_caller():
+    from app.ml.micro_batcher import MicroBatcher
+
+    def broken(texts):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(broken, max_batch=8, max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        batcher.encode(["Python"])
@@ -0,0 +1,224 @@
+"""SQL statement budgets for the profile analysis endpoints.
+
+Each endpoint is called once to warm the process caches (reference data,
+skill index, role catalog, recommendation cache), then again under
+``count_queries``; the second call must stay within its budget. Each is also
+counted with every cache cleared and no materialized rows, against a separate
+cold budget covering the snapshot and index rebuilds. An N+1
+regression (a query per role, course or recommendation) shows up here as a
+count that grows with the seeded data.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.config import settings
+from app.database import Base, get_async_db, get_db
+from app.limiter import limiter
+from app.main import app
+from app.models.job_role import JobRole
+from app.models.materialized_analysis import MaterializedAnalysis
+from app.models.sctp_course import SCTPCourse
+from app.models.user_profile import UserProfile
+from app.services import recommender
+from app.services.recommendation_cache import recommendation_cache
+from app.services.reference_data import reference_data
+from app.services.skill_index import skill_index
+from tests.helpers import mock_encode
+
+SKILLS = ["Python", "SQL", "Spark", "Airflow", "AWS", "Docker", "Kubernetes", "Tableau", "Kafka", "dbt"]
+
+# Warm-cache budgets; auth alone costs a user and a tenant lookup
+BUDGETS = {
+    ("GET", "/api/skill-gap/{pid}"): 3,
+    ("GET", "/api/upskilling/{pid}"): 4,
+    ("GET", "/api/upskilling/{pid}?schedule=parallel"): 4,
+    ("GET", "/api/dashboard/summary"): 4,
+    ("GET", "/api/project-suggestions/{pid}"): 4,
+    ("GET", "/api/peer-comparison/{pid}"): 5,
+    ("GET", "/api/market-insights"): 2,
+    ("GET", "/api/roles"): 2,
+    ("POST", "/api/compare-roles"): 3,
+    ("POST", "/api/recommend"): 3,
+    ("POST", "/api/chat"): 3,
+    ("POST", "/api/interview"): 3,
+    ("POST", "/api/pathways"): 2,
+}
+
+# Budgets with every process cache cleared first: the snapshot and index rebuilds
+# add a fixed number of table scans, never one query per row
+COLD_BUDGETS = {
+    ("GET", "/api/skill-gap/{pid}"): 6,
+    ("GET", "/api/upskilling/{pid}"): 13,
+    ("GET", "/api/upskilling/{pid}?schedule=parallel"): 13,
+    ("GET", "/api/dashboard/summary"): 7,
+    ("GET", "/api/project-suggestions/{pid}"): 7,
+    ("GET", "/api/peer-comparison/{pid}"): 11,
+    ("GET", "/api/market-insights"): 5,
+    ("GET", "/api/roles"): 5,
+    ("POST", "/api/compare-roles"): 6,
+    ("POST", "/api/recommend"): 6,
+    ("POST", "/api/chat"): 12,
+    ("POST", "/api/interview"): 6,
+    ("POST", "/api/pathways"): 11,
+}
+
+# One in-memory database for both drivers: shared cache, kept alive by the sync connection
+_DB = "file:query_budgets?mode=memory&cache=shared&uri=true"
+engine = create_engine(f"sqlite:///{_DB}", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{_DB}", poolclass=NullPool)
+TestSession = sessionmaker(bind=engine)
+AsyncTestSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
+def _get_db():
+    db = TestSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def _get_async_db():
+    async with AsyncTestSession() as db:
+        yield db
+
+
+@pytest.fixture(scope="module")
+def api():
+    previous_override = app.dependency_overrides.get(get_db)
+    previous_limiter = limiter.enabled
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_async_db] = _get_async_db
+    limiter.enabled = False
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with patch("app.ml.embeddings.get_model") as mock_model, \
+         patch("app.services.skill_matcher.get_skill_category", return_value="technical"), \
+         patch.object(settings, "gemini_api_key", ""):
+        mock_model.return_value.encode = mock_encode
+        client = TestClient(app)
+        client.post("/api/auth/register", json={
+            "email": "budget@example.com", "password": "Secure@pass1", "password_confirm": "Secure@pass1",
+            "name": "Budget", "tenant_name": "Budgets",
+        })
+        token = client.post(
+            "/api/auth/login", data={"username": "budget@example.com", "password": "Secure@pass1"}
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        from app.models.user import User
+
+        db = TestSession()
+        user = db.query(User).one()
+        tenant_id = user.tenant_id
+        # Enough roles and courses that a per-row query would blow every budget
+        for i in range(12):
+            db.add(JobRole(
+                title=f"Role {i}", category="Data", description="-", tenant_id=tenant_id,
+                required_skills=SKILLS[i % 5:i % 5 + 4], preferred_skills=SKILLS[5 + i % 3:8 + i % 3],
+                min_experience_years=i % 4, education_level="bachelor", career_switcher_friendly=i % 2 == 0,
+            ))
+        for i in range(30):
+            db.add(SCTPCourse(
+                title=f"Course {i}", provider="NTUC", duration_weeks=2 + i % 5, course_fee=500 + 100 * i,
+                level=["beginner", "intermediate", "advanced"][i % 3], skills_taught=SKILLS[i % 10:i % 10 + 2],
+                tenant_id=tenant_id if i % 2 else None,
+            ))
+        profile = UserProfile(
+            name="Budget", education="bachelor", years_experience=2, skills=["Python", "SQL"],
+            is_career_switcher=True, tenant_id=tenant_id, user_id=user.id,
+        )
+        db.add(profile)
+        db.add(UserProfile(name="Peer", skills=["Python", "Spark", "AWS"], years_experience=3, tenant_id=tenant_id))
+        db.commit()
+        role_ids = [r.id for r in db.query(JobRole).order_by(JobRole.id).limit(3)]
+        profile_id = profile.id
+        db.close()
+
+        yield client, headers, profile_id, role_ids
+
+    Base.metadata.drop_all(bind=engine)
+    limiter.enabled = previous_limiter
+    app.dependency_overrides.pop(get_async_db, None)
+    if previous_override is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous_override
+
+
+def _body(path, profile_id, role_ids):
+    return {
+        "/api/compare-roles": {"profile_id": profile_id, "role_ids": role_ids},
+        "/api/recommend": {"profile_id": profile_id},
+        "/api/chat": {"profile_id": profile_id, "messages": [{"role": "user", "content": "Which course first?"}]},
+        "/api/interview": {"profile_id": profile_id, "role_title": "Role 0", "messages": []},
+        "/api/pathways": {"skills_needed": ["Spark", "Kafka", "Docker"]},
+    }.get(path)
+
+
+@pytest.mark.parametrize("method,path", list(BUDGETS))
+def test_endpoint_stays_within_query_budget(api, count_queries, method, path):
+    client, headers, profile_id, role_ids = api
+    url = path.format(pid=profile_id)
+    body = _body(path, profile_id, role_ids)
+
+    assert client.request(method, url, json=body, headers=headers).status_code == 200
+    with count_queries(engine, async_engine.sync_engine) as queries:
+        response = client.request(method, url, json=body, headers=headers)
+    assert response.status_code == 200
+    queries.assert_at_most(BUDGETS[(method, path)], f"{method} {url}")
+
+
+def _clear_caches():
+    """Drop every process cache and materialized row, as after a restart with a fresh database."""
+    reference_data.clear()
+    skill_index.clear()
+    recommender._role_catalogs.clear()
+    recommendation_cache.backend.clear()
+    db = TestSession()
+    db.query(MaterializedAnalysis).delete()
+    db.commit()
+    db.close()
+
+
+@pytest.mark.parametrize("method,path", list(COLD_BUDGETS))
+def test_endpoint_stays_within_cold_cache_query_budget(api, count_queries, method, path):
+    client, headers, profile_id, role_ids = api
+    url = path.format(pid=profile_id)
+    body = _body(path, profile_id, role_ids)
+
+    _clear_caches()
+    with count_queries(engine, async_engine.sync_engine) as queries:
+        response = client.request(method, url, json=body, headers=headers)
+    assert response.status_code == 200
+    queries.assert_at_most(COLD_BUDGETS[(method, path)], f"{method} {url} (cold)")
+
+
+def test_gap_analysis_query_count_does_not_grow_with_roles(db_session, count_queries, sample_profile, sample_role):
+    from app.services.gap_analyzer import analyze_gaps
+    from app.services.recommender import get_recommendations
+
+    tenant_id = db_session._test_tenant_id
+    for i in range(6):
+        db_session.add(JobRole(**{**sample_role, "title": f"Role {i}"}))
+    profile = UserProfile(**sample_profile)
+    db_session.add(profile)
+    db_session.commit()
+
+    with patch("app.ml.embeddings.get_model") as mock_model, \
+         patch("app.services.skill_matcher.get_skill_category", return_value="technical"):
+        mock_model.return_value.encode = mock_encode
+        recs = get_recommendations(profile, db_session, tenant_id=tenant_id, top_n=3)
+        assert len(recs) == 3
+        with count_queries(db_session.get_bind()) as queries:
+            gaps = analyze_gaps(profile, db_session, tenant_id=tenant_id, recommendations=recs)
+    assert [g.role_id for g in gaps] == [r.role_id for r in recs]
+    # Roles come from the reference-data snapshot already built by get_recommendations
+    queries.assert_at_most(0, "analyze_gaps")
@@ -0,0 +1,89 @@
+"""Tests for per-request SQL statistics."""
+
+import logging
+import re
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.tenant import Tenant
+from app.query_stats import QueryStatsMiddleware, install, redact_parameters, route_stats
+
+
+def _app():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    install(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all([Tenant(name="A"), Tenant(name="B")])
+        db.commit()
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/tenants/{name}")
+    def tenant(name: str):
+        with Session() as db:
+            found = db.query(Tenant).filter(Tenant.name == name).all()
+            total = db.query(Tenant).count()
+            return {"found": len(found), "total": total}
+
+    return TestClient(app)
+
+
+def test_redacts_parameter_values():
+    assert redact_parameters(("secret@example.com", 3, None)) == "(str, int, NoneType)"
+    assert redact_parameters({"email": "secret@example.com"}) == "{email: str}"
+    assert redact_parameters([("a", 1), ("b", 2)]) == "2 x (str, int)"
+
+
+def test_request_gets_server_timing_and_route_totals():
+    client = _app()
+    route_stats.clear()
+    for name in ("A", "A", "missing"):
+        response = client.get(f"/tenants/{name}")
+        assert response.status_code == 200
+
+    timing = response.headers["Server-Timing"]
+    match = re.fullmatch(r'db;dur=([\d.]+);desc="(\d+) statements, (\d+) rows", app;dur=([\d.]+)', timing)
+    assert match, timing
+    assert int(match.group(2)) == 2
+    assert float(match.group(1)) <= float(match.group(4))
+
+    entry = route_stats.snapshot()["GET /tenants/{name}"]
+    assert entry["requests"] == 3
+    assert entry["statements"] == 6
+    assert entry["rows"] == 2  # one Tenant instance loaded by each "A" request
+    assert entry["max_statements"] == 2
+    assert client.get("/nowhere").status_code == 404
+    assert route_stats.snapshot()["GET <unmatched>"]["statements"] == 0
+    route_stats.clear()
+
+
+def test_slow_statements_are_logged_without_values(caplog):
+    client = _app()
+    with patch("app.query_stats.settings.sql_slow_query_ms", 1e-6), caplog.at_level(logging.WARNING, "app.query_stats"):
+        client.get("/tenants/very-private-name")
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Slow SQL statement")]
+    assert len(slow) == 2
+    assert all("very-private-name" not in message for message in slow)
+    assert any("parameters: (str" in message for message in slow)
+
+
+def test_failed_statements_leave_no_timing_state():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    install(engine)
+    with engine.connect() as conn:
+        for _ in range(3):
+            try:
+                conn.execute(text("SELECT * FROM missing_table"))
+            except Exception:
+                pass
+        conn.execute(text("SELECT 1"))
+        assert conn.info == {}
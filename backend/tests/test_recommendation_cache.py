@@ -0,0 +1,67 @@
+"""Tests for the recommendation result cache and its invalidation hooks."""
+
+from unittest.mock import patch
+
+from app.schemas.recommendation import RoleRecommendation
+
+
+def _rec(role_id=1):
+    return RoleRecommendation(
+        role_id=role_id, title="Data Engineer", category="Data", match_score=0.5,
+        content_score=0.5, rule_score=0.5, career_switcher_bonus=0.0,
+        matched_skills=["Python"], missing_skills=["Spark"], rationale="General match",
+        salary_range=None,
+    )
+
+
+def test_local_backend_expires_and_bounds():
+    from app.services.recommendation_cache import LocalBackend
+
+    backend = LocalBackend(maxsize=2)
+    with patch("app.services.recommendation_cache.time.time", return_value=1000.0):
+        backend.set("a", 1, ttl=10)
+        backend.set("b", 2, ttl=10)
+        backend.set("c", 3, ttl=10)
+        assert backend.get("a") is None  # evicted by size
+        assert backend.get("c") == 3
+    with patch("app.services.recommendation_cache.time.time", return_value=1011.0):
+        assert backend.get("c") is None  # expired
+
+
+def test_profile_commit_invalidates_entry(db_session, sample_profile, sample_role):
+    from app.models.job_role import JobRole
+    from app.models.user_profile import UserProfile
+    from app.services.recommendation_cache import recommendation_cache
+
+    tenant_id = db_session._test_tenant_id
+    profile = UserProfile(**sample_profile)
+    db_session.add(profile)
+    db_session.commit()
+
+    recommendation_cache.set(profile, 5, tenant_id, [_rec()])
+    assert recommendation_cache.get(profile, 5, tenant_id)[0].role_id == 1
+
+    profile.name = "Renamed"  # not part of the content hash
+    db_session.commit()
+    assert recommendation_cache.get(profile, 5, tenant_id) is None
+
+    recommendation_cache.set(profile, 5, tenant_id, [_rec()])
+    db_session.add(JobRole(**sample_role))
+    db_session.commit()
+    assert recommendation_cache.get(profile, 5, tenant_id) is None
+
+
+def test_rollback_does_not_invalidate(db_session, sample_profile):
+    from app.models.user_profile import UserProfile
+    from app.services.recommendation_cache import recommendation_cache
+
+    tenant_id = db_session._test_tenant_id
+    profile = UserProfile(**sample_profile)
+    db_session.add(profile)
+    db_session.commit()
+    recommendation_cache.set(profile, 3, tenant_id, [_rec(7)])
+
+    profile.name = "Temp"
+    db_session.flush()
+    db_session.rollback()
+    assert recommendation_cache.get(profile, 3, tenant_id)[0].role_id == 7
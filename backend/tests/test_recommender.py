@@ -104,3 +104,34 @@ def test_get_recommendations(mock_model, mock_category, db_session, sample_profi
     assert recs[0].title == "Data Engineer"
     assert 0.0 <= recs[0].match_score <= 1.0
     assert isinstance(recs[0].matched_skills, list)
+
+
+@patch("app.services.skill_matcher.get_skill_category", return_value="technical")
+@patch("app.ml.embeddings.get_model")
+def test_batch_recommendations_match_single(mock_model, mock_category, db_session, sample_profile, sample_role):
+    """Batch scoring should return the same results as per-profile calls."""
+    mock_model.return_value.encode = _mock_encode
+
+    from app.models.user_profile import UserProfile
+    from app.models.job_role import JobRole
+    from app.services.recommender import get_recommendations, iter_batch_recommendations
+    from app.services.recommendation_cache import recommendation_cache
+
+    tenant_id = db_session._test_tenant_id
+    db_session.add(JobRole(**sample_role))
+    db_session.add(JobRole(**{**sample_role, "title": "Cloud Engineer",
+                              "required_skills": ["AWS", "Docker", "Terraform"],
+                              "preferred_skills": [], "career_switcher_friendly": False}))
+    profiles = [
+        UserProfile(**sample_profile),
+        UserProfile(**{**sample_profile, "skills": [], "is_career_switcher": False}),
+        UserProfile(**{**sample_profile, "skills": ["Terraform", "docker"], "years_experience": 0}),
+    ]
+    db_session.add_all(profiles)
+    db_session.commit()
+
+    batch = dict(iter_batch_recommendations(profiles, db_session, tenant_id=tenant_id, top_n=2, chunk_size=2))
+    recommendation_cache.backend.clear()
+    for profile in profiles:
+        single = get_recommendations(profile, db_session, tenant_id=tenant_id, top_n=2)
+        assert batch[profile] == single
@@ -0,0 +1,117 @@
+"""Tests for the per-tenant reference-data snapshots."""
+
+import dataclasses
+
+import pytest
+
+from app.models.job_role import JobRole
+from app.models.market_insight import MarketInsight
+from app.models.sctp_course import SCTPCourse
+from app.models.tenant import Tenant
+from app.services.reference_data import reference_data
+
+
+@pytest.fixture
+def seeded(db_session, sample_role):
+    tenant_id = db_session._test_tenant_id
+    other = Tenant(name="Other")
+    db_session.add(other)
+    db_session.flush()
+    db_session.add_all([
+        JobRole(**sample_role),
+        JobRole(**{**sample_role, "title": "Elsewhere", "tenant_id": other.id}),
+        SCTPCourse(title="Shared", provider="NUS", skills_taught=["Spark"], tenant_id=None),
+        SCTPCourse(title="Own", provider="NTU", skills_taught=["Airflow"], tenant_id=tenant_id),
+        SCTPCourse(title="Theirs", provider="SMU", skills_taught=["dbt"], tenant_id=other.id),
+        MarketInsight(role_category="Data", trending_skills=["Spark"], avg_salary_sgd=7000, demand_level="high",
+                      hiring_volume=100, yoy_growth_pct=5.0, tenant_id=None),
+    ])
+    db_session.commit()
+    return db_session, tenant_id, other.id
+
+
+def test_snapshot_holds_plain_immutable_tenant_data(seeded):
+    db, tenant_id, _ = seeded
+    snapshot = reference_data.get(db, tenant_id)
+    assert [r.title for r in snapshot.roles] == ["Data Engineer"]
+    assert snapshot.roles_by_id[snapshot.roles[0].id].required_skills == ("Python", "SQL", "Spark", "Airflow", "AWS")
+    assert sorted(c.title for c in snapshot.courses.values()) == ["Own", "Shared"]
+    assert [i.trending_skills for i in snapshot.insights] == [("Spark",)]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.roles[0].title = "x"
+    with pytest.raises(TypeError):
+        snapshot.courses[0] = None
+
+
+def test_snapshot_is_reused_until_a_committed_write(seeded):
+    db, tenant_id, other_id = seeded
+    first = reference_data.get(db, tenant_id)
+    assert reference_data.get(db, tenant_id) is first
+
+    # Uncommitted and rolled-back writes leave the snapshot alone
+    db.add(JobRole(title="Draft", category="Data", description="-", tenant_id=tenant_id))
+    db.flush()
+    db.rollback()
+    assert reference_data.get(db, tenant_id) is first
+
+    # Another tenant's write does not touch this snapshot
+    db.add(JobRole(title="Theirs", category="Data", description="-", tenant_id=other_id))
+    db.commit()
+    assert reference_data.get(db, tenant_id) is first
+
+    # Shared course, tenant role and shared insight writes each invalidate it
+    shared = db.query(SCTPCourse).filter_by(title="Shared").one()
+    shared.course_fee = 900
+    db.commit()
+    second = reference_data.get(db, tenant_id)
+    assert second is not first
+    assert [c.course_fee for c in second.courses.values() if c.title == "Shared"] == [900]
+
+    insight = db.query(MarketInsight).one()
+    insight.avg_salary_sgd = 7500
+    db.commit()
+    assert reference_data.get(db, tenant_id).insights[0].avg_salary_sgd == 7500
+
+
+def test_moving_a_role_invalidates_both_tenants(seeded):
+    db, tenant_id, other_id = seeded
+    assert len(reference_data.get(db, tenant_id).roles) == 1
+    assert len(reference_data.get(db, other_id).roles) == 1
+
+    role = db.query(JobRole).filter_by(tenant_id=tenant_id).one()
+    role.tenant_id = other_id
+    db.commit()
+    assert reference_data.get(db, tenant_id).roles == ()
+    assert len(reference_data.get(db, other_id).roles) == 2
+
+
+def test_snapshot_is_not_cached_while_generations_are_unavailable(seeded):
+    from unittest.mock import patch
+
+    from app.services.recommendation_cache import recommendation_cache
+
+    db, tenant_id, _ = seeded
+    reference_data.get(db, tenant_id)
+    with patch.object(recommendation_cache.backend, "generations", side_effect=ConnectionError("redis down")):
+        during = reference_data.get(db, tenant_id)
+        assert None in during.version
+        db.add(JobRole(title="Added", category="Data", description="-", tenant_id=tenant_id))
+        db.commit()
+        assert [r.title for r in reference_data.get(db, tenant_id).roles] == ["Data Engineer", "Added"]
+    # The outage snapshot was never stored; the recovered lookup sees current data
+    assert len(reference_data.get(db, tenant_id).roles) == 2
+
+
+def test_snapshot_age_is_bounded_unless_counters_are_shared(seeded):
+    from unittest.mock import patch
+
+    from app.services.recommendation_cache import recommendation_cache
+
+    db, tenant_id, _ = seeded
+    first = reference_data.get(db, tenant_id)
+    with patch.object(reference_data, "max_age", 0):
+        # In-process counters miss other workers' writes: an expired snapshot is rebuilt
+        assert reference_data.get(db, tenant_id) is not first
+        with patch.object(recommendation_cache.backend, "shared", True):
+            shared = reference_data.get(db, tenant_id)
+            assert reference_data.get(db, tenant_id) is shared
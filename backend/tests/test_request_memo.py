@@ -0,0 +1,71 @@
+"""Tests for request-scoped memoization of service calls."""
+
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models.user_profile import UserProfile
+from app.services.request_memo import RequestMemoMiddleware, request_memoized, request_scope
+
+calls = []
+
+
+@request_memoized(key=lambda x, skip=False: None if skip else x)
+def _square(x, skip=False):
+    calls.append(x)
+    return [x * x]
+
+
+def test_memoizes_only_inside_a_scope():
+    calls.clear()
+    _square(2)
+    _square(2)
+    assert calls == [2, 2]
+
+    calls.clear()
+    with request_scope() as memo:
+        first = _square(2)
+        first.append("mutated")
+        assert _square(2) == [4]
+        _square(3)
+        _square(3, skip=True)
+        with request_scope() as inner:
+            assert inner is memo
+            _square(3)
+    assert calls == [2, 3, 3]
+    assert (memo.hits, memo.misses) == (2, 2)
+
+    with request_scope():
+        _square(2)
+    assert calls == [2, 3, 3, 2]
+
+
+def test_commit_clears_the_memo(db_session, sample_profile):
+    calls.clear()
+    with request_scope():
+        _square(5)
+        db_session.add(UserProfile(**sample_profile))
+        db_session.commit()
+        _square(5)
+    assert calls == [5, 5]
+
+
+def test_middleware_reports_hits_per_request():
+    app = FastAPI()
+    app.add_middleware(RequestMemoMiddleware)
+
+    @app.get("/twice")
+    def twice():
+        return {"a": _square(7), "b": _square(7)}
+
+    calls.clear()
+    client = TestClient(app)
+    with patch("app.services.request_memo.settings.request_memo_debug_headers", True):
+        for _ in range(2):
+            response = client.get("/twice")
+            assert response.json() == {"a": [49], "b": [49]}
+            assert response.headers["X-Memo-Hits"] == "1"
+            assert response.headers["X-Memo-Misses"] == "1"
+    assert calls == [7, 7]
+    assert "X-Memo-Hits" not in client.get("/twice").headers
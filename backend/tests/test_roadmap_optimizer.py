@@ -0,0 +1,124 @@
+"""Tests for the set-cover roadmap optimizer."""
+
+import itertools
+import random
+from unittest.mock import patch
+
+import pytest
+
+from app.models.sctp_course import SCTPCourse
+from app.models.user_profile import UserProfile
+from app.schemas.skill_gap import RoleGap, SkillGapItem
+from app.services.roadmap_optimizer import CourseOption, select_courses
+
+
+def _random_options(rng, n_skills, n_courses):
+    return [
+        CourseOption(
+            key=i,
+            mask=sum(1 << b for b in rng.sample(range(n_skills), rng.randint(1, 3))),
+            fee_cents=rng.choice([0, 25000, 50000, 120000]),
+            weeks=rng.randint(1, 8),
+        )
+        for i in range(n_courses)
+    ]
+
+
+def _brute_force(options, target, objective):
+    best = None
+    for r in range(1, len(options) + 1):
+        for combo in itertools.combinations(options, r):
+            covered = 0
+            for o in combo:
+                covered |= o.mask
+            if covered & target != target:
+                continue
+            fee, weeks = sum(o.fee_cents for o in combo), sum(o.weeks for o in combo)
+            cost = (fee, weeks, r) if objective == "fee" else (weeks, fee, r)
+            if best is None or cost < best:
+                best = cost
+    return best
+
+
+@pytest.mark.parametrize("objective", ["fee", "weeks"])
+def test_exact_matches_brute_force(objective):
+    rng = random.Random(3)
+    for _ in range(30):
+        options = _random_options(rng, n_skills=6, n_courses=9)
+        target = 0
+        for o in options:
+            target |= o.mask
+        selection = select_courses(options, [1] * 6, objective)
+        assert selection.exact
+        cost = (selection.fee_cents, selection.weeks) if objective == "fee" else (selection.weeks, selection.fee_cents)
+        assert cost + (len(selection.keys),) == _brute_force(options, target, objective)
+
+
+def test_greedy_fallback_covers_everything_without_redundant_courses():
+    rng = random.Random(5)
+    options = _random_options(rng, n_skills=40, n_courses=3000)
+    selection = select_courses(options, [5] * 10 + [1] * 30, "fee")
+    assert not selection.exact
+    chosen = [o for o in options if o.key in set(selection.keys)]
+    covered = 0
+    for o in chosen:
+        covered |= o.mask
+    assert covered == selection.covered == (1 << 40) - 1
+    for o in chosen:
+        rest = 0
+        for other in chosen:
+            if other is not o:
+                rest |= other.mask
+        assert rest != selection.covered
+
+
+def test_untaught_skills_are_not_required():
+    options = [CourseOption(key=1, mask=0b001, fee_cents=100, weeks=2), CourseOption(key=2, mask=0b011, fee_cents=300, weeks=4)]
+    selection = select_courses(options, [1, 1, 1], "fee")
+    assert selection.covered == 0b011
+    assert selection.keys == [2]
+
+
+def test_plan_roadmap_is_no_worse_than_greedy(db_session, sample_profile):
+    from app.services.roadmap_generator import plan_roadmap
+    from app.services.skill_index import skill_index
+
+    skill_index.clear()
+    tenant_id = db_session._test_tenant_id
+    for title, skills, fee, weeks in [
+        ("Spark Basics", ["Spark"], 1000, 4),
+        ("Airflow Basics", ["Airflow"], 1000, 4),
+        ("Data Engineering Bootcamp", ["Spark", "Airflow", "Kafka"], 2500, 10),
+        ("Kafka Streams", ["kafka"], 3000, 3),
+    ]:
+        db_session.add(SCTPCourse(title=title, provider="NTUC", skills_taught=skills, course_fee=fee,
+                                  duration_weeks=weeks, tenant_id=tenant_id))
+    profile = UserProfile(**sample_profile)
+    db_session.add(profile)
+    db_session.commit()
+
+    gaps = [RoleGap(role_id=1, role_title="Data Engineer", match_score=0.4, gaps=[
+        SkillGapItem(skill=s, required_level="required", user_level=0.0, user_level_label="missing",
+                     gap_severity="high", priority=p)
+        for s, p in [("Spark", 1), ("Airflow", 2), ("Kafka", 3), ("Rust", 4)]
+    ])]
+    try:
+        with patch("app.services.roadmap_generator.analyze_gaps", return_value=gaps):
+            greedy = plan_roadmap(profile, db_session, tenant_id, objective="greedy")
+            default = plan_roadmap(profile, db_session, tenant_id)
+            by_fee = plan_roadmap(profile, db_session, tenant_id, objective="fee")
+            by_weeks = plan_roadmap(profile, db_session, tenant_id, objective="weeks")
+    finally:
+        skill_index.clear()
+
+    # Greedy takes the bootcamp for Spark, then still adds separate Airflow and Kafka courses
+    assert [i.course_title for i in greedy.items] == ["Data Engineering Bootcamp", "Airflow Basics", "Kafka Streams"]
+    # The optimizer is opt-in; by default roadmaps are unchanged
+    assert default.objective == "greedy" and default.items == greedy.items
+    assert [i.course_title for i in by_fee.items] == ["Data Engineering Bootcamp"]
+    assert by_fee.optimal and by_fee.objective_value == by_fee.items[0].nett_fee_after_subsidy
+    assert by_fee.objective_value < greedy.objective_value
+    # Separate courses take 11 weeks against the bootcamp's 10
+    assert [i.course_title for i in by_weeks.items] == ["Data Engineering Bootcamp"]
+    assert by_weeks.objective_value == 10
+    assert by_weeks.items[0].week_end == 10
@@ -0,0 +1,113 @@
+"""Tests for parallel-track roadmap scheduling."""
+
+import itertools
+import random
+from unittest.mock import patch
+
+import pytest
+
+from app.models.sctp_course import SCTPCourse
+from app.models.user_profile import UserProfile
+from app.schemas.skill_gap import RoleGap, SkillGapItem
+from app.services.roadmap_scheduler import prerequisites, schedule
+
+
+def _random_instance(rng, n):
+    durations = [rng.randint(1, 4) for _ in range(n)]
+    skills = [set(rng.sample("abcd", 2)) for _ in range(n)]
+    levels = [rng.choice(["beginner", "intermediate", "advanced", None]) for _ in range(n)]
+    return durations, prerequisites(skills, levels)
+
+
+def _check_feasible(slots, durations, preds, tracks):
+    for c, slot in enumerate(slots):
+        assert slot.end - slot.start + 1 == durations[c]
+        assert all(slots[p].end < slot.start for p in preds[c])
+    for week in range(1, max(s.end for s in slots) + 1):
+        running = [s.track for s in slots if s.start <= week <= s.end]
+        assert len(running) == len(set(running)) <= tracks
+        assert all(1 <= t <= tracks for t in running)
+
+
+def _brute_force_makespan(durations, preds, tracks):
+    horizon = sum(durations)
+    best = horizon
+    for starts in itertools.product(range(horizon), repeat=len(durations)):
+        span = max(s + d for s, d in zip(starts, durations))
+        if span >= best:
+            continue
+        if any(starts[p] + durations[p] > starts[c] for c in range(len(starts)) for p in preds[c]):
+            continue
+        if any(sum(1 for s, d in zip(starts, durations) if s <= w < s + d) > tracks for w in range(span)):
+            continue
+        best = span
+    return best
+
+
+def test_prerequisites_follow_level_on_shared_skills():
+    preds = prerequisites(
+        [{"python"}, {"python", "sql"}, {"sql"}, {"docker"}],
+        ["beginner", "advanced", "Intermediate", "beginner"],
+    )
+    assert preds == [set(), {0, 2}, set(), set()]
+
+
+@pytest.mark.parametrize("tracks", [1, 2, 3])
+def test_schedule_is_feasible_and_minimal(tracks):
+    rng = random.Random(tracks)
+    for _ in range(12):
+        durations, preds = _random_instance(rng, 4)
+        slots, optimal = schedule(durations, preds, tracks)
+        assert optimal
+        _check_feasible(slots, durations, preds, tracks)
+        assert max(s.end for s in slots) == _brute_force_makespan(durations, preds, tracks)
+
+
+def test_large_schedule_stays_feasible():
+    rng = random.Random(11)
+    durations, preds = _random_instance(rng, 25)
+    slots, _ = schedule(durations, preds, 3)
+    _check_feasible(slots, durations, preds, 3)
+    assert max(s.end for s in slots) < sum(durations)
+
+
+def test_parallel_roadmap_shortens_timeline(db_session, sample_profile):
+    from app.services.roadmap_generator import plan_roadmap
+    from app.services.skill_index import skill_index
+
+    skill_index.clear()
+    tenant_id = db_session._test_tenant_id
+    for title, skills, level, weeks in [
+        ("Python and Docker Foundations", ["Python", "Docker"], "beginner", 4),
+        ("Machine Learning", ["Machine Learning", "Python"], "advanced", 6),
+        ("Cloud Practitioner", ["AWS"], "intermediate", 5),
+    ]:
+        db_session.add(SCTPCourse(title=title, provider="NTUC", skills_taught=skills, level=level,
+                                  duration_weeks=weeks, tenant_id=tenant_id))
+    profile = UserProfile(**sample_profile)
+    db_session.add(profile)
+    db_session.commit()
+
+    gaps = [RoleGap(role_id=1, role_title="ML Engineer", match_score=0.4, gaps=[
+        SkillGapItem(skill=s, required_level="required", user_level=0.0, user_level_label="missing",
+                     gap_severity="high", priority=p)
+        for s, p in [("Python", 1), ("Docker", 2), ("Machine Learning", 2), ("AWS", 3)]
+    ])]
+    try:
+        with patch("app.services.roadmap_generator.analyze_gaps", return_value=gaps):
+            sequential = plan_roadmap(profile, db_session, tenant_id)
+            parallel = plan_roadmap(profile, db_session, tenant_id, schedule="parallel", weekly_hours=20)
+    finally:
+        skill_index.clear()
+
+    assert sequential.tracks == 1
+    assert max(i.week_end for i in sequential.items) == 15
+    assert parallel.tracks == 2
+    slots = {i.course_title: (i.week_start, i.week_end) for i in parallel.items}
+    # Machine Learning (advanced) waits for the beginner Python course; Cloud runs alongside
+    assert slots == {
+        "Python and Docker Foundations": (1, 4),
+        "Machine Learning": (5, 10),
+        "Cloud Practitioner": (1, 5),
+    }
+    assert [i.week_start for i in parallel.items] == sorted(i.week_start for i in parallel.items)
@@ -0,0 +1,260 @@
+"""Tests for the skill inverted index: results must match the full scans it replaces."""
+
+import random
+from unittest.mock import patch
+
+import pytest
+
+from app.schemas.recommendation import RoleRecommendation
+from app.schemas.skill_gap import RoleGap, SkillGapItem
+
+SKILLS = ["Python", "SQL", "PostgreSQL", "Docker", "Kubernetes", "Spark", "AWS", "Excel", "Tableau", "Java"]
+
+
+def _variant(rng, skill):
+    return rng.choice([skill, skill.lower(), skill.upper()])
+
+
+@pytest.fixture
+def populated(db_session):
+    from app.models.job_role import JobRole
+    from app.models.sctp_course import SCTPCourse
+    from app.models.tenant import Tenant
+    from app.models.user import User
+    from app.models.user_profile import UserProfile
+    from app.services.skill_index import skill_index
+
+    skill_index.clear()
+    rng = random.Random(7)
+    tenant_id = db_session._test_tenant_id
+    other = Tenant(name="Other")
+    db_session.add(other)
+    db_session.flush()
+
+    for i in range(40):
+        owner = rng.choice([tenant_id, other.id, None])
+        db_session.add(SCTPCourse(
+            title=f"Course {i}", provider="NTUC", duration_weeks=rng.randint(1, 6),
+            level=rng.choice(["beginner", "intermediate", "advanced"]), course_fee=rng.choice([0, 500, 1500]),
+            skills_taught=[_variant(rng, s) for s in rng.sample(SKILLS, rng.randint(1, 4))], tenant_id=owner,
+        ))
+    for i in range(5):
+        db_session.add(JobRole(
+            title=f"Role {i}", category="Data", description="-", tenant_id=tenant_id,
+            required_skills=rng.sample(SKILLS, 3), preferred_skills=rng.sample(SKILLS, 2),
+        ))
+    user = User(email="u@example.com", hashed_password="x", name="U", tenant_id=tenant_id)
+    db_session.add(user)
+    db_session.flush()
+    for i in range(30):
+        db_session.add(UserProfile(
+            name=f"P{i}", user_id=user.id, years_experience=rng.randint(0, 10),
+            education=rng.choice(["bachelor", "master", None]), is_career_switcher=rng.random() < 0.5,
+            skills=[_variant(rng, s) for s in rng.sample(SKILLS, rng.randint(0, 5))],
+            tenant_id=rng.choice([tenant_id, tenant_id, other.id]),
+        ))
+    db_session.commit()
+    yield db_session, tenant_id, other.id, user
+    skill_index.clear()
+
+
+def _mutate(db, tenant_id, other_id):
+    """Insert, update, re-tenant and delete rows after the index has been built."""
+    from app.models.sctp_course import SCTPCourse
+    from app.models.user_profile import UserProfile
+
+    courses = db.query(SCTPCourse).order_by(SCTPCourse.id).all()
+    courses[0].skills_taught = ["Spark", "Airflow"]
+    courses[1].tenant_id = other_id if courses[1].tenant_id == tenant_id else tenant_id
+    db.delete(courses[2])
+    db.add(SCTPCourse(title="New", provider="SMU", skills_taught=["python", "Airflow"], tenant_id=None))
+    profiles = db.query(UserProfile).order_by(UserProfile.id).all()
+    profiles[0].skills = ["Python", "SQL", "Spark"]
+    profiles[1].tenant_id = other_id if profiles[1].tenant_id == tenant_id else tenant_id
+    db.delete(profiles[2])
+    db.add(UserProfile(name="New", skills=["sql", "AWS", "Docker"], tenant_id=tenant_id))
+    db.commit()
+
+
+# --- Reference implementations (the former nested scans) ---
+
+def _legacy_pathway_ids(db, skills, tenant_id):
+    from app.models.sctp_course import SCTPCourse
+
+    courses = db.query(SCTPCourse).filter(
+        (SCTPCourse.tenant_id == tenant_id) | (SCTPCourse.tenant_id == None)
+    ).all()
+    result = {}
+    for skill in skills:
+        matched = [c for c in courses if c.skills_taught and any(skill.lower() in s.lower() for s in c.skills_taught)]
+        if matched:
+            result[skill] = {c.id for c in matched}
+    return result
+
+
+def _legacy_roadmap(db, sorted_skills, tenant_id):
+    from app.models.sctp_course import SCTPCourse
+
+    # Ties go to the first course scanned; the scan had no ORDER BY, the index uses id order
+    courses = db.query(SCTPCourse).filter(
+        (SCTPCourse.tenant_id == tenant_id) | (SCTPCourse.tenant_id == None)
+    ).order_by(SCTPCourse.id).all()
+    picked, used = [], set()
+    for skill in sorted_skills:
+        best, best_count = None, 0
+        for course in courses:
+            if course.id in used:
+                continue
+            taught = [s.lower() for s in course.skills_taught]
+            if skill.lower() in taught:
+                count = sum(1 for s in sorted_skills if s.lower() in taught)
+                if count > best_count:
+                    best, best_count = course, count
+        if best:
+            used.add(best.id)
+            picked.append((skill, best.title))
+    return picked
+
+
+def _legacy_peer_counts(db, profile_id, tenant_id, recs):
+    from app.models.user_profile import UserProfile
+
+    profiles = db.query(UserProfile).filter(UserProfile.tenant_id == tenant_id).all()
+    counts = []
+    for rec in recs:
+        role_skills = {s.lower() for s in rec.matched_skills + rec.missing_skills}
+        counts.append(sum(
+            1 for p in profiles
+            if p.id != profile_id and len({s.lower() for s in p.skills or []} & role_skills) >= 2
+        ))
+    return counts
+
+
+def _check_pathways(db, tenant_id):
+    from app.services.course_pathways import generate_learning_pathways
+
+    skills = SKILLS + ["sql", "Airflow", "Rust"]
+    pathways = generate_learning_pathways(skills, db, tenant_id)
+    assert {p["skill"]: {c["id"] for c in p["courses"]} for p in pathways} == _legacy_pathway_ids(db, skills, tenant_id)
+
+
+def _check_roadmap(db, tenant_id):
+    from app.models.user_profile import UserProfile
+    from app.services.roadmap_generator import generate_roadmap
+
+    gap_skills = ["Spark", "sql", "Airflow", "Docker", "Python", "Tableau", "Rust"]
+    gaps = [RoleGap(role_id=1, role_title="Role", match_score=0.5, gaps=[
+        SkillGapItem(skill=s, required_level="required", user_level=0.0, user_level_label="missing",
+                     gap_severity="high", priority=i + 1)
+        for i, s in enumerate(gap_skills)
+    ])]
+    profile = db.query(UserProfile).filter(UserProfile.tenant_id == tenant_id).first()
+    with patch("app.services.roadmap_generator.analyze_gaps", return_value=gaps):
+        roadmap = generate_roadmap(profile, db, tenant_id=tenant_id, objective="greedy")
+    assert [(item.skill, item.course_title) for item in roadmap] == _legacy_roadmap(db, gap_skills, tenant_id)
+
+
+def _check_peers(db, tenant_id, user):
+    from app.models.tenant import Tenant
+    from app.models.user_profile import UserProfile
+    from app.routers.peer import peer_comparison
+
+    recs = [
+        RoleRecommendation(
+            role_id=i, title=f"Role {i}", category="Data", match_score=0.5, content_score=0.5, rule_score=0.5,
+            career_switcher_bonus=0.0, matched_skills=matched, missing_skills=missing, rationale="-",
+            salary_range=None,
+        )
+        for i, (matched, missing) in enumerate([
+            (["Python"], ["SQL", "Spark"]), (["AWS", "Docker"], ["Kubernetes"]), ([], ["Excel", "Tableau", "Java"]),
+        ])
+    ]
+    tenant = db.get(Tenant, tenant_id)
+    profile = db.query(UserProfile).filter(UserProfile.tenant_id == tenant_id, UserProfile.user_id == user.id).first()
+    with patch("app.services.materializer.recommendations_for", return_value=recs):
+        response = peer_comparison(profile.id, db, tenant, user)
+    assert [i.total_peers for i in response.peer_insights] == _legacy_peer_counts(db, profile.id, tenant_id, recs)
+    assert sum(i.total_peers for i in response.peer_insights) > 0
+
+
+def test_postings_put_replace_and_discard():
+    from app.services.skill_index import SkillPostings
+
+    postings = SkillPostings()
+    postings.put(1, ["Python", "SQL"])
+    postings.put(2, ["python", "PostgreSQL"])
+    assert postings.ids("PYTHON") == {1, 2}
+    assert postings.ids_containing("sql") == {1, 2}
+    assert postings.overlap_counts(["python", "Python", "sql"]) == {1: 2, 2: 1}
+
+    postings.put(1, ["Docker"])
+    assert postings.ids("python") == {2}
+    postings.discard(2)
+    assert postings.ids("python") == set()
+    assert postings.ids_containing("") == {1}
+    assert len(postings) == 1
+
+
+def test_index_matches_full_scans(populated):
+    from app.models.job_role import JobRole
+    from app.services.skill_index import skill_index
+
+    db, tenant_id, other_id, user = populated
+    roles = db.query(JobRole).filter(JobRole.tenant_id == tenant_id).all()
+    for skill in SKILLS:
+        expected = {r.id for r in roles if skill.lower() in {s.lower() for s in r.required_skills + r.preferred_skills}}
+        assert skill_index.role_ids(db, tenant_id, skill.upper()) == expected
+    _check_pathways(db, tenant_id)
+    _check_pathways(db, other_id)
+    _check_roadmap(db, tenant_id)
+    _check_peers(db, tenant_id, user)
+
+
+def test_index_follows_committed_writes(populated):
+    from app.services.skill_index import skill_index
+
+    db, tenant_id, other_id, user = populated
+    _check_pathways(db, tenant_id)
+    _check_peers(db, tenant_id, user)
+    built = {t: skill_index._tenants[t] for t in (tenant_id, None)}
+
+    _mutate(db, tenant_id, other_id)
+
+    _check_pathways(db, tenant_id)
+    _check_pathways(db, other_id)
+    _check_roadmap(db, tenant_id)
+    _check_peers(db, tenant_id, user)
+    # The commits bumped the generation counters, so both indexes were rebuilt
+    assert all(skill_index._tenants[t] is not index for t, index in built.items())
+
+
+def test_writes_seen_through_shared_counters_from_other_workers(populated):
+    from sqlalchemy import text
+
+    from app.services.recommendation_cache import recommendation_cache
+    from app.services.skill_index import skill_index
+
+    db, tenant_id, _, _ = populated
+    assert skill_index.profile_overlaps(db, tenant_id, ["Rust"]) == {}
+    # Another worker's commit: no ORM events here, only its bump of the shared counter
+    db.execute(
+        text("INSERT INTO user_profiles (name, skills, years_experience, tenant_id) VALUES ('W', :skills, 1, :t)"),
+        {"skills": '["Rust"]', "t": tenant_id},
+    )
+    db.commit()
+    with patch.object(recommendation_cache.backend, "shared", True):
+        assert skill_index.profile_overlaps(db, tenant_id, ["Rust"]) == {}
+        recommendation_cache.backend.bump(f"profiles:{tenant_id}")
+        assert len(skill_index.profile_overlaps(db, tenant_id, ["rust"])) == 1
+
+
+def test_rolled_back_writes_are_ignored(populated):
+    from app.models.sctp_course import SCTPCourse
+    from app.services.skill_index import skill_index
+
+    db, tenant_id, _, _ = populated
+    assert skill_index.course_ids(db, tenant_id, ["Rust"]) == set()
+    db.add(SCTPCourse(title="Rust 101", provider="NUS", skills_taught=["Rust"], tenant_id=tenant_id))
+    db.flush()
+    db.rollback()
+    assert skill_index.course_ids(db, tenant_id, ["Rust"]) == set()
@@ -2,6 +2,7 @@
 
 from unittest.mock import patch
 import numpy as np
+import pytest
 
 
 def _mock_encode(texts, normalize_embeddings=True):
@@ -59,3 +60,80 @@ def test_empty_skills(mock_model):
         required_skills=["Python", "SQL"],
     )
     assert all(v == 0.0 for v in scores.values())
+
+
+@patch("app.services.skill_matcher.get_skill_category", return_value="technical")
+@patch("app.ml.embeddings.get_model")
+def test_role_skill_matrix_matches_per_role_scoring(mock_model, mock_category):
+    """Matrix scoring should agree with match_skills / compute_content_similarity per role."""
+    mock_model.return_value.encode = _mock_encode
+    from app.services.skill_matcher import (
+        build_role_skill_matrix, compute_content_similarity, match_skills,
+        matrix_content_scores, matrix_required_split, score_profiles_against_matrix,
+    )
+
+    roles = [
+        (["Python", "SQL", "Spark"], ["Kafka", "SQL"]),
+        ([], []),
+        (["Docker", "Kubernetes"], ["AWS"]),
+    ]
+    user_skills = ["python", "Docker", "AWS"]
+
+    matrix = build_role_skill_matrix(roles)
+    scores = score_profiles_against_matrix(matrix, [user_skills])
+    content = matrix_content_scores(matrix, scores)
+
+    for i, (required, preferred) in enumerate(roles):
+        expected = compute_content_similarity(user_skills, required + preferred)
+        assert abs(content[i, 0] - expected) < 1e-9
+        req_scores = match_skills(user_skills, required)
+        matched, missing = matrix_required_split(matrix, scores[:, 0], i)
+        assert matched == [s for s, v in req_scores.items() if v >= 0.5]
+        assert missing == [s for s, v in req_scores.items() if v < 0.5]
+
+
+def test_skill_embedding_cache_encodes_only_new_skills():
+    """Reordered or extended skill lists should reuse cached per-skill rows."""
+    from app.services.skill_matcher import SkillEmbeddingCache
+
+    calls = []
+
+    def fake_encode(texts):
+        calls.append(list(texts))
+        return _mock_encode(texts)
+
+    cache = SkillEmbeddingCache(maxsize=3)
+    with patch("app.services.skill_matcher.encode_texts", side_effect=fake_encode):
+        a = cache.encode(["Python", "SQL"])
+        b = cache.encode(["SQL", "Python"])
+        c = cache.encode(["SQL", "Python", "Docker"])
+        cache.encode(["Kafka"])
+
+    assert calls == [["Python", "SQL"], ["Docker"], ["Kafka"]]
+    np.testing.assert_array_equal(a[0], b[1])
+    np.testing.assert_array_equal(c[:2], b)
+    assert cache.stats() == {"size": 3, "hits": 4, "misses": 4}
+
+
+@patch("app.ml.embeddings.get_model")
+def test_content_similarity_weights_by_category(mock_model):
+    """Category weights are applied per required skill; duplicates count once."""
+    mock_model.return_value.encode = _mock_encode
+    from app.services.skill_matcher import compute_content_similarity, skill_weights
+
+    categories = {"Python": "critical_core", "SQL": "technical", "Teamwork": "generic"}
+    skill_weights.cache_clear()
+    try:
+        with patch("app.services.skill_matcher.get_skill_category", side_effect=categories.get):
+            sim = compute_content_similarity(
+                user_skills=["python", "Teamwork"],
+                role_skills=["Python", "SQL", "Teamwork", "Python"],
+            )
+            weights = skill_weights(("Python", "SQL", "Teamwork"))
+    finally:
+        skill_weights.cache_clear()
+
+    assert weights.lowered == ("python", "sql", "teamwork")
+    np.testing.assert_allclose(weights.weights, [1.3, 1.0, 0.8])
+    # SQL has no exact match; its mock embedding is unrelated to the user's skills
+    assert sim == pytest.approx((1.3 + 0.8) / (1.3 + 1.0 + 0.8))
@@ -0,0 +1,158 @@
+"""Tests for tiered skill normalization."""
+
+from unittest.mock import MagicMock, patch
+
+from tests.helpers import mock_encode
+
+
+def test_string_tiers_resolve_without_encoding():
+    from app.ml.skill_normalizer import SkillNormalizer
+
+    normalizer = SkillNormalizer(
+        ["Python", "React", "Vue.js", "Kubernetes", "PostgreSQL", "R", "Go"],
+        aliases={"K8s": "Kubernetes", "Postgres": "PostgreSQL", "Rust": "Unknown"},
+    )
+    texts = ["Python", "python ", "React.js", "vue", "k8s", "Kubernets", "Postgres"]
+    with patch("app.ml.embeddings.encode_texts") as encode:
+        resolved = normalizer.resolve(texts, threshold=0.75)
+    encode.assert_not_called()
+    assert resolved == [
+        ("Python", "exact"), ("Python", "alias"), ("React", "alias"), ("Vue.js", "alias"),
+        ("Kubernetes", "alias"), ("Kubernetes", "fuzzy"), ("PostgreSQL", "alias"),
+    ]
+    # Aliases to unknown skills are ignored; short inputs never match fuzzily
+    assert normalizer.lookup("Rust") == (None, "embedding")
+    assert normalizer.lookup("Gx") == (None, "embedding")
+
+
+@patch("app.ml.embeddings.get_model")
+def test_normalize_skills_batches_embedding_tier(mock_model):
+    mock_model.return_value.encode.side_effect = mock_encode
+    from app.ml import taxonomy
+    from app.ml.skill_normalizer import tier_stats
+
+    before = tier_stats()
+    taxonomy.get_taxonomy_index()  # build outside the counted call
+    mock_model.return_value.encode.reset_mock()
+
+    result = taxonomy.normalize_skills(["python", "Docker", "reactjs", "Quantum Basket Weaving", "Underwater Origami"])
+    after = tier_stats()
+
+    assert result[:3] == ["Python", "Docker", "React"]
+    assert mock_model.return_value.encode.call_count == 1
+    assert mock_model.return_value.encode.call_args.args[0] == ["Quantum Basket Weaving", "Underwater Origami"]
+    assert after["exact"] - before["exact"] == 1
+    assert after["alias"] - before["alias"] == 2
+    assert sum(after.values()) - sum(before.values()) == 5
+
+
+@patch("app.ml.embeddings.get_model")
+def test_suggest_skills_returns_ranked_candidates(mock_model):
+    mock_model.return_value.encode.side_effect = mock_encode
+    from app.ml import taxonomy
+
+    taxonomy.get_taxonomy_index()
+    mock_model.return_value.encode.reset_mock()
+
+    suggestions = taxonomy.suggest_skills(["Docker", "Kubernetes", "Docker"], k=3)
+    assert mock_model.return_value.encode.call_args.args[0] == ["Docker", "Kubernetes"]
+    assert [len(s) for s in suggestions] == [3, 3, 3]
+    assert suggestions[0][0][0] == "Docker" and suggestions[0][0][1] > 0.99
+    assert suggestions[0] == suggestions[2]
+    scores = [score for _, score in suggestions[1]]
+    assert scores == sorted(scores, reverse=True)
+
+
+@patch("app.ml.embeddings.get_model")
+def test_suggested_scores_just_below_the_threshold_stay_unmatched(mock_model):
+    import numpy as np
+
+    mock_model.return_value.encode.side_effect = mock_encode
+    from app.ml import taxonomy
+    from app.ml.skill_normalizer import SkillNormalizer
+
+    taxonomy.get_taxonomy_index()
+    threshold = 0.75
+    # Rounds to the threshold at 4 decimals, but is below it
+    hit = (np.array([[threshold - 0.00001]], dtype=np.float32), np.array([[0]]))
+    with patch("app.ml.taxonomy.search", return_value=hit):
+        (top,), = taxonomy.suggest_skills(["Quantum Basket Weaving"], k=1)
+    assert round(top[1], 4) == threshold and top[1] < threshold
+
+    normalizer = SkillNormalizer(["Python"])
+    resolved = normalizer.resolve(["Quantum Basket Weaving"], threshold, nearest={"Quantum Basket Weaving": top})
+    assert resolved == [(None, "unmatched")]
+
+
+def test_extract_skills_keeps_raw_names_when_the_encoder_fails():
+    from app.services import resume_parser
+
+    response = MagicMock(text='{"skills": ["Python", "Quantum Basket Weaving"]}')
+    model = MagicMock()
+    model.generate_content.return_value = response
+    with patch.object(resume_parser.settings, "gemini_api_key", "test-key"), \
+         patch("google.generativeai.configure"), \
+         patch("google.generativeai.GenerativeModel", return_value=model), \
+         patch("app.ml.embeddings.encode_texts", side_effect=RuntimeError("encoder down")):
+        assert resume_parser.extract_skills("Python developer") == ["Python", "Quantum Basket Weaving"]
+
+
+@patch("app.ml.embeddings.get_model")
+def test_suggest_endpoint(mock_model):
+    mock_model.return_value.encode.side_effect = mock_encode
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.database import Base, get_db
+    from app.main import app
+    from app.ml.skill_normalizer import tier_stats
+    from app.models.api_key import APIKey
+    from app.models.tenant import Tenant
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        tenant = Tenant(name="Suggest")
+        db.add(tenant)
+        db.flush()
+        db.add(APIKey(tenant_id=tenant.id, key="suggest-key", name="test"))
+        db.commit()
+
+    def _get_db():
+        with Session() as db:
+            yield db
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        client = TestClient(app)
+        headers = {"X-API-Key": "suggest-key"}
+        body = {"skills": ["python", "Quantum Basket Weaving"], "k": 3}
+        assert client.post("/api/skills/suggest", json=body).status_code == 401
+        assert client.post("/api/skills/suggest", json=body, headers={"X-API-Key": "wrong"}).status_code == 401
+        for k in (0, 21):
+            assert client.post("/api/skills/suggest", json={**body, "k": k}, headers=headers).status_code == 422
+        assert client.post("/api/skills/suggest", json={"skills": []}, headers=headers).status_code == 422
+
+        before = tier_stats()
+        response = client.post("/api/skills/suggest", json=body, headers=headers)
+        after = tier_stats()
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"threshold", "suggestions"}
+    python, unknown = data["suggestions"]
+    assert (python["input"], python["normalized"], python["tier"]) == ("python", "Python", "alias")
+    assert (unknown["normalized"], unknown["tier"]) == (None, "unmatched")
+    assert all(len(s["candidates"]) == 3 and set(s["candidates"][0]) == {"skill", "score"} for s in (python, unknown))
+    # Suggestions go through the normalizer, so the tier counters see them
+    assert after["alias"] - before["alias"] == 1
+    assert after["unmatched"] - before["unmatched"] == 1
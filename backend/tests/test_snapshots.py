@@ -0,0 +1,75 @@
+"""Tests for taxonomy index and role matrix snapshots."""
+
+from unittest.mock import patch
+
+import numpy as np
+
+from tests.helpers import mock_encode
+
+
+@patch("app.ml.embeddings.get_model")
+def test_taxonomy_index_snapshot_reused_until_taxonomy_changes(mock_model, tmp_path):
+    mock_model.return_value.encode = mock_encode
+    from app.ml import snapshots, taxonomy
+
+    with patch.object(snapshots.settings, "index_snapshot_dir", str(tmp_path)), \
+         patch.object(taxonomy, "_taxonomy_index", None):
+        index, skills = taxonomy.get_taxonomy_index()
+        assert snapshots.load_taxonomy_index(taxonomy.taxonomy_hash()) is not None
+
+        with patch.object(taxonomy, "_taxonomy_index", None), \
+             patch("app.ml.taxonomy.build_index") as build:
+            restored, restored_skills = taxonomy.get_taxonomy_index()
+        build.assert_not_called()
+        assert restored_skills == skills
+        query = mock_encode([skills[3]]).astype(np.float32)
+        assert restored.search(query, 1)[1][0][0] == 3
+
+        assert snapshots.load_taxonomy_index("other-taxonomy-hash") is None
+
+
+@patch("app.services.skill_matcher.get_skill_category", return_value="technical")
+@patch("app.ml.embeddings.get_model")
+def test_role_matrix_snapshot_roundtrip(mock_model, mock_category, tmp_path):
+    mock_model.return_value.encode = mock_encode
+    from app.ml import snapshots
+    from app.services.skill_matcher import build_role_skill_matrix, score_profiles_against_matrix
+
+    matrix = build_role_skill_matrix([(["Python", "SQL"], ["Spark"]), (["Docker"], [])])
+    with patch.object(snapshots.settings, "index_snapshot_dir", str(tmp_path)):
+        snapshots.save_role_matrix(1, "fp-1", matrix)
+        restored = snapshots.load_role_matrix(1, "fp-1")
+        assert snapshots.load_role_matrix(1, "fp-2") is None
+        snapshots.save_role_matrix(1, "fp-2", matrix)
+        assert snapshots.load_role_matrix(1, "fp-1") is None  # superseded snapshot pruned
+
+    assert isinstance(restored.embeddings, np.memmap)
+    assert restored.skills == matrix.skills and restored.vocab == matrix.vocab
+    users = [["python", "Docker"], ["Spark"]]
+    np.testing.assert_array_equal(
+        score_profiles_against_matrix(restored, users), score_profiles_against_matrix(matrix, users)
+    )
+
+
+@patch("app.services.skill_matcher.get_skill_category", return_value="technical")
+@patch("app.ml.embeddings.get_model")
+def test_snapshots_of_other_index_modes_are_not_pruned(mock_model, mock_category, tmp_path):
+    mock_model.return_value.encode = mock_encode
+    from app.ml import snapshots
+    from app.services.skill_matcher import build_role_skill_matrix
+
+    matrix = build_role_skill_matrix([(["Python"], [])])
+    with patch.object(snapshots.settings, "index_snapshot_dir", str(tmp_path)):
+        with patch.object(snapshots.settings, "embedding_index_mode", "flat"):
+            snapshots.save_role_matrix(1, "fp-1", matrix)
+        with patch.object(snapshots.settings, "embedding_index_mode", "sq8"):
+            snapshots.save_role_matrix(1, "fp-1", matrix)
+            snapshots.save_role_matrix(12, "fp-1", matrix)
+            assert snapshots.load_role_matrix(1, "fp-1") is not None
+        with patch.object(snapshots.settings, "embedding_index_mode", "flat"):
+            assert snapshots.load_role_matrix(1, "fp-1") is not None
+            snapshots.save_role_matrix(1, "fp-2", matrix)
+            assert snapshots.load_role_matrix(1, "fp-1") is None  # same scope: superseded
+        with patch.object(snapshots.settings, "embedding_index_mode", "sq8"):
+            assert snapshots.load_role_matrix(1, "fp-1") is not None
+            assert snapshots.load_role_matrix(12, "fp-1") is not None
@@ -0,0 +1,54 @@
+"""Tests for background ML warmup and the readiness endpoint."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+
+def test_warmup_progress_reports_stages():
+    from app.warmup import WarmupProgress
+
+    progress = WarmupProgress(["model", "index"])
+    assert not progress.ready
+    progress.run("model", lambda: "loaded")
+    snapshot = progress.snapshot()
+    assert snapshot["progress"] == 0.5
+    assert snapshot["stages"][0]["status"] == "done"
+
+    progress.run("index", lambda: 1 / 0)
+    assert not progress.ready
+    snapshot = progress.snapshot()
+    assert (snapshot["ready"], snapshot["progress"], snapshot["failed"]) == (False, 1.0, ["index"])
+    assert snapshot["stages"][1]["status"] == "failed"
+
+
+def test_ready_endpoint_reflects_warmup(monkeypatch):
+    from app import warmup
+    from app.main import app
+
+    monkeypatch.setattr(warmup, "warmup_progress", warmup.WarmupProgress(["model"]))
+    client = TestClient(app)
+    assert client.get("/health").status_code == 200
+    assert client.get("/ready").status_code == 503
+
+    warmup.warmup_progress.run("model", lambda: 1 / 0)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["failed"] == ["model"]
+
+    warmup.warmup_progress.run("model", lambda: None)
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+
+
+def test_app_import_defers_heavy_modules():
+    code = (
+        "import sys, app.main; "
+        "print([m for m in ('sentence_transformers', 'torch', 'faiss', 'google.generativeai') if m in sys.modules])"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parents[1])
+    assert out.stdout.strip().splitlines()[-1] == "[]"